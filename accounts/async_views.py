@@ -0,0 +1,12 @@
+from core.async_views import AsyncAPIView
+
+
+class AsyncMeView(AsyncAPIView):
+    async def get(self, request, *args, **kwargs):
+        u = request.user
+        return self.render({
+            "id": u.id,
+            "username": u.username,
+            "email": u.email,
+            "role": u.role,
+        })
@@ -0,0 +1,114 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import User, token_version_cache_key
+
+TOKEN_VERSION_CLAIM = "ver"
+
+
+def get_token_version(user_id):
+    """
+    Current token version for a user, from the cache when possible.
+
+    With a per-process cache (locmem) a bump made in another process is only
+    seen after HRMS_TOKEN_VERSION_TTL seconds, which bounds how long a stale
+    token is trusted; use a shared cache backend to make it immediate.
+    """
+    key = token_version_cache_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        # Always the primary: a lagging replica would keep revoked tokens alive
+        primary = User.objects.using(DEFAULT_DB_ALIAS)
+        version = primary.filter(pk=user_id).values_list("token_version", flat=True).first()
+        if version is not None:
+            cache.set(key, version, getattr(settings, "HRMS_TOKEN_VERSION_TTL", 60))
+    return version
+
+
+async def aget_token_version(user_id):
+    """get_token_version() for async code: cache and database calls are awaited."""
+    key = token_version_cache_key(user_id)
+    version = await cache.aget(key)
+    if version is None:
+        primary = User.objects.using(DEFAULT_DB_ALIAS)
+        version = await primary.filter(pk=user_id).values_list("token_version", flat=True).afirst()
+        if version is not None:
+            await cache.aset(key, version, getattr(settings, "HRMS_TOKEN_VERSION_TTL", 60))
+    return version
+
+
+class ClaimsUser(TokenUser):
+    """
+    User built from access token claims only. Exposes the same attributes the
+    API reads from accounts.User (id, username, email, role) plus the employee
+    profile ids, so request handling needs no user or employee query.
+    """
+
+    @property
+    def role(self):
+        return self.token.get("role")
+
+    @property
+    def email(self):
+        return self.token.get("email")
+
+    @property
+    def claimed_employee(self):
+        return (self.token.get("employee_id"), self.token.get("department_id"))
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that trusts the signed claims instead of loading the
+    user row. The token's version claim is compared with the user's current
+    token_version; only a stale (or pre-versioning) token falls back to the
+    regular database lookup, which also enforces is_active.
+
+    aauthenticate() is the same check for async views (core.async_views).
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        version = validated_token.get(TOKEN_VERSION_CLAIM)
+        if user_id is None or version is None:
+            return super().get_user(validated_token)
+
+        current = get_token_version(user_id)
+        if current is None:
+            raise AuthenticationFailed("User not found", code="user_not_found")
+        if current != version:
+            return super().get_user(validated_token)
+
+        return ClaimsUser(validated_token)
+
+    async def aauthenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        version = validated_token.get(TOKEN_VERSION_CLAIM)
+        if user_id is None or version is None:
+            return await sync_to_async(super().get_user)(validated_token)
+
+        current = await aget_token_version(user_id)
+        if current is None:
+            raise AuthenticationFailed("User not found", code="user_not_found")
+        if current != version:
+            return await sync_to_async(super().get_user)(validated_token)
+
+        return ClaimsUser(validated_token)
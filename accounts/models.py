@@ -1,8 +1,11 @@
-from django.db import models
+from django.core.cache import cache
+from django.db import models, transaction
 from django.contrib.auth.models import AbstractUser, UserManager
 # Create your models here.
 
 
+def token_version_cache_key(user_id):
+    return f"accounts:token_version:{user_id}"
 
 
 class User(AbstractUser):
@@ -12,4 +15,58 @@ class User(AbstractUser):
         EMPLOYEE = "EMPLOYEE", "Employee"
 
     role = models.CharField(max_length=20, choices=Role.choices, default=Role.EMPLOYEE)
-    email = models.EmailField(unique=True, null=True, blank=True)
\ No newline at end of file
+    email = models.EmailField(unique=True, null=True, blank=True)
+
+    # Bumped whenever something baked into access token claims changes, so
+    # tokens issued before the change are detected as stale.
+    token_version = models.PositiveIntegerField(default=0)
+
+    class Meta(AbstractUser.Meta):
+        # The admin user list pages by id within a role / active filter;
+        # username and email prefixes use their unique indexes
+        indexes = [
+            models.Index(fields=["role", "id"]),
+            models.Index(fields=["is_active", "id"]),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_claims = instance._claims()
+        return instance
+
+    # Fields copied into access token claims (and trusted by ClaimsUser)
+    CLAIM_FIELDS = ("role", "is_active", "is_superuser", "username", "email")
+
+    def _claims(self):
+        return tuple(self.__dict__.get(name) for name in self.CLAIM_FIELDS)
+
+    def save(self, *args, **kwargs):
+        loaded = getattr(self, "_loaded_claims", None)
+        claims_changed = loaded is not None and loaded != self._claims()
+
+        # token_version only ever moves through bump_token_version()'s atomic
+        # increment; a stale in-memory copy must not be written back over it.
+        if not self._state.adding and not kwargs.get("force_insert") and kwargs.get("update_fields") is None:
+            deferred = self.get_deferred_fields()
+            kwargs["update_fields"] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name != "token_version" and f.attname not in deferred
+            ]
+
+        super().save(*args, **kwargs)
+        if claims_changed:
+            self.bump_token_version(self.pk)
+        self._loaded_claims = self._claims()
+
+    @classmethod
+    def bump_token_version(cls, user_id):
+        cls.objects.filter(pk=user_id).update(token_version=models.F("token_version") + 1)
+        cls._forget_token_version(user_id)
+
+    @staticmethod
+    def _forget_token_version(user_id):
+        key = token_version_cache_key(user_id)
+        cache.delete(key)
+        # A concurrent request may re-cache the old version before we commit
+        transaction.on_commit(lambda: cache.delete(key))
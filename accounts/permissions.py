@@ -1,41 +1,41 @@
 from rest_framework.permissions import BasePermission
 from accounts.models import User
+from accounts.principal import get_principal
 
 # TODO: many of these permissions are not used, if it's not needed just remove it.
 # PS:isn't it better to have them, even if they aren't used at this time ?
 
 class IsAdmin(BasePermission):
     def has_permission(self, request, view):
-        return bool(request.user and request.user.is_authenticated and request.user.role == User.Role.ADMIN)
+        principal = get_principal(request)
+        return bool(principal and principal.role == User.Role.ADMIN)
 
 
 class IsAdminOrManager(BasePermission):
     def has_permission(self, request, view):
-        return bool(
-            request.user
-            and request.user.is_authenticated
-            and request.user.role in [User.Role.ADMIN, User.Role.MANAGER]
-        )
+        principal = get_principal(request)
+        return bool(principal and principal.role in [User.Role.ADMIN, User.Role.MANAGER])
 
 
 class IsSelfOrAdmin(BasePermission):
     def has_object_permission(self, request, view, obj):
-        if not request.user or not request.user.is_authenticated:
+        principal = get_principal(request)
+        if not principal:
             return False
 
-        if request.user.role == User.Role.ADMIN:
+        if principal.role == User.Role.ADMIN:
             return True
 
         # obj is User
         if isinstance(obj, User):
-            return obj.id == request.user.id
+            return obj.id == principal.user_id
 
         # obj has user (Employee profile)
         if hasattr(obj, "user_id"):
-            return obj.user_id == request.user.id
+            return obj.user_id == principal.user_id
 
-        # obj has employee.user (Attendance/Payroll)
-        if hasattr(obj, "employee") and hasattr(obj.employee, "user_id"):
-            return obj.employee.user_id == request.user.id
+        # obj has employee (Attendance/Payroll); compare ids instead of loading obj.employee
+        if hasattr(obj, "employee_id"):
+            return principal.employee_id is not None and obj.employee_id == principal.employee_id
 
         return False
\ No newline at end of file
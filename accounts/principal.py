@@ -0,0 +1,91 @@
+from .models import User
+
+
+class Principal:
+    """
+    Who is making the request: role plus the employee/department the account is
+    linked to. Resolved once per request by get_principal() and shared by
+    permissions, views and serializers.
+
+    role and user_id come straight from the authenticated user. employee_id and
+    department_id cost one query, issued the first time either is read (never,
+    for checks that only need the role).
+    """
+
+    def __init__(self, user, employee=None):
+        self.user_id = user.pk
+        self.role = getattr(user, "role", None)
+        self.is_superuser = bool(getattr(user, "is_superuser", False))
+        self._user = user
+        # (employee_id, department_id), None until resolved
+        self._employee = employee
+
+    @property
+    def is_admin(self) -> bool:
+        return self.is_superuser or self.role == User.Role.ADMIN
+
+    @property
+    def is_manager(self) -> bool:
+        return self.role == User.Role.MANAGER
+
+    @property
+    def employee_id(self) -> int | None:
+        return self._resolve_employee()[0]
+
+    @property
+    def department_id(self) -> int | None:
+        return self._resolve_employee()[1]
+
+    async def aresolve(self):
+        """Load employee_id/department_id with the async ORM, so reading them never queries."""
+        if self._employee is None:
+            self._employee = await _aload_employee(self._user)
+        return self
+
+    def _resolve_employee(self):
+        if self._employee is None:
+            self._employee = _load_employee(self._user)
+        return self._employee
+
+
+def _load_employee(user):
+    # Reuse an employee profile that is already cached on the user
+    if User.employee.is_cached(user):
+        try:
+            employee = user.employee
+        except User.employee.RelatedObjectDoesNotExist:
+            return (None, None)
+        return (employee.id, employee.department_id)
+
+    row = (
+        User.objects
+        .filter(pk=user.pk)
+        .values_list("employee__id", "employee__department_id")
+        .first()
+    )
+    return row or (None, None)
+
+
+async def _aload_employee(user):
+    if User.employee.is_cached(user):
+        return _load_employee(user)
+    row = (
+        await User.objects
+        .filter(pk=user.pk)
+        .values_list("employee__id", "employee__department_id")
+        .afirst()
+    )
+    return row or (None, None)
+
+
+def get_principal(request) -> Principal | None:
+    user = getattr(request, "user", None)
+    if not user or not user.is_authenticated:
+        return None
+
+    principal = getattr(request, "_principal", None)
+    if principal is None or principal.user_id != user.pk:
+        # Token-claims users already carry their employee/department ids
+        principal = Principal(user, employee=getattr(user, "claimed_employee", None))
+        request._principal = principal
+    return principal
@@ -1,6 +1,7 @@
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from rest_framework import serializers
 from .models import User
+from .authentication import TOKEN_VERSION_CLAIM
 
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     @classmethod
@@ -9,6 +10,13 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         token["role"] = user.role
         token["username"] = user.username
         token["email"] = user.email
+        token["is_superuser"] = user.is_superuser
+
+        # Lets ClaimsJWTAuthentication scope requests without loading the employee
+        employee = getattr(user, "employee", None)
+        token["employee_id"] = employee.id if employee else None
+        token["department_id"] = employee.department_id if employee else None
+        token[TOKEN_VERSION_CLAIM] = user.token_version
         return token
 
     def validate(self, attrs):
@@ -24,4 +32,10 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
 class UserListSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
-        fields = ["id", "username", "email", "role"]
\ No newline at end of file
+        fields = ["id", "username", "email", "role"]
+
+class UserFilterSerializer(serializers.Serializer):
+    role = serializers.ChoiceField(choices=User.Role.choices, required=False)
+    is_active = serializers.BooleanField(default=None, allow_null=True)
+    username = serializers.CharField(max_length=150, required=False)
+    email = serializers.CharField(max_length=254, required=False)
@@ -2,6 +2,9 @@ from django.urls import reverse
 from rest_framework.test import APITestCase
 from rest_framework import status
 from accounts.models import User
+import json
+from unittest import mock
+from accounts.views import UserCursorPagination
 
 
 class AuthRBACTests(APITestCase):
@@ -74,7 +77,47 @@ class AuthRBACTests(APITestCase):
         res = self.client.get(self.users_url)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         # should return at least these 3 users
-        self.assertGreaterEqual(len(res.data), 3)
+        self.assertGreaterEqual(len(res.data["results"]), 3)
+
+    def test_user_list_pages_by_cursor_and_filters(self):
+        for i in range(3):
+            User.objects.create_user(username=f"pager{i}", password="Pass12345!", email=f"pager{i}@test.com", is_active=i != 1)
+        self.auth_as("admin1", "Pass12345!")
+
+        res = self.client.get(self.users_url, {"username": "pager"})
+        self.assertEqual([u["username"] for u in res.data["results"]], ["pager0", "pager1", "pager2"])
+        self.assertIsNone(res.data["next"])
+
+        res = self.client.get(self.users_url, {"username": "pager", "is_active": "false"})
+        self.assertEqual([u["username"] for u in res.data["results"]], ["pager1"])
+        res = self.client.get(self.users_url, {"role": "MANAGER"})
+        self.assertEqual([u["username"] for u in res.data["results"]], ["manager1"])
+        res = self.client.get(self.users_url, {"email": "pager2@"})
+        self.assertEqual([u["username"] for u in res.data["results"]], ["pager2"])
+        self.assertEqual(self.client.get(self.users_url, {"role": "BOSS"}).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_user_list_cursor_walks_every_page(self):
+        for i in range(5):
+            User.objects.create_user(username=f"walker{i}", password="Pass12345!", email=f"walker{i}@test.com")
+        self.auth_as("admin1", "Pass12345!")
+
+        seen, url, params = [], self.users_url, {"username": "walker"}
+        with mock.patch.object(UserCursorPagination, "page_size", 2):
+            while url:
+                res = self.client.get(url, params)
+                seen += [u["username"] for u in res.data["results"]]
+                url, params = res.data["next"], None
+        self.assertEqual(seen, [f"walker{i}" for i in range(5)])
+
+    def test_user_export_streams_filtered_rows(self):
+        self.auth_as("admin1", "Pass12345!")
+        res = self.client.get("/api/users/export/", {"role": "EMPLOYEE", "output": "ndjson"})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        rows = [json.loads(line) for line in b"".join(res.streaming_content).decode().splitlines()]
+        self.assertEqual([row["username"] for row in rows], ["employee1"])
+
+        self.auth_as("manager1", "Pass12345!")
+        self.assertEqual(self.client.get("/api/users/export/").status_code, status.HTTP_403_FORBIDDEN)
 
     def test_manager_cannot_list_users(self):
         self.auth_as("manager1", "Pass12345!")
@@ -84,4 +127,111 @@ class AuthRBACTests(APITestCase):
     def test_employee_cannot_list_users(self):
         self.auth_as("employee1", "Pass12345!")
         res = self.client.get(self.users_url)
-        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
\ No newline at end of file
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+from django.core.cache import cache
+from rest_framework_simplejwt.tokens import AccessToken
+from datetime import date
+from hr.models import Attendance, Department, Employee
+from hr.status import AttendanceStatus
+
+
+class ClaimsAuthenticationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.dept_a = Department.objects.create(name="Dept A")
+        self.dept_b = Department.objects.create(name="Dept B")
+        self.manager = User.objects.create_user(
+            username="manager1",
+            password="Pass12345!",
+            role=User.Role.MANAGER,
+            email="manager1@test.com",
+        )
+        self.manager_emp = Employee.objects.create(user=self.manager, department=self.dept_a)
+
+        self.login_url = "/api/auth/login/"
+        self.me_url = "/api/auth/me/"
+
+    def login(self):
+        res = self.client.post(self.login_url, {"username": "manager1", "password": "Pass12345!"}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {res.data['access']}")
+        return AccessToken(res.data["access"])
+
+    def test_token_carries_scope_claims(self):
+        token = self.login()
+        self.assertEqual(token["role"], User.Role.MANAGER)
+        self.assertEqual(token["employee_id"], self.manager_emp.id)
+        self.assertEqual(token["department_id"], self.dept_a.id)
+        self.manager.refresh_from_db()
+        self.assertEqual(token["ver"], self.manager.token_version)
+
+    def test_fresh_token_needs_no_database(self):
+        self.login()
+        self.client.get(self.me_url)  # warms the token version cache
+        with self.assertNumQueries(0):
+            res = self.client.get(self.me_url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["username"], "manager1")
+        self.assertEqual(res.data["role"], User.Role.MANAGER)
+
+    def test_scoped_list_uses_claims_for_department(self):
+        self.login()
+        self.client.get(self.me_url)
+        # count + page only: no user or employee lookup
+        with self.assertNumQueries(2):
+            res = self.client.get("/api/employees/")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([e["id"] for e in res.data["results"]], [self.manager_emp.id])
+
+    def test_role_change_makes_token_stale(self):
+        self.login()
+        self.manager.role = User.Role.EMPLOYEE
+        self.manager.save()
+
+        res = self.client.get(self.me_url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["role"], User.Role.EMPLOYEE)
+
+    def test_department_change_makes_token_stale(self):
+        token = self.login()
+        self.manager_emp.department = self.dept_b
+        self.manager_emp.save()
+
+        self.manager.refresh_from_db()
+        self.assertGreater(self.manager.token_version, token["ver"])
+        res = self.client.get("/api/departments/")
+        self.assertEqual([d["id"] for d in res.data["results"]], [self.dept_b.id])
+
+    def test_superuser_demotion_makes_token_stale(self):
+        self.manager.is_superuser = True
+        self.manager.save()
+        other = Employee.objects.create(
+            user=User.objects.create_user(username="other_dept", password="Pass12345!", email="other_dept@test.com"),
+            department=self.dept_b,
+        )
+        Attendance.objects.create(employee=other, date=date(2026, 3, 2), status=AttendanceStatus.PRESENT)
+        self.login()
+        res = self.client.get("/api/attendance/")
+        self.assertEqual(res.data["count"], 1)
+
+        self.manager.is_superuser = False
+        self.manager.save()
+        res = self.client.get("/api/attendance/")
+        self.assertEqual(res.data["count"], 0)
+
+    def test_email_change_makes_token_stale(self):
+        self.login()
+        self.manager.email = "renamed@test.com"
+        self.manager.save()
+
+        res = self.client.get(self.me_url)
+        self.assertEqual(res.data["email"], "renamed@test.com")
+
+    def test_deactivated_user_token_rejected(self):
+        self.login()
+        self.manager.is_active = False
+        self.manager.save()
+
+        res = self.client.get(self.me_url)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -1,11 +1,14 @@
 from django.urls import path
-from .views import MeView, UserListView,CustomTokenObtainPairView
+from .views import MeView, UserExportView, UserListView,CustomTokenObtainPairView
+from .async_views import AsyncMeView
 from rest_framework_simplejwt.views import TokenRefreshView, TokenVerifyView
 
 urlpatterns = [
     path("auth/me/", MeView.as_view(), name="me"),
     path("users/", UserListView.as_view(), name="list-users"),
+    path("users/export/", UserExportView.as_view(), name="list-users-export"),
      path("auth/login/", CustomTokenObtainPairView.as_view(), name="token_obtain_pair"),
     path("auth/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
     path("auth/verify/", TokenVerifyView.as_view(), name="token_verify"),
+    path("async/auth/me/", AsyncMeView.as_view(), name="me-async"),
 ]
\ No newline at end of file
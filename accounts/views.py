@@ -5,8 +5,12 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from .permissions import IsAdmin
 from .models import User
-from .serializers import UserListSerializer
-from rest_framework.generics import GenericAPIView
+from .serializers import UserFilterSerializer, UserListSerializer
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import GenericAPIView, ListAPIView
+from core.streaming import EXPORT_FORMATS, stream_rows
+from hr.filters import QueryParamsFilterBackend
+from hr.pagination import KeysetPagination
 
 
 class CustomTokenObtainPairView(TokenObtainPairView):
@@ -26,11 +30,44 @@ class MeView(GenericAPIView):
         })
 
 
-class UserListView(GenericAPIView):
+class UserCursorPagination(KeysetPagination):
+    ordering = ["id"]
+
+
+class UserFilterMixin:
+    # role and is_active are served by the (role, id) and (is_active, id)
+    # indexes; the prefixes by the unique username / email indexes
+    queryset = User.objects.order_by("id")
+    filter_backends = [QueryParamsFilterBackend]
+    filter_serializer_class = UserFilterSerializer
+    filter_lookups = {
+        "role": "role",
+        "is_active": "is_active",
+        "username": "username__startswith",
+        "email": "email__startswith",
+    }
+
+
+class UserListView(UserFilterMixin, ListAPIView):
     permission_classes = [IsAdmin]
     serializer_class = UserListSerializer
-    queryset = User.objects.all().order_by("id")
+    pagination_class = UserCursorPagination
+
+
+class UserExportView(UserFilterMixin, GenericAPIView):
+    """Stream the filtered users as CSV (default) or NDJSON (?output=ndjson)."""
+    permission_classes = [IsAdmin]
+    export_columns = ["id", "username", "email", "first_name", "last_name", "role", "is_active", "date_joined"]
+    export_chunk_size = 2000
 
     def get(self, request, *args, **kwargs):
-        serializer = self.get_serializer(self.get_queryset(), many=True)
-        return Response(serializer.data)
\ No newline at end of file
+        output = request.query_params.get("output", "csv")
+        if output not in EXPORT_FORMATS:
+            raise ValidationError({"output": f"Must be one of: {', '.join(EXPORT_FORMATS)}."})
+
+        rows = (
+            self.filter_queryset(self.get_queryset())
+            .values_list(*self.export_columns)
+            .iterator(chunk_size=self.export_chunk_size)
+        )
+        return stream_rows(self.export_columns, rows, output=output, filename="users")
@@ -0,0 +1,84 @@
+from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import PermissionDenied as DjangoPermissionDenied
+from django.http import Http404, HttpResponse
+from django.views import View
+from rest_framework import exceptions, status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from accounts.authentication import ClaimsJWTAuthentication
+from accounts.principal import get_principal
+
+
+class AsyncAPIView(View):
+    """
+    Base for read-only async views. Does what APIView does for a GET (claims
+    JWT authentication, permission_classes, JSON body, DRF-style error
+    responses), but awaits every step that can reach the cache or database,
+    so under ASGI a request never holds a worker thread while it waits.
+
+    The principal's employee/department is loaded before permissions run,
+    so permission classes and queryset scoping stay plain sync code.
+    """
+
+    http_method_names = ["get", "head", "options"]
+    authentication_class = ClaimsJWTAuthentication
+    permission_classes = [IsAuthenticated]
+    renderer_class = JSONRenderer
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.request = request = Request(request)
+        try:
+            await self.initial(request)
+            handler = None
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), None)
+            if handler is None:
+                raise exceptions.MethodNotAllowed(request.method)
+            return await handler(request, *args, **kwargs)
+        except Exception as exc:
+            return self.handle_exception(exc)
+
+    async def initial(self, request):
+        authenticator = self.authentication_class()
+        request.authenticators = (authenticator,)
+        result = await authenticator.aauthenticate(request)
+        request.user, request.auth = result if result is not None else (AnonymousUser(), None)
+
+        principal = get_principal(request)
+        if principal is not None:
+            await principal.aresolve()
+
+        for permission in self.get_permissions():
+            if not permission.has_permission(request, self):
+                if not request.user.is_authenticated:
+                    raise exceptions.NotAuthenticated()
+                raise exceptions.PermissionDenied(getattr(permission, "message", None))
+
+    def get_permissions(self):
+        return [permission() for permission in self.permission_classes]
+
+    def render(self, data, status=status.HTTP_200_OK):
+        response = HttpResponse(
+            self.renderer_class().render(data),
+            status=status,
+            content_type=self.renderer_class.media_type,
+        )
+        # Read by RequestMetricsMiddleware, as on DRF responses
+        response.data = data
+        return response
+
+    def handle_exception(self, exc):
+        if isinstance(exc, Http404):
+            exc = exceptions.NotFound()
+        elif isinstance(exc, DjangoPermissionDenied):
+            exc = exceptions.PermissionDenied()
+        if not isinstance(exc, exceptions.APIException):
+            raise exc
+
+        data = exc.detail if isinstance(exc.detail, (list, dict)) else {"detail": exc.detail}
+        response = self.render(data, status=exc.status_code)
+        if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+            response["WWW-Authenticate"] = self.authentication_class().authenticate_header(self.request)
+        return response
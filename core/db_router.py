@@ -0,0 +1,115 @@
+import hashlib
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+_routing = ContextVar("db_routing", default=None)
+
+
+def replica_alias():
+    """The read replica's database alias, None when no replica is configured."""
+    alias = getattr(settings, "HRMS_DB_REPLICA_ALIAS", None)
+    return alias if alias and alias in settings.DATABASES else None
+
+
+def pin_key(request):
+    """Cache key for the caller's write pin: a hash of the bearer token or session cookie."""
+    credential = request.headers.get("Authorization") or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+    if not credential:
+        return None
+    return "hrms:db:pin:" + hashlib.sha256(credential.encode()).hexdigest()
+
+
+class _Routing:
+    """Per-request routing decision, filled in once the view is known."""
+
+    def __init__(self):
+        self.read_alias = None
+
+
+class ReplicaRouter:
+    """
+    Reads go to the replica only while ReplicaRoutingMiddleware has chosen
+    it for the current request; everything else (writes, migrations,
+    management commands, other requests) uses `default`.
+    """
+
+    def db_for_read(self, model, **hints):
+        routing = _routing.get()
+        return routing.read_alias if routing is not None else None
+
+    def db_for_write(self, model, **hints):
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as default
+        return True
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Route GET/HEAD requests for views with `replica_reads = True` (the hr
+    list and detail views) to the replica alias.
+
+    A write (any other method) pins its caller to the primary for
+    HRMS_DB_REPLICA_PIN_SECONDS, so they read their own writes while the
+    replica catches up. The pin is keyed by pin_key(), so it follows the
+    session rather than the process. Not installed when no replica is
+    configured.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.replica = replica_alias()
+        if self.replica is None:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.pin_seconds = getattr(settings, "HRMS_DB_REPLICA_PIN_SECONDS", 10)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        token = _routing.set(_Routing())
+        try:
+            response = self.get_response(request)
+        finally:
+            _routing.reset(token)
+        key = self._write_pin_key(request)
+        if key:
+            cache.set(key, True, self.pin_seconds)
+        return response
+
+    async def __acall__(self, request):
+        token = _routing.set(_Routing())
+        try:
+            response = await self.get_response(request)
+        finally:
+            _routing.reset(token)
+        key = self._write_pin_key(request)
+        if key:
+            await cache.aset(key, True, self.pin_seconds)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        routing = _routing.get()
+        view_class = getattr(view_func, "view_class", None)
+        if routing is None or request.method not in ("GET", "HEAD") or not getattr(view_class, "replica_reads", False):
+            return None
+        key = pin_key(request)
+        if key is None or not cache.get(key):
+            routing.read_alias = self.replica
+        return None
+
+    @staticmethod
+    def _write_pin_key(request):
+        return None if request.method in SAFE_METHODS else pin_key(request)
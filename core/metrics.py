@@ -0,0 +1,255 @@
+import json
+import logging
+import re
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from time import perf_counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger("hrms.requests")
+
+_current = ContextVar("request_metrics", default=None)
+
+# "IN (%s, %s, %s)" and multi-row VALUES differ only in length; fold them
+_PLACEHOLDER_LIST = re.compile(r"\((?:\s*%s\s*,)+\s*%s\s*\)")
+_VALUES_LIST = re.compile(r"(\(\.\.\.\)\s*,\s*)+\(\.\.\.\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(sql):
+    """SQL with variable-length placeholder lists folded, so repeats compare equal."""
+    sql = _PLACEHOLDER_LIST.sub("(...)", sql)
+    sql = _VALUES_LIST.sub("(...)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+class RequestMetrics:
+    """SQL count, DB time, timed spans and query fingerprints for one request."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.spans = Counter()
+        self.fingerprints = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper hook
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += perf_counter() - start
+            self.queries += 1
+            self.fingerprints[fingerprint(sql)] += 1
+
+    def duplicates(self, threshold):
+        return [(sql, count) for sql, count in self.fingerprints.most_common() if count >= threshold]
+
+
+def _dispatch(execute, sql, params, many, context):
+    # Permanent execute_wrapper: records into whichever request's context runs the query
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics(execute, sql, params, many, context)
+
+
+def _install():
+    """
+    Add _dispatch to this thread's connections (once each). Connections are
+    per thread and, under ASGI, one thread runs the queries of many
+    requests; the context var, which sync_to_async carries over, tells
+    them apart.
+    """
+    for alias in connections:
+        wrappers = connections[alias].execute_wrappers
+        if _dispatch not in wrappers:
+            wrappers.append(_dispatch)
+
+
+def current_metrics():
+    return _current.get()
+
+
+@contextmanager
+def span(name):
+    """Time a block into the current request's metrics (no-op outside a request)."""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        metrics.spans[name] += perf_counter() - start
+
+
+class _RouteSamples:
+    """
+    Query counts seen per (method, route, role) and result count, kept in
+    process memory. A route is flagged once its query count rises with the
+    number of results: at least two extra queries, and one per two extra rows.
+    """
+
+    max_samples = 32
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples = {}
+        self.flagged = set()
+
+    def record(self, key, results, queries):
+        """Store a sample; True the first time `key` looks like an N+1."""
+        if not results:
+            return False
+        with self._lock:
+            samples = self._samples.setdefault(key, {})
+            if results not in samples and len(samples) >= self.max_samples:
+                return False
+            samples[results] = min(queries, samples.get(results, queries))
+            if key in self.flagged:
+                return False
+            for other_results, other_queries in samples.items():
+                (low_results, low_queries), (high_results, high_queries) = sorted(
+                    [(other_results, other_queries), (results, samples[results])]
+                )
+                extra_queries = high_queries - low_queries
+                if extra_queries >= 2 and extra_queries * 2 >= high_results - low_results:
+                    self.flagged.add(key)
+                    return True
+        return False
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+            self.flagged.clear()
+
+
+route_samples = _RouteSamples()
+
+
+def _result_count(response):
+    data = getattr(response, "data", None)
+    if isinstance(data, dict):
+        data = data.get("results")
+    return len(data) if isinstance(data, list) else None
+
+
+class RequestMetricsMiddleware:
+    """
+    Record per-request SQL count, DB time, timed spans (e.g. "serialize")
+    and duplicate query fingerprints. They are sent back in a Server-Timing
+    header and logged as one JSON line on the "hrms.requests" logger (INFO);
+    a route whose query count grows with its result count is logged once as
+    a WARNING. Streaming responses are measured until the body is consumed.
+    Works under WSGI and ASGI; async requests stay on the event loop.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, "HRMS_REQUEST_METRICS", True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.duplicate_threshold = getattr(settings, "HRMS_DUPLICATE_QUERY_THRESHOLD", 3)
+        # Under ASGI stay async, so async views are not pushed onto a thread
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        _install()
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        start = perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, metrics, start)
+
+    async def __acall__(self, request):
+        # Queries run on sync_to_async's thread, so install the hook there
+        await sync_to_async(_install)()
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        start = perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, metrics, start)
+
+    def _finish(self, request, response, metrics, start):
+        response["Server-Timing"] = self._server_timing(metrics, perf_counter() - start)
+        if response.streaming:
+            stream = self._astream if response.is_async else self._stream
+            response.streaming_content = stream(response.streaming_content, request, response, metrics, start)
+        else:
+            self._report(request, response, metrics, perf_counter() - start)
+        return response
+
+    def _stream(self, content, request, response, metrics, start):
+        _install()
+        previous = _current.set(metrics).old_value
+        try:
+            yield from content
+        finally:
+            _current.set(None if previous is Token.MISSING else previous)
+        self._report(request, response, metrics, perf_counter() - start)
+
+    async def _astream(self, content, request, response, metrics, start):
+        previous = _current.set(metrics).old_value
+        try:
+            async for chunk in content:
+                yield chunk
+        finally:
+            _current.set(None if previous is Token.MISSING else previous)
+        self._report(request, response, metrics, perf_counter() - start)
+
+    @staticmethod
+    def _server_timing(metrics, total):
+        entries = [f'db;dur={metrics.db_time * 1000:.2f};desc="{metrics.queries} queries"']
+        entries += [f"{name};dur={elapsed * 1000:.2f}" for name, elapsed in metrics.spans.items()]
+        entries.append(f"total;dur={total * 1000:.2f}")
+        return ", ".join(entries)
+
+    def _report(self, request, response, metrics, total):
+        match = request.resolver_match
+        route = match.route if match else None
+        role = getattr(getattr(request, "user", None), "role", None)
+        results = _result_count(response)
+        grows = route is not None and route_samples.record((request.method, route, role), results, metrics.queries)
+
+        record = {
+            "method": request.method,
+            "path": request.path,
+            "route": route,
+            "role": role,
+            "status": response.status_code,
+            "total_ms": round(total * 1000, 2),
+            "queries": metrics.queries,
+            "db_ms": round(metrics.db_time * 1000, 2),
+            **{f"{name}_ms": round(elapsed * 1000, 2) for name, elapsed in metrics.spans.items()},
+            "results": results,
+            "duplicates": [
+                {"sql": sql[:200], "count": count}
+                for sql, count in metrics.duplicates(self.duplicate_threshold)
+            ],
+        }
+        logger.info(json.dumps(record))
+        if grows:
+            logger.warning(
+                "Query count grows with result count on %s %s (role %s): %s queries for %s results",
+                request.method, route, role, metrics.queries, results,
+            )
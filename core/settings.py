@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -44,6 +45,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.metrics.RequestMetricsMiddleware',
+    'core.db_router.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -76,6 +79,14 @@ WSGI_APPLICATION = 'core.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
+# Each alias keeps a psycopg 3 connection pool (needs psycopg[pool]);
+# CONN_MAX_AGE must stay 0 when pooling
+DATABASE_POOL = {
+    "min_size": int(os.environ.get("HRMS_DB_POOL_MIN_SIZE", 2)),
+    "max_size": int(os.environ.get("HRMS_DB_POOL_MAX_SIZE", 10)),
+    "timeout": int(os.environ.get("HRMS_DB_POOL_TIMEOUT", 10)),
+}
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
@@ -84,12 +95,33 @@ DATABASES = {
         "PASSWORD": "32165",
         "HOST": "localhost",
         "PORT": "5432",
+        "OPTIONS": {"pool": DATABASE_POOL},
     }
 }
 
+# Optional streaming replica for hr list/detail GETs (core.db_router).
+# Unset HRMS_DB_REPLICA_HOST to read everything from default.
+HRMS_DB_REPLICA_ALIAS = None
+if os.environ.get("HRMS_DB_REPLICA_HOST"):
+    HRMS_DB_REPLICA_ALIAS = "replica"
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "HOST": os.environ["HRMS_DB_REPLICA_HOST"],
+        "PORT": os.environ.get("HRMS_DB_REPLICA_PORT", DATABASES["default"]["PORT"]),
+        "USER": os.environ.get("HRMS_DB_REPLICA_USER", DATABASES["default"]["USER"]),
+        "PASSWORD": os.environ.get("HRMS_DB_REPLICA_PASSWORD", DATABASES["default"]["PASSWORD"]),
+        # Tests run against default only
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_ROUTERS = ["core.db_router.ReplicaRouter"]
+
+# Seconds a caller keeps reading from default after a write of theirs
+HRMS_DB_REPLICA_PIN_SECONDS = 10
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "accounts.authentication.ClaimsJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
@@ -98,6 +130,36 @@ REST_FRAMEWORK = {
     "PAGE_SIZE": 20,
 }
 
+# Token versions and department responses are cached here; use a shared
+# backend (Redis, memcached) when running more than one process
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "hrms",
+    }
+}
+
+# Seconds a cached department list/detail response is served (hr.caching)
+HRMS_DEPARTMENT_CACHE_TTL = 300
+
+# Amount deducted from a payroll per ABSENT day / LATE occurrence in its month
+# (hr.deductions), e.g. {"ABSENT": "50.00", "LATE": "10.00"}; empty turns
+# attendance deductions off
+HRMS_ATTENDANCE_DEDUCTION_RATES = {}
+
+# Imports with at least this many passwords hash them in a process pool
+# (hr.onboarding); smaller ones hash inline
+HRMS_ONBOARDING_PARALLEL_THRESHOLD = 64
+
+# Seconds a cached User.token_version is trusted before it is re-read
+HRMS_TOKEN_VERSION_TTL = 60
+
+# Per-request SQL count, DB time and Server-Timing (core.metrics); JSON lines
+# go to the "hrms.requests" logger at INFO
+HRMS_REQUEST_METRICS = True
+# A query fingerprint seen this many times in one request is logged as a duplicate
+HRMS_DUPLICATE_QUERY_THRESHOLD = 3
+
 #custom user model
 AUTH_USER_MODEL = "accounts.User"
 
@@ -0,0 +1,107 @@
+from django.http import Http404
+
+from core.async_views import AsyncAPIView
+from core.metrics import span
+
+from .caching import AsyncDepartmentCacheMixin
+from .conditional import AsyncConditionalListMixin
+from .fastpath import values_serializer_for
+from .pagination import AsyncPageNumberPagination, OptInKeysetPagination
+from .serializers import AttendanceSerializer, DepartmentSerializer, EmployeeSerializer, PayrollSerializer
+from .views import (
+    AttendanceFilterMixin,
+    AttendanceScopedMixin,
+    DepartmentScopedMixin,
+    EmployeeScopedMixin,
+    PayrollFilterMixin,
+    PayrollScopedMixin,
+)
+
+
+class AsyncValuesView(AsyncAPIView):
+    """
+    Async GET of the scoped queryset through ValuesSerializer (hr.fastpath).
+    Scoping and filtering come from the same mixins as the sync views; they
+    only build the queryset, which is evaluated here with the async ORM.
+    """
+
+    queryset = None
+    serializer_class = None
+    filter_backends = ()
+    replica_reads = True
+
+    def get_queryset(self):
+        return self.queryset.all()
+
+    def get_serializer_class(self):
+        return self.serializer_class
+
+    def get_serializer_context(self):
+        return {"request": self.request, "view": self}
+
+    def filter_queryset(self, queryset):
+        for backend in self.filter_backends:
+            queryset = backend().filter_queryset(self.request, queryset, self)
+        return queryset
+
+
+class AsyncValuesListView(AsyncValuesView):
+    """Same body as the sync list: paginated, filtered, serialized from .values() rows."""
+
+    pagination_class = AsyncPageNumberPagination
+
+    async def get(self, request, *args, **kwargs):
+        serializer = values_serializer_for(self.get_serializer_class())
+        queryset = self.filter_queryset(self.get_queryset()).values(*serializer.columns)
+
+        paginator = self.pagination_class()
+        page = await paginator.apaginate_queryset(queryset, request, view=self)
+        rows = page if page is not None else [row async for row in queryset]
+        with span("serialize"):
+            data = serializer.to_representation(rows)
+        if page is None:
+            return self.render(data)
+        return self.render(paginator.get_paginated_response(data).data)
+
+
+class AsyncValuesDetailView(AsyncValuesView):
+    async def get(self, request, pk, *args, **kwargs):
+        serializer = values_serializer_for(self.get_serializer_class())
+        row = await self.get_queryset().filter(pk=pk).values(*serializer.columns).afirst()
+        if row is None:
+            raise Http404
+        return self.render(serializer.to_representation([row])[0])
+
+
+class AsyncDepartmentListView(DepartmentScopedMixin, AsyncDepartmentCacheMixin, AsyncValuesListView):
+    serializer_class = DepartmentSerializer
+
+
+class AsyncDepartmentDetailView(DepartmentScopedMixin, AsyncDepartmentCacheMixin, AsyncValuesDetailView):
+    serializer_class = DepartmentSerializer
+
+
+class AsyncEmployeeListView(EmployeeScopedMixin, AsyncValuesListView):
+    serializer_class = EmployeeSerializer
+
+
+class AsyncEmployeeDetailView(EmployeeScopedMixin, AsyncValuesDetailView):
+    serializer_class = EmployeeSerializer
+
+
+class AsyncAttendanceListView(AttendanceScopedMixin, AttendanceFilterMixin, AsyncConditionalListMixin, AsyncValuesListView):
+    serializer_class = AttendanceSerializer
+    pagination_class = OptInKeysetPagination
+
+
+class AsyncAttendanceDetailView(AttendanceScopedMixin, AsyncValuesDetailView):
+    serializer_class = AttendanceSerializer
+
+
+class AsyncPayrollListView(PayrollScopedMixin, PayrollFilterMixin, AsyncConditionalListMixin, AsyncValuesListView):
+    serializer_class = PayrollSerializer
+    pagination_class = OptInKeysetPagination
+
+
+class AsyncPayrollDetailView(PayrollScopedMixin, AsyncValuesDetailView):
+    serializer_class = PayrollSerializer
@@ -0,0 +1,387 @@
+import asyncio
+import logging
+import math
+import platform
+import statistics
+import subprocess
+from collections import Counter
+from datetime import datetime, timezone
+from time import perf_counter
+
+import django
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.asgi import get_asgi_application
+from django.core.signals import request_finished, request_started
+from django.db import close_old_connections, connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+import accounts.urls
+import hr.urls
+from accounts.models import User
+from accounts.serializers import CustomTokenObtainPairSerializer
+
+from .models import Attendance, Department, Employee, LeaveRequest, LeaveType, Payroll
+
+ROLES = (User.Role.ADMIN, User.Role.MANAGER, User.Role.EMPLOYEE)
+
+PERCENTILES = (50, 90, 95, 99)
+
+# Route-name prefix -> model whose id fills <int:pk>
+ROUTE_MODELS = {
+    "department": Department,
+    "employee": Employee,
+    "attendance": Attendance,
+    "payroll": Payroll,
+    "leavetype": LeaveType,
+    "leaverequest": LeaveRequest,
+}
+
+
+# Sync list/me routes and their async counterparts, compared under ASGI
+ASYNC_ROUTES = {
+    "department-list": "department-list-async",
+    "employee-list": "employee-list-async",
+    "attendance-list": "attendance-list-async",
+    "payroll-list": "payroll-list-async",
+    "me": "me-async",
+}
+
+
+def git_sha():
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def get_routes():
+    """(name, pattern) for every GET route in hr.urls and accounts.urls."""
+    routes = []
+    for module in (hr.urls, accounts.urls):
+        for pattern in module.urlpatterns:
+            view_class = getattr(pattern.callback, "view_class", None)
+            if pattern.name and view_class is not None and hasattr(view_class, "get"):
+                routes.append((pattern.name, pattern))
+    return routes
+
+
+def benchmark_users(prefix=None):
+    """One active user per role, preferring users with an employee profile."""
+    users = {}
+    for role in ROLES:
+        candidates = User.objects.filter(role=role, is_active=True).select_related("employee")
+        if prefix:
+            candidates = candidates.filter(username__startswith=f"{prefix}_")
+        user = (
+            candidates.filter(employee__isnull=False).order_by("id").first()
+            or candidates.order_by("id").first()
+        )
+        if user is not None:
+            users[role] = user
+    return users
+
+
+def _sample_pk(model, employee):
+    # Rows tied to the user's own employee are visible to every role
+    if employee is not None:
+        if model is Employee:
+            return employee.id
+        if model is Department and employee.department_id:
+            return employee.department_id
+        if model in (Attendance, Payroll, LeaveRequest):
+            pk = model.objects.filter(employee=employee).values_list("id", flat=True).first()
+            if pk is not None:
+                return pk
+    return model.objects.order_by("id").values_list("id", flat=True).first()
+
+
+def _query_params(name):
+    if name == "attendance-summary":
+        latest = Attendance.objects.order_by("-date").values_list("date", flat=True).first()
+        if latest:
+            return {"year": latest.year, "month": latest.month}
+    return {}
+
+
+def _rows_scanned():
+    # Per-transaction tuple counters, so each request is measured in isolation
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT COALESCE(SUM(COALESCE(seq_tup_read, 0) + COALESCE(idx_tup_fetch, 0)), 0) "
+            "FROM pg_stat_xact_user_tables"
+        )
+        return int(cursor.fetchone()[0])
+
+
+def _host():
+    for host in settings.ALLOWED_HOSTS:
+        if host != "*" and not host.startswith("."):
+            return host
+    return "localhost"
+
+
+def _measure(client, path, params):
+    """
+    One in-process GET, including reading a streamed body. Runs in a
+    transaction that is rolled back, which also scopes the row counters.
+    """
+    with transaction.atomic():
+        scanned_before = _rows_scanned()
+        with CaptureQueriesContext(connection) as queries:
+            start = perf_counter()
+            response = client.get(path, params)
+            if response.streaming:
+                size = sum(len(chunk) for chunk in response.streaming_content)
+            else:
+                size = len(response.content)
+            elapsed = perf_counter() - start
+        scanned = None if scanned_before is None else _rows_scanned() - scanned_before
+        transaction.set_rollback(True)
+    return response.status_code, elapsed, len(queries), scanned, size
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a sorted list."""
+    return samples[max(0, math.ceil(pct / 100 * len(samples)) - 1)]
+
+
+def summarize(samples):
+    samples = sorted(samples)
+    summary = {"min": samples[0], "mean": statistics.fmean(samples), "max": samples[-1]}
+    for pct in PERCENTILES:
+        summary[f"p{pct}"] = percentile(samples, pct)
+    return {key: round(value * 1000, 3) for key, value in summary.items()}
+
+
+def _benchmark_routes(users, iterations, warmup, roles, routes, progress):
+    for name, pattern in get_routes():
+        if routes and name not in routes:
+            continue
+        for role in roles:
+            user = users.get(role)
+            if user is None:
+                continue
+            employee = getattr(user, "employee", None)
+            kwargs = {}
+            if "pk" in pattern.pattern.converters:
+                pk = _sample_pk(ROUTE_MODELS[name.split("-")[0]], employee)
+                if pk is None:
+                    continue
+                kwargs["pk"] = pk
+            path = reverse(name, kwargs=kwargs)
+            params = _query_params(name)
+
+            token = CustomTokenObtainPairSerializer.get_token(user).access_token
+            client = Client(SERVER_NAME=_host(), HTTP_AUTHORIZATION=f"Bearer {token}")
+            for _ in range(warmup):
+                _measure(client, path, params)
+
+            latencies, queries, scanned = [], [], []
+            for _ in range(iterations):
+                status_code, elapsed, query_count, rows, size = _measure(client, path, params)
+                latencies.append(elapsed)
+                queries.append(query_count)
+                scanned.append(rows)
+
+            result = {
+                "route": name,
+                "path": path,
+                "role": role,
+                "user": user.username,
+                "status": status_code,
+                "iterations": iterations,
+                "latency_ms": summarize(latencies),
+                "queries": max(queries),
+                "rows_scanned": None if scanned[-1] is None else max(scanned),
+                "bytes": size,
+            }
+            if progress:
+                progress(result)
+            yield result
+
+
+def run_benchmark(iterations=20, warmup=2, roles=ROLES, prefix=None, routes=None, progress=None):
+    """
+    Request every GET route of the hr and accounts APIs as each role through
+    the Django test client, with a real access token. Returns a JSON-ready
+    dict: run metadata (git sha, database, data volumes) and per route/role
+    latency percentiles in ms, SQL query count, rows scanned (Postgres only,
+    from pg_stat_xact_user_tables; None elsewhere) and response size.
+    """
+    users = benchmark_users(prefix)
+    # Expected 403s/404s would otherwise log a warning per request
+    request_logger = logging.getLogger("django.request")
+    level = request_logger.level
+    request_logger.setLevel(logging.ERROR)
+    try:
+        results = list(_benchmark_routes(users, iterations, warmup, roles, routes, progress))
+    finally:
+        request_logger.setLevel(level)
+
+    return {
+        "meta": {
+            "git_sha": git_sha(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "database": connection.vendor,
+            "django": django.get_version(),
+            "python": platform.python_version(),
+            "iterations": iterations,
+            "warmup": warmup,
+            "data": {
+                "departments": Department.objects.count(),
+                "employees": Employee.objects.count(),
+                "attendance": Attendance.objects.count(),
+                "payrolls": Payroll.objects.count(),
+            },
+        },
+        "results": results,
+    }
+
+
+def compare(baseline, current, threshold=0.2):
+    """
+    Regressions of `current` against a `baseline` run: routes whose p50
+    latency grew by more than `threshold` (a fraction) or whose query count
+    or rows scanned went up. Routes missing from either run are ignored.
+    """
+    before = {(r["route"], r["role"]): r for r in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        old = before.get((result["route"], result["role"]))
+        if old is None:
+            continue
+        changes = {}
+        if result["latency_ms"]["p50"] > old["latency_ms"]["p50"] * (1 + threshold):
+            changes["p50_ms"] = (old["latency_ms"]["p50"], result["latency_ms"]["p50"])
+        for key in ("queries", "rows_scanned"):
+            if old.get(key) is not None and result.get(key) is not None and result[key] > old[key]:
+                changes[key] = (old[key], result[key])
+        if changes:
+            regressions.append({"route": result["route"], "role": result["role"], "changes": changes})
+    return regressions
+
+
+async def _asgi_get(application, path, headers):
+    """One GET through the ASGI application; returns the status code."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": headers,
+        "client": ("127.0.0.1", 0),
+        "server": (_host(), 80),
+    }
+    body_sent = False
+
+    async def receive():
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # The client never disconnects; the handler cancels this wait when done
+        await asyncio.Event().wait()
+
+    status_code = None
+
+    async def send(message):
+        nonlocal status_code
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+
+    await application(scope, receive, send)
+    return status_code
+
+
+async def _drive(application, path, headers, requests, concurrency):
+    # `concurrency` clients share one queue of `requests` GETs
+    latencies, statuses = [], Counter()
+    pending = iter(range(requests))
+
+    async def client():
+        for _ in pending:
+            start = perf_counter()
+            statuses[await _asgi_get(application, path, headers)] += 1
+            latencies.append(perf_counter() - start)
+
+    start = perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = perf_counter() - start
+    return {
+        "path": path,
+        "requests": requests,
+        "rps": round(requests / elapsed, 1),
+        "latency_ms": summarize(latencies),
+        "statuses": {str(code): count for code, count in sorted(statuses.items())},
+    }
+
+
+def run_concurrency_benchmark(requests=200, concurrency=20, warmup=10, role=User.Role.ADMIN, prefix=None, routes=None, progress=None):
+    """
+    Drive Django's ASGI application in-process with `concurrency` clients
+    and compare each sync route in ASYNC_ROUTES with its async counterpart:
+    requests per second and latency percentiles (ms) from one event loop,
+    i.e. one ASGI worker. Sync views run on Django's single thread for sync
+    code, so they serialize; async views interleave while awaiting.
+    """
+    user = benchmark_users(prefix).get(role)
+    results = []
+    if user is None:
+        return {"meta": {}, "results": results}
+
+    token = CustomTokenObtainPairSerializer.get_token(user).access_token
+    headers = [(b"host", _host().encode()), (b"authorization", f"Bearer {token}".encode())]
+    application = get_asgi_application()
+
+    # Keep the current connection for the whole run, as the test client does
+    request_started.disconnect(close_old_connections)
+    request_finished.disconnect(close_old_connections)
+    request_logger = logging.getLogger("django.request")
+    level = request_logger.level
+    request_logger.setLevel(logging.ERROR)
+    try:
+        for sync_name, async_name in ASYNC_ROUTES.items():
+            if routes and sync_name not in routes:
+                continue
+            result = {"route": sync_name, "role": role}
+            for mode, name in (("sync", sync_name), ("async", async_name)):
+                path = reverse(name)
+                if warmup:
+                    async_to_sync(_drive)(application, path, headers, warmup, concurrency)
+                result[mode] = async_to_sync(_drive)(application, path, headers, requests, concurrency)
+            result["speedup"] = round(result["async"]["rps"] / result["sync"]["rps"], 2)
+            if progress:
+                progress(result)
+            results.append(result)
+    finally:
+        request_logger.setLevel(level)
+        request_started.connect(close_old_connections)
+        request_finished.connect(close_old_connections)
+
+    return {
+        "meta": {
+            "git_sha": git_sha(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "database": connection.vendor,
+            "django": django.get_version(),
+            "python": platform.python_version(),
+            "requests": requests,
+            "concurrency": concurrency,
+            "user": user.username,
+        },
+        "results": results,
+    }
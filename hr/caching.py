@@ -0,0 +1,101 @@
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+from accounts.models import User
+from accounts.principal import get_principal
+
+DEPARTMENT_CACHE_VERSION_KEY = "hr:departments:version"
+
+
+def _department_cache_version():
+    version = cache.get(DEPARTMENT_CACHE_VERSION_KEY)
+    if version is None:
+        # Random, so entries written under an evicted version never match again
+        version = uuid4().hex
+        if not cache.add(DEPARTMENT_CACHE_VERSION_KEY, version, None):
+            version = cache.get(DEPARTMENT_CACHE_VERSION_KEY, version)
+    return version
+
+
+async def _adepartment_cache_version():
+    version = await cache.aget(DEPARTMENT_CACHE_VERSION_KEY)
+    if version is None:
+        version = uuid4().hex
+        if not await cache.aadd(DEPARTMENT_CACHE_VERSION_KEY, version, None):
+            version = await cache.aget(DEPARTMENT_CACHE_VERSION_KEY, version)
+    return version
+
+
+def invalidate_department_cache():
+    """Drop every cached department response by moving to a new version."""
+    cache.delete(DEPARTMENT_CACHE_VERSION_KEY)
+    # A concurrent read may re-cache the old rows before we commit
+    transaction.on_commit(lambda: cache.delete(DEPARTMENT_CACHE_VERSION_KEY))
+
+
+def _department_cache_key(request, version):
+    # Admins see every department; everyone else only their own
+    principal = get_principal(request)
+    scope = "all" if principal.role == User.Role.ADMIN else principal.department_id
+    return f"hr:departments:{version}:{principal.role}:{scope}:{request.build_absolute_uri()}"
+
+
+def department_cache_key(request):
+    return _department_cache_key(request, _department_cache_version())
+
+
+async def adepartment_cache_key(request):
+    return _department_cache_key(request, await _adepartment_cache_version())
+
+
+class DepartmentCacheMixin:
+    """
+    Serve department GETs from the cache, keyed by role, department scope and
+    URL. Any Department save/delete (and Employee changes that touch a
+    department's manager) invalidates all entries; see hr.signals. Writes
+    made with queryset.update()/bulk_update() must call
+    invalidate_department_cache() themselves.
+
+    Reads stay on the primary: entries are shared by every caller, so a miss
+    served by a lagging replica would re-cache rows the invalidation just
+    dropped, for everyone and for the whole TTL.
+    """
+    replica_reads = False
+
+    def list(self, request, *args, **kwargs):
+        return self._cached(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._cached(request, super().retrieve, *args, **kwargs)
+
+    def _cached(self, request, handler, *args, **kwargs):
+        key = department_cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, getattr(settings, "HRMS_DEPARTMENT_CACHE_TTL", 300))
+        return response
+
+
+class AsyncDepartmentCacheMixin:
+    """DepartmentCacheMixin for async views (hr.async_views), sharing its invalidation."""
+    replica_reads = False
+
+    async def get(self, request, *args, **kwargs):
+        key = await adepartment_cache_key(request)
+        data = await cache.aget(key)
+        if data is not None:
+            return self.render(data)
+
+        response = await super().get(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            await cache.aset(key, response.data, getattr(settings, "HRMS_DEPARTMENT_CACHE_TTL", 300))
+        return response
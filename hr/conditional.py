@@ -0,0 +1,163 @@
+import hashlib
+from calendar import timegm
+
+from django.db import transaction
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.response import Response
+
+
+class PreconditionFailed(APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = "The record has changed since it was fetched; reload it and try again."
+    default_code = "precondition_failed"
+
+
+def _timestamp(value):
+    return timegm(value.utctimetuple()) if value else None
+
+
+def _set_validators(response, etag, last_modified):
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified)
+    return response
+
+
+def _not_modified(request, etag, last_modified):
+    # 304 (or 412 for a failed If-Match on GET), None when the body is needed
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is not None:
+        _set_validators(response, etag, last_modified)
+    return response
+
+
+class ConditionalRecordMixin:
+    """
+    ETag/Last-Modified on GET of a single record, answering 304 to
+    If-None-Match/If-Modified-Since before anything is serialized.
+
+    PUT/PATCH with If-Match lock the row (select_for_update on the record's
+    own table) and compare it to the current ETag; a stale one fails with
+    412, so concurrent editors cannot overwrite each other. Without If-Match
+    updates behave as before. Responses carry the new ETag.
+
+    By default the ETag follows `updated_at`; override record_etag_parts()
+    for models that track changes differently.
+    """
+
+    _lock_for_update = False
+
+    def record_etag_parts(self, obj):
+        return (obj.pk, obj.updated_at.isoformat())
+
+    def record_last_modified(self, obj):
+        return _timestamp(getattr(obj, "updated_at", None))
+
+    def record_etag(self, obj):
+        digest = hashlib.sha1(repr(self.record_etag_parts(obj)).encode()).hexdigest()
+        return quote_etag(digest[:20])
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        if self._lock_for_update:
+            qs = qs.select_for_update(of=("self",))
+        return qs
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        etag, last_modified = self.record_etag(instance), self.record_last_modified(instance)
+        not_modified = _not_modified(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+        return _set_validators(Response(self.get_serializer(instance).data), etag, last_modified)
+
+    def update(self, request, *args, **kwargs):
+        if_match = request.headers.get("If-Match")
+        if not if_match:
+            return self._with_validators(super().update(request, *args, **kwargs))
+
+        partial = kwargs.pop("partial", False)
+        with transaction.atomic():
+            self._lock_for_update = True
+            try:
+                instance = self.get_object()
+            finally:
+                self._lock_for_update = False
+            etags = parse_etags(if_match)
+            if "*" not in etags and self.record_etag(instance) not in etags:
+                raise PreconditionFailed()
+
+            serializer = self.get_serializer(instance, data=request.data, partial=partial)
+            serializer.is_valid(raise_exception=True)
+            self.perform_update(serializer)
+        return self._with_validators(Response(serializer.data))
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        self._updated = serializer.instance
+
+    def _with_validators(self, response):
+        instance = getattr(self, "_updated", None)
+        if response.status_code == status.HTTP_200_OK and instance is not None:
+            _set_validators(response, self.record_etag(instance), self.record_last_modified(instance))
+        return response
+
+
+_LIST_STATE = {"latest": Max("updated_at"), "count": Count("id")}
+
+
+class ConditionalListMixin:
+    """
+    ETag for list GETs from one aggregate over the filtered, scoped queryset
+    (latest updated_at and row count) plus the caller and query string. A
+    matching If-None-Match gets a 304 without fetching the page; otherwise
+    the count doubles as the paginator's (`known_count`). Keyset pages
+    (`?cursor=`) are served as before, since they never count.
+
+    Lists send no Last-Modified: the latest updated_at stays put when an
+    older row is deleted, so If-Modified-Since alone would get stale 304s.
+    The ETag also carries the count.
+    """
+
+    def list(self, request, *args, **kwargs):
+        keyset_class = getattr(self.paginator, "keyset_class", None)
+        if keyset_class is not None and keyset_class.cursor_query_param in request.query_params:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        state = queryset.order_by().aggregate(**_LIST_STATE)
+        etag, last_modified = self._list_validators(request, state)
+
+        not_modified = _not_modified(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+        return _set_validators(super().list(request, *args, **kwargs), etag, last_modified)
+
+    def _list_validators(self, request, state):
+        self.known_count = state["count"]
+        latest = state["latest"].isoformat() if state["latest"] else None
+        parts = (request.user.pk, latest, state["count"], request.get_full_path())
+        etag = quote_etag(hashlib.sha1(repr(parts).encode()).hexdigest()[:20])
+        return etag, None
+
+
+class AsyncConditionalListMixin(ConditionalListMixin):
+    """ConditionalListMixin for async list views (hr.async_views)."""
+
+    async def get(self, request, *args, **kwargs):
+        keyset_class = getattr(self.pagination_class, "keyset_class", None)
+        if keyset_class is not None and keyset_class.cursor_query_param in request.query_params:
+            return await super().get(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        state = await queryset.order_by().aaggregate(**_LIST_STATE)
+        etag, last_modified = self._list_validators(request, state)
+
+        not_modified = _not_modified(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+        return _set_validators(await super().get(request, *args, **kwargs), etag, last_modified)
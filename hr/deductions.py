@@ -0,0 +1,159 @@
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, DecimalField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Greatest, Least
+from django.utils import timezone
+
+from .models import Attendance, Payroll, PayrollDeduction
+from .partitions import add_months
+from .status import AttendanceStatus, PayrollStatus
+
+CENT = Decimal("0.01")
+
+
+def deduction_rates():
+    """{AttendanceStatus: amount per occurrence} from HRMS_ATTENDANCE_DEDUCTION_RATES, zero rates dropped."""
+    rates = {}
+    for status, rate in getattr(settings, "HRMS_ATTENDANCE_DEDUCTION_RATES", {}).items():
+        rate = Decimal(str(rate)).quantize(CENT)
+        if rate:
+            rates[AttendanceStatus(status)] = rate
+    return rates
+
+
+def attendance_counts(year, month, employees, statuses):
+    """
+    {employee_id: {status: occurrences}} for the month, from one grouped
+    query over hr_attendance. `employees` is a list of ids or a queryset of
+    them (used as a subquery).
+    """
+    first = date(year, month, 1)
+    rows = (
+        Attendance.objects
+        .filter(date__gte=first, date__lt=add_months(first, 1), status__in=statuses, employee_id__in=employees)
+        .order_by()
+        .values("employee_id", "status")
+        .annotate(occurrences=Count("id"))
+    )
+    counts = defaultdict(dict)
+    for row in rows:
+        counts[row["employee_id"]][row["status"]] = row["occurrences"]
+    return counts
+
+
+def cap_deductions(available, amount):
+    """
+    The one capping rule for attendance deductions, used by payroll runs,
+    draft edits and salary recomputes: they never exceed what is left of the
+    gross after the manual deductions (`available`), so they alone never
+    take net salary below zero. Returns (amount, capped).
+    """
+    available = max(available, Decimal("0"))
+    return (available, True) if amount > available else (amount, False)
+
+
+def capped_deductions_expression(available):
+    """
+    cap_deductions() as a query expression over a Payroll queryset: the
+    itemised PayrollDeduction total, capped at `available`.
+    """
+    money = DecimalField(max_digits=12, decimal_places=2)
+    itemised = Coalesce(
+        Subquery(
+            PayrollDeduction.objects
+            .filter(payroll_id=OuterRef("pk"))
+            .order_by()
+            .values("payroll_id")
+            .annotate(total=Sum("amount"))
+            .values("total")[:1]
+        ),
+        Value(Decimal("0")),
+        output_field=money,
+    )
+    return Least(itemised, Greatest(available, Value(Decimal("0")), output_field=money), output_field=money)
+
+
+def breakdown(counts, rates):
+    """[(status, occurrences, rate, amount)] for one employee's counts."""
+    return [
+        (status, counts[status], rate, (rate * counts[status]).quantize(CENT))
+        for status, rate in rates.items()
+        if counts.get(status)
+    ]
+
+
+def employee_deductions(employee_id, year, month):
+    """(total, breakdown) of one employee's attendance deductions for the month."""
+    rates = deduction_rates()
+    if not rates:
+        return Decimal("0"), []
+    lines = breakdown(attendance_counts(year, month, [employee_id], list(rates)).get(employee_id, {}), rates)
+    return sum((amount for *_, amount in lines), Decimal("0")), lines
+
+
+def save_breakdown(payroll_id, lines):
+    """Replace a payroll's PayrollDeduction rows with `lines`."""
+    PayrollDeduction.objects.filter(payroll_id=payroll_id).delete()
+    PayrollDeduction.objects.bulk_create(
+        PayrollDeduction(payroll_id=payroll_id, status=status, occurrences=n, rate=rate, amount=amount)
+        for status, n, rate, amount in lines
+    )
+
+
+def apply_attendance_deductions(year, month, payroll_ids=None, department_id=None, batch_size=1000):
+    """
+    Recompute attendance deductions and net salary for the month's DRAFT
+    payrolls (optionally only `payroll_ids`, or one department).
+
+    Status counts for every payroll's employee come from a single grouped
+    aggregate; the payrolls are then written with bulk_update (one CASE
+    UPDATE per batch) and their PayrollDeduction rows replaced. Amounts are
+    capped by cap_deductions(); those payrolls are listed as capped.
+    """
+    rates = deduction_rates()
+    drafts = Payroll.objects.filter(year=year, month=month, status=PayrollStatus.DRAFT)
+    if payroll_ids is not None:
+        drafts = drafts.filter(id__in=payroll_ids)
+    if department_id is not None:
+        drafts = drafts.filter(department_id=department_id)
+
+    now = timezone.now()
+    updated, lines, capped, total = [], [], [], Decimal("0")
+    with transaction.atomic():
+        counts = attendance_counts(year, month, drafts.values("employee_id"), list(rates)) if rates else {}
+        rows = drafts.select_for_update().values_list("id", "employee_id", "base_salary", "allowances", "deductions")
+        for payroll_id, employee_id, base, allowances, deductions in rows:
+            items = breakdown(counts.get(employee_id, {}), rates)
+            amount = sum((a for *_, a in items), Decimal("0"))
+            available = base + allowances - deductions
+            amount, was_capped = cap_deductions(available, amount)
+            if was_capped:
+                capped.append(payroll_id)
+            total += amount
+            updated.append(Payroll(
+                id=payroll_id,
+                attendance_deductions=amount,
+                net_salary=max(available, Decimal("0")) - amount,
+                updated_at=now,
+            ))
+            lines.extend(
+                PayrollDeduction(payroll_id=payroll_id, status=status, occurrences=n, rate=rate, amount=line_amount)
+                for status, n, rate, line_amount in items
+            )
+
+        ids = [payroll.id for payroll in updated]
+        Payroll.objects.bulk_update(updated, ["attendance_deductions", "net_salary", "updated_at"], batch_size=batch_size)
+        for start in range(0, len(ids), batch_size):
+            PayrollDeduction.objects.filter(payroll_id__in=ids[start:start + batch_size]).delete()
+        PayrollDeduction.objects.bulk_create(lines, batch_size=batch_size)
+
+    return {
+        "payrolls": len(updated),
+        "deducted": sum(1 for payroll in updated if payroll.attendance_deductions),
+        "amount": total,
+        "capped": capped,
+    }
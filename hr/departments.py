@@ -0,0 +1,53 @@
+from django.db import transaction
+from django.db.models import F, OuterRef, Subquery
+from django.utils import timezone
+
+from accounts.models import User
+from .caching import invalidate_department_cache
+from .models import Attendance, Department, Employee, Payroll
+
+
+def sync_department_copies(employee_ids):
+    """
+    Re-copy each employee's department_id onto their Attendance and Payroll
+    rows (EmployeeDepartmentMixin), one UPDATE per table. updated_at is set
+    too, so list ETags (hr.conditional) see the change.
+    """
+    department = Subquery(Employee.objects.filter(pk=OuterRef("employee_id")).values("department_id")[:1])
+    now = timezone.now()
+    for model in (Attendance, Payroll):
+        model.objects.filter(employee_id__in=employee_ids).update(department=department, updated_at=now)
+
+
+def move_employees(employee_ids, department_id):
+    """
+    Move employees to `department_id` (None for none) with queryset updates.
+
+    Does what Employee.save() and its post_save signal do for one employee,
+    which a plain queryset .update(department=...) skips: bumps the
+    employees' version and their users' token_version (the department is an
+    access token claim), re-copies the department onto their attendance and
+    payroll rows, and drops the department cache if a moved employee
+    manages a department. Returns the number of employees moved.
+    """
+    with transaction.atomic():
+        moved = list(
+            Employee.objects
+            .select_for_update()
+            .filter(id__in=employee_ids)
+            .exclude(department_id=department_id)
+            .values_list("id", "user_id")
+        )
+        ids = [employee_id for employee_id, _ in moved]
+        user_ids = [user_id for _, user_id in moved]
+        if not ids:
+            return 0
+
+        Employee.objects.filter(id__in=ids).update(department=department_id, version=F("version") + 1)
+        User.objects.filter(id__in=user_ids).update(token_version=F("token_version") + 1)
+        for user_id in user_ids:
+            User._forget_token_version(user_id)
+        sync_department_copies(ids)
+        if Department.objects.filter(manager_id__in=ids).exists():
+            invalidate_department_cache()
+    return len(ids)
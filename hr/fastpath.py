@@ -0,0 +1,68 @@
+from functools import lru_cache
+
+from rest_framework.relations import PrimaryKeyRelatedField
+from rest_framework.response import Response
+
+from core.metrics import span
+
+
+def _pk(value):
+    return value
+
+
+class ValuesSerializer:
+    """
+    Read-only counterpart of a ModelSerializer that works on .values() rows.
+
+    The field list, column names and per-field to_representation callables are
+    taken from the ModelSerializer once, so the output is exactly what the
+    ModelSerializer would produce, without model instances, related-object
+    access or per-row field binding. `source="user.username"` becomes the
+    `user__username` column; primary-key relations are the FK id column itself.
+    """
+
+    def __init__(self, serializer_class):
+        self.accessors = []
+        for name, field in serializer_class().fields.items():
+            if field.write_only:
+                continue
+            column = "__".join(field.source_attrs)
+            to_representation = _pk if isinstance(field, PrimaryKeyRelatedField) else field.to_representation
+            self.accessors.append((name, column, to_representation))
+        self.columns = [column for _, column, _ in self.accessors]
+
+    def to_representation(self, rows):
+        accessors = self.accessors
+        data = []
+        for row in rows:
+            item = {}
+            for name, column, to_representation in accessors:
+                value = row[column]
+                item[name] = None if value is None else to_representation(value)
+            data.append(item)
+        return data
+
+
+@lru_cache(maxsize=None)
+def values_serializer_for(serializer_class):
+    return ValuesSerializer(serializer_class)
+
+
+class ValuesListMixin:
+    """
+    Serve list GETs through ValuesSerializer: the scoped queryset is narrowed
+    to the serializer's columns with .values() and mapped straight to dicts.
+    """
+
+    def list(self, request, *args, **kwargs):
+        serializer = values_serializer_for(self.get_serializer_class())
+        queryset = self.filter_queryset(self.get_queryset()).values(*serializer.columns)
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            with span("serialize"):
+                data = serializer.to_representation(page)
+            return self.get_paginated_response(data)
+        with span("serialize"):
+            data = serializer.to_representation(queryset)
+        return Response(data)
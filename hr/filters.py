@@ -0,0 +1,24 @@
+from rest_framework.filters import BaseFilterBackend
+
+
+class QueryParamsFilterBackend(BaseFilterBackend):
+    """
+    Validate the query string with the view's `filter_serializer_class`
+    (400 on bad input) and apply each supplied value through
+    `filter_lookups`, which maps a parameter to an ORM lookup. Parameters the
+    serializer does not declare (page, cursor, output) are ignored.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        serializer_class = getattr(view, "filter_serializer_class", None)
+        if serializer_class is None:
+            return queryset
+
+        serializer = serializer_class(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        filters = {
+            view.filter_lookups[name]: value
+            for name, value in serializer.validated_data.items()
+            if value is not None
+        }
+        return queryset.filter(**filters) if filters else queryset
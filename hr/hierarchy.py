@@ -0,0 +1,86 @@
+from django.db import connection
+
+from .models import Employee
+
+# Traversal stops here even if the data contains a manager cycle
+MAX_DEPTH = 64
+
+
+def _names():
+    qn = connection.ops.quote_name
+    meta = Employee._meta
+    return {
+        "table": qn(meta.db_table),
+        "id": qn(meta.pk.column),
+        "manager": qn(meta.get_field("manager").column),
+        "department": qn(meta.get_field("department").column),
+    }
+
+
+def subordinates(employee_id, department_id=None):
+    """
+    All direct and indirect reports of an employee as (id, depth) pairs,
+    depth 1 being direct reports, ordered by depth then id. One recursive CTE
+    walking the manager_id index. With `department_id`, the whole tree is still
+    walked but only reports in that department are returned.
+    """
+    n = _names()
+    params = [employee_id, MAX_DEPTH]
+    department_filter = ""
+    if department_id is not None:
+        department_filter = f"WHERE e.{n['department']} = %s"
+        params.append(department_id)
+
+    sql = f"""
+        WITH RECURSIVE tree(id, depth) AS (
+            SELECT {n['id']}, 1 FROM {n['table']} WHERE {n['manager']} = %s
+            UNION
+            SELECT e.{n['id']}, tree.depth + 1
+            FROM {n['table']} e JOIN tree ON e.{n['manager']} = tree.id
+            WHERE tree.depth < %s
+        )
+        SELECT tree.id, MIN(tree.depth) AS depth
+        FROM tree JOIN {n['table']} e ON e.{n['id']} = tree.id
+        {department_filter}
+        GROUP BY tree.id
+        ORDER BY depth, tree.id
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [(row_id, depth) for row_id, depth in cursor.fetchall() if row_id != employee_id]
+
+
+def ancestors(employee_id):
+    """
+    The management chain above an employee as (id, depth) pairs, nearest
+    manager first (depth 1), in one recursive CTE.
+    """
+    n = _names()
+    sql = f"""
+        WITH RECURSIVE chain(id, manager_id, depth) AS (
+            SELECT {n['id']}, {n['manager']}, 0 FROM {n['table']} WHERE {n['id']} = %s
+            UNION
+            SELECT e.{n['id']}, e.{n['manager']}, chain.depth + 1
+            FROM {n['table']} e JOIN chain ON e.{n['id']} = chain.manager_id
+            WHERE chain.depth < %s
+        )
+        SELECT id, depth FROM chain WHERE depth > 0 ORDER BY depth
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [employee_id, MAX_DEPTH])
+        rows = cursor.fetchall()
+
+    # A pre-existing cycle repeats ids; keep the nearest occurrence
+    seen, chain = {employee_id}, []
+    for row_id, depth in rows:
+        if row_id not in seen:
+            seen.add(row_id)
+            chain.append((row_id, depth))
+    return chain
+
+
+def creates_cycle(employee_id, manager_id):
+    """True if making `manager_id` the manager of `employee_id` would close a loop."""
+    if manager_id == employee_id:
+        return True
+    return employee_id in {row_id for row_id, _ in ancestors(manager_id)}
@@ -0,0 +1,132 @@
+from django.db import transaction
+from rest_framework import serializers
+
+from .models import Attendance, Employee
+from .parsers import RowParseError
+from .rollups import apply_attendance_deltas
+from .status import AttendanceStatus
+
+
+class AttendanceIngestRowSerializer(serializers.Serializer):
+    employee = serializers.IntegerField(min_value=1)
+    date = serializers.DateField()
+    status = serializers.ChoiceField(choices=AttendanceStatus.choices, default=AttendanceStatus.PRESENT)
+    note = serializers.CharField(max_length=255, allow_blank=True, default="")
+
+
+def ingest_attendance(rows, department_id=None, batch_size=1000):
+    """
+    Upsert attendance rows on (employee, date).
+
+    `rows` is any iterable of dicts (a parsed JSON array or a lazily parsed
+    NDJSON/CSV body). When `department_id` is given every target employee must
+    belong to it (manager scope); it is checked once for the whole batch.
+
+    Returns a report with one entry per input row, in input order.
+    """
+    row_serializer = AttendanceIngestRowSerializer()
+    results = []
+    pending = {}  # (employee_id, date) -> result entry
+
+    for index, row in enumerate(rows, start=1):
+        entry = {"row": index}
+        results.append(entry)
+
+        if isinstance(row, RowParseError):
+            _fail(entry, {"non_field_errors": [row.message]})
+            continue
+        if not isinstance(row, dict):
+            _fail(entry, {"non_field_errors": ["Expected an object."]})
+            continue
+
+        try:
+            data = row_serializer.run_validation(row)
+        except serializers.ValidationError as exc:
+            _fail(entry, exc.detail)
+            continue
+
+        key = (data["employee"], data["date"])
+        entry.update({"employee": key[0], "date": key[1].isoformat()})
+        if key in pending:
+            _fail(entry, {"non_field_errors": ["Duplicate employee and date in this batch."]})
+            continue
+        entry["_data"] = data
+        pending[key] = entry
+
+    # One query resolves every target employee's department for the scope check.
+    employee_ids = {employee_id for employee_id, _ in pending}
+    departments = dict(
+        Employee.objects.filter(id__in=employee_ids).values_list("id", "department_id")
+    )
+    for key, entry in list(pending.items()):
+        employee_id = key[0]
+        if employee_id not in departments:
+            error = "Employee not found."
+        elif department_id is not None and departments[employee_id] != department_id:
+            error = "Managers can only manage attendance within their department."
+        else:
+            continue
+        _fail(entry, {"employee": [error]})
+        del pending[key]
+
+    if pending:
+        with transaction.atomic():
+            # Current status of rows being overwritten, for the rollup deltas
+            existing = _existing_statuses(pending.keys())
+            objs, deltas = [], []
+            for key, entry in pending.items():
+                data = entry.pop("_data")
+                entry["result"] = "updated" if key in existing else "created"
+                if key in existing:
+                    deltas.append((*key, existing[key], -1))
+                deltas.append((*key, data["status"], 1))
+                objs.append(Attendance(
+                    employee_id=data["employee"],
+                    department_id=departments[data["employee"]],
+                    date=data["date"],
+                    status=data["status"],
+                    note=data["note"],
+                ))
+
+            Attendance.objects.bulk_create(
+                objs,
+                batch_size=batch_size,
+                update_conflicts=True,
+                unique_fields=["employee", "date"],
+                update_fields=["status", "note", "department", "updated_at"],
+            )
+            apply_attendance_deltas(deltas)
+
+    summary = {"created": 0, "updated": 0, "failed": 0}
+    for entry in results:
+        summary["failed" if entry["result"] == "error" else entry["result"]] += 1
+    return {**summary, "results": results}
+
+
+def _fail(entry, errors):
+    entry["result"] = "error"
+    entry["errors"] = errors
+    entry.pop("_data", None)
+
+
+def _existing_statuses(keys, chunk_size=500):
+    keys = list(keys)
+    wanted = set(keys)
+    existing = {}
+    for start in range(0, len(keys), chunk_size):
+        chunk = keys[start:start + chunk_size]
+        rows = (
+            Attendance.objects
+            .filter(
+                employee_id__in={employee_id for employee_id, _ in chunk},
+                date__in={day for _, day in chunk},
+            )
+            .select_for_update()
+            .values_list("employee_id", "date", "status")
+        )
+        existing.update({
+            (employee_id, day): status
+            for employee_id, day, status in rows
+            if (employee_id, day) in wanted
+        })
+    return existing
@@ -0,0 +1,124 @@
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from .models import LeaveBalance, LeaveLedgerEntry, LeaveRequest
+from .status import LeaveLedgerKind, LeaveStatus
+
+
+def working_days(start, end):
+    """Mon-Fri days from `start` to `end`, both included, without walking the range."""
+    if end < start:
+        return 0
+    weeks, extra = divmod((end - start).days + 1, 7)
+    return weeks * 5 + sum(1 for i in range(extra) if (start.weekday() + i) % 7 < 5)
+
+
+def current_balance(employee_id, leave_type_id):
+    """Days left, read from the running balance row (0 if never allocated)."""
+    balance = (
+        LeaveBalance.objects
+        .filter(employee_id=employee_id, leave_type_id=leave_type_id)
+        .values_list("balance", flat=True)
+        .first()
+    )
+    return balance or 0
+
+
+def overlapping_requests(employee_id, start, end, exclude=None):
+    """Pending or approved requests of the employee that share a day with start..end."""
+    qs = LeaveRequest.objects.filter(
+        employee_id=employee_id,
+        status__in=[LeaveStatus.PENDING, LeaveStatus.APPROVED],
+        start_date__lte=end,
+        end_date__gte=start,
+    )
+    return qs.exclude(pk=exclude) if exclude is not None else qs
+
+
+def _locked_balance(employee_id, leave_type_id):
+    # The unique (employee, leave_type) row, locked until the transaction ends
+    balance, _ = LeaveBalance.objects.select_for_update().get_or_create(
+        employee_id=employee_id, leave_type_id=leave_type_id
+    )
+    return balance
+
+
+def _post(balance, kind, days, leave_request=None, note="", user_id=None):
+    """Apply `days` (signed) to a locked balance row and append the matching ledger entry."""
+    if balance.balance + days < 0:
+        raise ValidationError({"days": f"Insufficient leave balance: {balance.balance} day(s) left."})
+
+    balance.balance += days
+    if kind == LeaveLedgerKind.ALLOCATION:
+        balance.allocated_days += days
+    else:
+        # Usage is negative, its reversal positive
+        balance.used_days -= days
+    balance.save(update_fields=["balance", "allocated_days", "used_days", "updated_at"])
+
+    return LeaveLedgerEntry.objects.create(
+        employee_id=balance.employee_id,
+        leave_type_id=balance.leave_type_id,
+        kind=kind,
+        days=days,
+        balance_after=balance.balance,
+        leave_request=leave_request,
+        note=note,
+        created_by_id=user_id,
+    )
+
+
+def allocate_leave(employee_id, leave_type_id, days, note="", user_id=None):
+    """Grant (or, with negative `days`, withdraw) leave days. Returns the ledger entry."""
+    if not days:
+        raise ValidationError({"days": "Must not be zero."})
+    with transaction.atomic():
+        balance = _locked_balance(employee_id, leave_type_id)
+        return _post(balance, LeaveLedgerKind.ALLOCATION, days, note=note, user_id=user_id)
+
+
+def _locked_request(leave_request_id, allowed):
+    leave_request = LeaveRequest.objects.select_for_update().get(pk=leave_request_id)
+    if leave_request.status not in allowed:
+        raise ValidationError({"status": f"Leave request is {leave_request.status.lower()}."})
+    return leave_request
+
+
+def _decide(leave_request, status, user_id):
+    leave_request.status = status
+    leave_request.decided_by_id = user_id
+    leave_request.decided_at = timezone.now()
+    leave_request.save(update_fields=["status", "decided_by", "decided_at", "updated_at"])
+    return leave_request
+
+
+def approve_leave_request(leave_request_id, user_id=None):
+    """
+    Approve a pending request and take its days from the balance. The
+    request and then the balance row are locked, so concurrent approvals for
+    the same employee and leave type serialize and cannot overdraw; the
+    check reads the running balance, not a sum over the ledger.
+    """
+    with transaction.atomic():
+        leave_request = _locked_request(leave_request_id, [LeaveStatus.PENDING])
+        balance = _locked_balance(leave_request.employee_id, leave_request.leave_type_id)
+        _post(balance, LeaveLedgerKind.USAGE, -leave_request.days, leave_request=leave_request, user_id=user_id)
+        return _decide(leave_request, LeaveStatus.APPROVED, user_id)
+
+
+def reject_leave_request(leave_request_id, user_id=None):
+    with transaction.atomic():
+        leave_request = _locked_request(leave_request_id, [LeaveStatus.PENDING])
+        return _decide(leave_request, LeaveStatus.REJECTED, user_id)
+
+
+def cancel_leave_request(leave_request_id, user_id=None):
+    """Cancel a pending or approved request; approved days go back to the balance."""
+    with transaction.atomic():
+        leave_request = _locked_request(leave_request_id, [LeaveStatus.PENDING, LeaveStatus.APPROVED])
+        if leave_request.status == LeaveStatus.APPROVED:
+            balance = _locked_balance(leave_request.employee_id, leave_request.leave_type_id)
+            _post(balance, LeaveLedgerKind.REVERSAL, leave_request.days, leave_request=leave_request, user_id=user_id)
+        return _decide(leave_request, LeaveStatus.CANCELLED, user_id)
+
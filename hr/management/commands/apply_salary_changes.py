@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.exceptions import ParseError
+
+from hr.parsers import file_parser, is_row_list
+from hr.salaries import apply_salary_changes
+
+
+class Command(BaseCommand):
+    help = (
+        "Set employee salaries from a CSV (employee,salary), JSON array or NDJSON file "
+        "and recompute their DRAFT payrolls."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=["csv", "json", "ndjson"], help="Default: from the file extension")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        try:
+            parser = file_parser(options["path"], options["format"])
+            with open(options["path"], "rb") as stream:
+                rows = parser.parse(stream)
+                if not is_row_list(rows):
+                    raise CommandError("Expected a list of salary changes.")
+                result = apply_salary_changes(rows, batch_size=options["batch_size"])
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc))
+        except ParseError as exc:
+            raise CommandError(str(exc.detail))
+
+        for entry in result["results"]:
+            if entry["result"] == "error":
+                self.stderr.write(f"row {entry['row']}: {entry['errors']}")
+        for payroll in result["payrolls"]["skipped"]:
+            self.stderr.write(
+                f"payroll {payroll['id']} ({payroll['year']}-{payroll['month']:02d}): {payroll['error']}"
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"{result['updated']} salaries updated, {result['failed']} failed; "
+            f"{result['payrolls']['recomputed']} draft payrolls recomputed, "
+            f"{len(result['payrolls']['skipped'])} skipped."
+        ))
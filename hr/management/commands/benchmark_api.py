@@ -0,0 +1,58 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from hr.benchmark import ROLES, compare, run_benchmark
+
+
+class Command(BaseCommand):
+    help = "Time every GET route of the hr and accounts APIs per role and write the results as JSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--warmup", type=int, default=2)
+        parser.add_argument("--role", action="append", choices=ROLES, help="Repeatable (default: all roles)")
+        parser.add_argument("--route", action="append", help="Route name, e.g. attendance-list; repeatable (default: all)")
+        parser.add_argument("--prefix", help="Only benchmark as users created by seed_hr_data with this prefix")
+        parser.add_argument("--output", help="Write the JSON here instead of stdout")
+        parser.add_argument("--baseline", help="Earlier JSON output to report regressions against")
+        parser.add_argument("--threshold", type=float, default=0.2, help="Allowed p50 growth as a fraction")
+        parser.add_argument("--fail-on-regression", action="store_true")
+
+    def handle(self, *args, **options):
+        if options["iterations"] < 1:
+            raise CommandError("--iterations must be at least 1.")
+
+        def progress(result):
+            latency = result["latency_ms"]
+            self.stderr.write(
+                f"{result['route']:<22} {result['role']:<9} {result['status']} "
+                f"p50={latency['p50']}ms p95={latency['p95']}ms queries={result['queries']}"
+            )
+
+        report = run_benchmark(
+            iterations=options["iterations"],
+            warmup=options["warmup"],
+            roles=options["role"] or ROLES,
+            prefix=options["prefix"],
+            routes=options["route"],
+            progress=progress,
+        )
+        if not report["results"]:
+            raise CommandError("Nothing to benchmark: no users for the selected roles (run seed_hr_data first).")
+
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as fh:
+                fh.write(output + "\n")
+        else:
+            self.stdout.write(output)
+
+        if options["baseline"]:
+            with open(options["baseline"]) as fh:
+                regressions = compare(json.load(fh), report, threshold=options["threshold"])
+            for regression in regressions:
+                changes = ", ".join(f"{key} {old} -> {new}" for key, (old, new) in regression["changes"].items())
+                self.stderr.write(f"REGRESSION {regression['route']} as {regression['role']}: {changes}")
+            if regressions and options["fail_on_regression"]:
+                raise CommandError(f"{len(regressions)} regression(s) against {options['baseline']}.")
@@ -0,0 +1,48 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from hr.benchmark import ASYNC_ROUTES, ROLES, run_concurrency_benchmark
+
+
+class Command(BaseCommand):
+    help = "Compare sync and async GET endpoints under concurrent load through the in-process ASGI application."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200, help="Measured requests per endpoint")
+        parser.add_argument("--concurrency", type=int, default=20, help="Clients in flight at once")
+        parser.add_argument("--warmup", type=int, default=10)
+        parser.add_argument("--role", choices=ROLES, default=ROLES[0])
+        parser.add_argument("--route", action="append", choices=list(ASYNC_ROUTES), help="Repeatable (default: all)")
+        parser.add_argument("--prefix", help="Only benchmark as users created by seed_hr_data with this prefix")
+        parser.add_argument("--output", help="Write the JSON here instead of stdout")
+
+    def handle(self, *args, **options):
+        if options["requests"] < 1 or options["concurrency"] < 1:
+            raise CommandError("--requests and --concurrency must be at least 1.")
+
+        def progress(result):
+            sync, async_ = result["sync"], result["async"]
+            self.stderr.write(
+                f"{result['route']:<16} sync {sync['rps']} req/s p95={sync['latency_ms']['p95']}ms | "
+                f"async {async_['rps']} req/s p95={async_['latency_ms']['p95']}ms | x{result['speedup']}"
+            )
+
+        report = run_concurrency_benchmark(
+            requests=options["requests"],
+            concurrency=options["concurrency"],
+            warmup=options["warmup"],
+            role=options["role"],
+            prefix=options["prefix"],
+            routes=options["route"],
+            progress=progress,
+        )
+        if not report["results"]:
+            raise CommandError(f"Nothing to benchmark: no {options['role']} user (run seed_hr_data first).")
+
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as fh:
+                fh.write(output + "\n")
+        else:
+            self.stdout.write(output)
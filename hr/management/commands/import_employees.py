@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.exceptions import ParseError
+
+from hr.onboarding import import_employees
+from hr.parsers import file_parser, is_row_list
+
+
+class Command(BaseCommand):
+    help = (
+        "Create users and their employee records from a CSV, JSON array or NDJSON file "
+        "(username, email, password, first_name, last_name, role, department, manager, "
+        "phone, salary, join_date)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=["csv", "json", "ndjson"], help="Default: from the file extension")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--workers", type=int, help="Password hashing processes (default: one per CPU)")
+
+    def handle(self, *args, **options):
+        try:
+            parser = file_parser(options["path"], options["format"])
+            with open(options["path"], "rb") as stream:
+                rows = parser.parse(stream)
+                if not is_row_list(rows):
+                    raise CommandError("Expected a list of employees.")
+                result = import_employees(rows, batch_size=options["batch_size"], workers=options["workers"])
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc))
+        except ParseError as exc:
+            raise CommandError(str(exc.detail))
+
+        for entry in result["results"]:
+            if entry["result"] == "error":
+                self.stderr.write(f"row {entry['row']}: {entry['errors']}")
+        self.stdout.write(self.style.SUCCESS(
+            f"{result['created']} employees created, {result['failed']} failed."
+        ))
@@ -0,0 +1,59 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from hr.models import Attendance
+
+from hr.partitions import (
+    add_months,
+    create_month_partition,
+    detach_partition,
+    expired_partitions,
+    is_partitioned,
+    list_partitions,
+    partition_name,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Create upcoming monthly hr_attendance partitions and detach (or drop) "
+        "those older than the retention window. Postgres only."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--ahead", type=int, default=3, help="Months after the current one to create (default 3)")
+        parser.add_argument("--retain-months", type=int, help="Keep this many months before the current one; older partitions are detached")
+        parser.add_argument("--drop", action="store_true", help="Drop expired partitions instead of leaving them as standalone tables")
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            self.stdout.write(f"hr_attendance is not partitioned on {connection.vendor}; nothing to do.")
+            return
+        if not is_partitioned():
+            raise CommandError("hr_attendance is not partitioned; run migrate first.")
+        if options["ahead"] < 0 or (options["retain_months"] is not None and options["retain_months"] < 0):
+            raise CommandError("--ahead and --retain-months must not be negative.")
+
+        today = date.today()
+        partitions = list_partitions()
+        existing = {bound[0] for _, bound in partitions if bound is not None}
+        for offset in range(options["ahead"] + 1):
+            month = add_months(today, offset)
+            if month in existing:
+                continue
+            if not options["dry_run"]:
+                create_month_partition(month, partitions=partitions)
+                partitions = list_partitions()
+            self.stdout.write(f"created {partition_name(Attendance._meta.db_table, month)}")
+
+        if options["retain_months"] is not None:
+            verb = "dropped" if options["drop"] else "detached"
+            for name in expired_partitions(options["retain_months"], today=today, partitions=partitions):
+                if not options["dry_run"]:
+                    detach_partition(name, drop=options["drop"])
+                self.stdout.write(f"{verb} {name}")
+
+        self.stdout.write(self.style.SUCCESS("Attendance partitions are up to date."))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from hr.rollups import rebuild_attendance_rollups
+
+
+class Command(BaseCommand):
+    help = "Recompute the monthly attendance rollups from hr_attendance."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--year", type=int, help="Only rebuild this year")
+        parser.add_argument("--month", type=int, help="Only rebuild this month (1-12)")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        written = rebuild_attendance_rollups(
+            year=options["year"],
+            month=options["month"],
+            batch_size=options["batch_size"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} attendance rollup rows."))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from hr.reports import REPORTS, create_report_views, refresh_reports
+
+
+class Command(BaseCommand):
+    help = "Refresh the report views behind /api/reports/ (concurrently on Postgres)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("reports", nargs="*", help=f"Reports to refresh: {', '.join(REPORTS)} (default: all)")
+
+    def handle(self, *args, **options):
+        for name in create_report_views():
+            self.stdout.write(f"{name}: created")
+        try:
+            timings = refresh_reports(options["reports"] or None)
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        for name, ms in timings.items():
+            self.stdout.write(f"{name}: refreshed in {ms} ms")
+        self.stdout.write(self.style.SUCCESS(f"Refreshed {len(timings)} report(s)."))
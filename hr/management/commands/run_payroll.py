@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from hr.models import Department
+from hr.payroll import run_payroll
+from hr.reports import refresh_reports
+
+
+class Command(BaseCommand):
+    help = "Create missing DRAFT payrolls for a month, company-wide or for one department."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--year", type=int, required=True)
+        parser.add_argument("--month", type=int, required=True)
+        parser.add_argument("--department", type=int, help="Department id (default: all departments)")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--recompute-deductions",
+            action="store_true",
+            help="Also recompute attendance deductions of the period's existing DRAFT payrolls",
+        )
+
+    def handle(self, *args, **options):
+        year, month, department_id = options["year"], options["month"], options["department"]
+        if not 2000 <= year <= 2100:
+            raise CommandError("--year must be between 2000 and 2100.")
+        if not 1 <= month <= 12:
+            raise CommandError("--month must be between 1 and 12.")
+        if department_id is not None and not Department.objects.filter(id=department_id).exists():
+            raise CommandError(f"Department {department_id} does not exist.")
+
+        def progress(done, total, created):
+            self.stdout.write(f"{done}/{total} employees processed, {created} payrolls created")
+
+        result = run_payroll(
+            year, month,
+            department_id=department_id,
+            batch_size=options["batch_size"],
+            progress=progress,
+            recompute_deductions=options["recompute_deductions"],
+        )
+
+        refresh_reports(["payroll"])
+        for failure in result["failed"]:
+            self.stderr.write(f"employee {failure['employee']}: {failure['error']}")
+        deductions = result["deductions"]
+        if deductions is not None:
+            self.stdout.write(
+                f"Attendance deductions recomputed for {deductions['payrolls']} draft payrolls "
+                f"({deductions['deducted']} deducted, {len(deductions['capped'])} capped)."
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"Payroll {year}-{month:02d}: {result['created']} created, "
+            f"{result['skipped']} skipped, {len(result['failed'])} failed."
+        ))
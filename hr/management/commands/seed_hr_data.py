@@ -0,0 +1,47 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from hr.seed import seed_hr_data
+
+
+class Command(BaseCommand):
+    help = "Seed a synthetic organisation (departments, manager tree, attendance, payrolls) for benchmarking."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--departments", type=int, default=10)
+        parser.add_argument("--employees", type=int, default=1000)
+        parser.add_argument("--years", type=int, default=1, help="Years of attendance and payroll history")
+        parser.add_argument("--span", type=int, default=8, help="Maximum direct reports per manager")
+        parser.add_argument("--end", type=date.fromisoformat, help="History ends the month before this date (default: today)")
+        parser.add_argument("--prefix", default="seed", help="Username and department name prefix")
+        parser.add_argument("--password", default="Pass12345!")
+        parser.add_argument("--seed", type=int, default=0, help="Random seed")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        def progress(label, total):
+            self.stdout.write(f"{total} {label} created")
+
+        try:
+            result = seed_hr_data(
+                departments=options["departments"],
+                employees=options["employees"],
+                years=options["years"],
+                span=options["span"],
+                prefix=options["prefix"],
+                password=options["password"],
+                end=options["end"],
+                seed=options["seed"],
+                batch_size=options["batch_size"],
+                progress=progress,
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {result['departments']} departments, {result['employees']} employees, "
+            f"{result['attendance']} attendance rows, {result['payrolls']} payrolls and "
+            f"{result['leave_requests']} leave requests "
+            f"({result['first_day']} to {result['last_day']})."
+        ))
@@ -0,0 +1,29 @@
+# Generated by Django 6.0 on 2026-01-06 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hr', '0005_alter_attendance_status_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='attendance',
+            options={'ordering': ['-date', '-created_at', 'id']},
+        ),
+        migrations.AlterModelOptions(
+            name='payroll',
+            options={'ordering': ['-year', '-month', '-created_at', 'id']},
+        ),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['-date', '-created_at', 'id'], name='hr_attendan_date_cfe199_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payroll',
+            index=models.Index(fields=['-year', '-month', '-created_at', 'id'], name='hr_payroll_year_5f732d_idx'),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 6.0 on 2026-01-21 15:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q
+from django.db.models.functions import ExtractMonth, ExtractYear
+
+
+def backfill_rollups(apps, schema_editor):
+    Attendance = apps.get_model("hr", "Attendance")
+    AttendanceMonthlySummary = apps.get_model("hr", "AttendanceMonthlySummary")
+    rows = (
+        Attendance.objects
+        .annotate(year=ExtractYear("date"), month=ExtractMonth("date"))
+        .values("employee_id", "year", "month")
+        .annotate(
+            present_days=Count("id", filter=Q(status="PRESENT")),
+            absent_days=Count("id", filter=Q(status="ABSENT")),
+            late_days=Count("id", filter=Q(status="LATE")),
+            leave_days=Count("id", filter=Q(status="LEAVE")),
+        )
+        .order_by()
+    )
+    AttendanceMonthlySummary.objects.bulk_create(
+        (AttendanceMonthlySummary(**row) for row in rows.iterator()),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hr', '0006_keyset_ordering_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceMonthlySummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveIntegerField()),
+                ('month', models.PositiveSmallIntegerField()),
+                ('present_days', models.PositiveIntegerField(default=0)),
+                ('absent_days', models.PositiveIntegerField(default=0)),
+                ('late_days', models.PositiveIntegerField(default=0)),
+                ('leave_days', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_summaries', to='hr.employee')),
+            ],
+            options={
+                'ordering': ['-year', '-month', 'employee'],
+                'indexes': [models.Index(fields=['year', 'month'], name='hr_attendan_year_d94a0f_idx')],
+                'constraints': [models.UniqueConstraint(fields=('employee', 'year', 'month'), name='uniq_attendance_summary_employee_period')],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hr', '0007_attendancemonthlysummary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employee',
+            name='version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 6.0 on 2026-10-17 04:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hr', '0008_employee_version'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='attendance',
+            name='hr_attendan_date_3a46d7_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='payroll',
+            name='hr_payroll_status_fd827d_idx',
+        ),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['date', 'status'], name='hr_attendan_date_36f853_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['status', 'date'], name='hr_attendan_status_9d057c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payroll',
+            index=models.Index(fields=['year', 'month', 'status'], name='hr_payroll_year_8388f2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payroll',
+            index=models.Index(fields=['status', 'year', 'month'], name='hr_payroll_status_7234b8_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 6.0 on 2026-10-17 04:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_departments(apps, schema_editor):
+    Employee = apps.get_model("hr", "Employee")
+    department = Subquery(Employee.objects.filter(pk=OuterRef("employee_id")).values("department_id")[:1])
+    for name in ("Attendance", "Payroll"):
+        apps.get_model("hr", name).objects.update(department_id=department)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hr', '0009_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attendance',
+            name='department',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='hr.department'),
+        ),
+        migrations.AddField(
+            model_name='payroll',
+            name='department',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='hr.department'),
+        ),
+        # Before the indexes, so the backfill does not maintain them row by row
+        migrations.RunPython(backfill_departments, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['department', 'date'], name='hr_attendan_departm_eb0abf_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payroll',
+            index=models.Index(fields=['department', 'year', 'month'], name='hr_payroll_departm_3dfc31_idx'),
+        ),
+    ]
@@ -0,0 +1,138 @@
+# Generated by Django 6.0 on 2026-03-02 10:12
+
+from datetime import date
+
+from django.db import migrations
+
+TABLE = "hr_attendance"
+SEQUENCE = "hr_attendance_id_seq"
+# Monthly partitions created past the current month; manage_attendance_partitions keeps this rolling
+AHEAD_MONTHS = 3
+
+
+def _add_months(day, months):
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _is_partitioned(cursor):
+    cursor.execute("SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s))", [TABLE])
+    return cursor.fetchone()[0]
+
+
+def _definitions(cursor):
+    """
+    Foreign key, unique and check constraints plus the plain indexes of the
+    table, so they can be recreated on its replacement under the same names.
+    """
+    cursor.execute(
+        """
+        SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint
+        WHERE conrelid = to_regclass(%s) AND contype IN ('f', 'u', 'c')
+        ORDER BY contype DESC, conname
+        """,
+        [TABLE],
+    )
+    constraints = cursor.fetchall()
+    cursor.execute(
+        """
+        SELECT pg_get_indexdef(x.indexrelid) FROM pg_index x JOIN pg_class i ON i.oid = x.indexrelid
+        WHERE x.indrelid = to_regclass(%s)
+          AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conrelid = x.indrelid AND c.conindid = x.indexrelid)
+        ORDER BY i.relname
+        """,
+        [TABLE],
+    )
+    indexes = [definition.replace(" ON ONLY ", " ON ") for definition, in cursor.fetchall()]
+    return constraints, indexes
+
+
+def _swap(cursor, qn, new_table, constraints, indexes):
+    """Replace TABLE with `new_table` (already holding the rows) and restore its constraints and indexes."""
+    cursor.execute(f"DROP TABLE {qn(TABLE)}")
+    cursor.execute(f"ALTER TABLE {qn(new_table)} RENAME TO {qn(TABLE)}")
+    for name, definition in constraints:
+        cursor.execute(f"ALTER TABLE {qn(TABLE)} ADD CONSTRAINT {qn(name)} {definition}")
+    for definition in indexes:
+        cursor.execute(definition)
+
+
+def partition_attendance(apps, schema_editor):
+    """
+    Rebuild hr_attendance as a table partitioned by RANGE (date), one
+    partition per month plus a DEFAULT partition, on Postgres only.
+
+    The primary key becomes (id, date), since a partitioned table's unique
+    keys must contain the partition key; uniq_attendance_employee_date
+    already does. id keeps its values and draws new ones from a sequence
+    (identity columns on partitioned tables need Postgres 17).
+    """
+    connection = schema_editor.connection
+    if connection.vendor != "postgresql":
+        return
+    qn = schema_editor.quote_name
+    staging = f"{TABLE}_partitioned"
+
+    with connection.cursor() as cursor:
+        if _is_partitioned(cursor):
+            return
+        constraints, indexes = _definitions(cursor)
+        cursor.execute(f"SELECT MIN({qn('date')}), MAX({qn('date')}), COALESCE(MAX(id), 0) FROM {qn(TABLE)}")
+        first, last, max_id = cursor.fetchone()
+
+        today = date.today()
+        month = min(first or today, today).replace(day=1)
+        end = _add_months(max(last or today, today), AHEAD_MONTHS + 1)
+
+        cursor.execute(f"CREATE TABLE {qn(staging)} (LIKE {qn(TABLE)}) PARTITION BY RANGE ({qn('date')})")
+        while month < end:
+            following = _add_months(month, 1)
+            cursor.execute(
+                f"CREATE TABLE {qn(f'{TABLE}_y{month.year}m{month.month:02d}')} PARTITION OF {qn(staging)} "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{following.isoformat()}')"
+            )
+            month = following
+        cursor.execute(f"CREATE TABLE {qn(f'{TABLE}_default')} PARTITION OF {qn(staging)} DEFAULT")
+        cursor.execute(f"INSERT INTO {qn(staging)} SELECT * FROM {qn(TABLE)}")
+
+        _swap(cursor, qn, staging, constraints, indexes)
+        cursor.execute(f"ALTER TABLE {qn(TABLE)} ADD CONSTRAINT {qn(f'{TABLE}_pkey')} PRIMARY KEY (id, date)")
+        cursor.execute(f"CREATE SEQUENCE {qn(SEQUENCE)} OWNED BY {qn(TABLE)}.id")
+        cursor.execute("SELECT setval(%s, %s, false)", [SEQUENCE, max_id + 1])
+        cursor.execute(f"ALTER TABLE {qn(TABLE)} ALTER COLUMN id SET DEFAULT nextval('{SEQUENCE}')")
+
+
+def unpartition_attendance(apps, schema_editor):
+    """Back to a plain table with an identity id, keeping every row still attached."""
+    connection = schema_editor.connection
+    if connection.vendor != "postgresql":
+        return
+    qn = schema_editor.quote_name
+    staging = f"{TABLE}_plain"
+
+    with connection.cursor() as cursor:
+        if not _is_partitioned(cursor):
+            return
+        constraints, indexes = _definitions(cursor)
+        cursor.execute(f"SELECT COALESCE(MAX(id), 0) FROM {qn(TABLE)}")
+        max_id = cursor.fetchone()[0]
+
+        cursor.execute(f"CREATE TABLE {qn(staging)} (LIKE {qn(TABLE)})")
+        cursor.execute(f"INSERT INTO {qn(staging)} SELECT * FROM {qn(TABLE)}")
+
+        # Drops the partitions and the id sequence with it
+        _swap(cursor, qn, staging, constraints, indexes)
+        cursor.execute(f"ALTER TABLE {qn(TABLE)} ADD CONSTRAINT {qn(f'{TABLE}_pkey')} PRIMARY KEY (id)")
+        cursor.execute(f"ALTER TABLE {qn(TABLE)} ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY")
+        cursor.execute("SELECT setval(pg_get_serial_sequence(%s, 'id'), %s, false)", [TABLE, max_id + 1])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hr', '0010_denormalized_department'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_attendance, unpartition_attendance),
+    ]
@@ -0,0 +1,137 @@
+# Generated by Django 6.0 on 2026-10-17 06:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hr', '0012_leave'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceReport',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('username', models.CharField(max_length=150)),
+                ('first_name', models.CharField(max_length=150)),
+                ('last_name', models.CharField(max_length=150)),
+                ('email', models.CharField(max_length=254)),
+                ('department_name', models.CharField(max_length=200, null=True)),
+                ('year', models.PositiveIntegerField()),
+                ('month', models.PositiveSmallIntegerField()),
+                ('present_days', models.PositiveIntegerField()),
+                ('absent_days', models.PositiveIntegerField()),
+                ('late_days', models.PositiveIntegerField()),
+                ('leave_days', models.PositiveIntegerField()),
+                ('recorded_days', models.PositiveIntegerField()),
+            ],
+            options={
+                'db_table': 'hr_report_attendance',
+                'ordering': ['-year', '-month', 'id'],
+                'abstract': False,
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='EmployeeReport',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('username', models.CharField(max_length=150)),
+                ('first_name', models.CharField(max_length=150)),
+                ('last_name', models.CharField(max_length=150)),
+                ('email', models.CharField(max_length=254)),
+                ('department_name', models.CharField(max_length=200, null=True)),
+                ('phone', models.CharField(max_length=30, null=True)),
+                ('join_date', models.DateField(null=True)),
+                ('salary', models.DecimalField(decimal_places=2, max_digits=12, null=True)),
+            ],
+            options={
+                'db_table': 'hr_report_employees',
+                'ordering': ['id'],
+                'abstract': False,
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='LeaveBalanceReport',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('username', models.CharField(max_length=150)),
+                ('first_name', models.CharField(max_length=150)),
+                ('last_name', models.CharField(max_length=150)),
+                ('email', models.CharField(max_length=254)),
+                ('department_name', models.CharField(max_length=200, null=True)),
+                ('leave_type_name', models.CharField(max_length=200)),
+                ('is_paid', models.BooleanField()),
+                ('allocated_days', models.IntegerField()),
+                ('used_days', models.IntegerField()),
+                ('balance', models.IntegerField()),
+            ],
+            options={
+                'db_table': 'hr_report_leave_balances',
+                'ordering': ['id'],
+                'abstract': False,
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='LeaveRequestReport',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('username', models.CharField(max_length=150)),
+                ('first_name', models.CharField(max_length=150)),
+                ('last_name', models.CharField(max_length=150)),
+                ('email', models.CharField(max_length=254)),
+                ('department_name', models.CharField(max_length=200, null=True)),
+                ('leave_type_name', models.CharField(max_length=200)),
+                ('is_paid', models.BooleanField()),
+                ('start_date', models.DateField()),
+                ('end_date', models.DateField()),
+                ('days', models.PositiveIntegerField()),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('APPROVED', 'Approved'), ('REJECTED', 'Rejected'), ('CANCELLED', 'Cancelled')], max_length=10)),
+                ('created_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'hr_report_leave_requests',
+                'ordering': ['-start_date', 'id'],
+                'abstract': False,
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='PayrollReport',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('username', models.CharField(max_length=150)),
+                ('first_name', models.CharField(max_length=150)),
+                ('last_name', models.CharField(max_length=150)),
+                ('email', models.CharField(max_length=254)),
+                ('department_name', models.CharField(max_length=200, null=True)),
+                ('year', models.PositiveIntegerField()),
+                ('month', models.PositiveSmallIntegerField()),
+                ('base_salary', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('allowances', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('deductions', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('gross_salary', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('net_salary', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('status', models.CharField(choices=[('DRAFT', 'Draft'), ('FINAL', 'Final'), ('PAID', 'Paid')], max_length=10)),
+            ],
+            options={
+                'db_table': 'hr_report_payroll',
+                'ordering': ['-year', '-month', 'id'],
+                'abstract': False,
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='ReportRefresh',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('refreshed_at', models.DateTimeField()),
+                ('duration_ms', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 6.0 on 2026-10-17 07:30
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hr', '0013_reports'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='payroll',
+            name='attendance_deductions',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=12, validators=[django.core.validators.MinValueValidator(0)]),
+        ),
+        migrations.CreateModel(
+            name='PayrollDeduction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('PRESENT', 'Present'), ('ABSENT', 'Absent'), ('LATE', 'Late'), ('LEAVE', 'Leave')], max_length=10)),
+                ('occurrences', models.PositiveIntegerField()),
+                ('rate', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('payroll', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_breakdown', to='hr.payroll')),
+            ],
+            options={
+                'ordering': ['payroll', 'status'],
+                'constraints': [models.UniqueConstraint(fields=('payroll', 'status'), name='uniq_payroll_deduction_status')],
+            },
+        ),
+    ]
@@ -2,7 +2,7 @@ from django.conf import settings
 from django.db import models
 from rest_framework.exceptions import ValidationError
 from django.core.validators import MinValueValidator, MaxValueValidator
-from .status import AttendanceStatus, PayrollStatus
+from .status import AttendanceStatus, LeaveLedgerKind, LeaveStatus, PayrollStatus
 
 class Department(models.Model):
     name = models.CharField(max_length=200, unique=True)
@@ -51,18 +51,66 @@ class Employee(models.Model):
     salary = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
     join_date = models.DateField(null=True, blank=True)
 
+    # Incremented on every save(); the detail view's ETag and If-Match check use it
+    version = models.PositiveIntegerField(default=1)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored department so saves can tell when it changed
+        instance._loaded_department_id = instance.__dict__.get("department_id")
+        return instance
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            self.version += 1
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], "version"}
+        super().save(*args, **kwargs)
+
     def __str__(self):
         # this will create N+1 query, handle the query to avoid this.
         return f"employee"
     
 
-class Attendance(models.Model):
+class EmployeeDepartmentMixin:
+    """
+    Keeps a denormalised copy of the employee's department_id on the row, so
+    department scoping filters one table instead of joining hr_employee.
+    Bulk writers set it themselves; department moves are propagated by the
+    Employee post_save signal. Moves made with a queryset update skip that
+    signal and must go through hr.departments.move_employees() instead.
+    """
+
+    def save(self, *args, **kwargs):
+        if self.employee_id is not None:
+            if type(self).employee.is_cached(self):
+                self.department_id = self.employee.department_id
+            else:
+                self.department_id = (
+                    Employee.objects.filter(pk=self.employee_id).values_list("department_id", flat=True).first()
+                )
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], "department"}
+        super().save(*args, **kwargs)
+
+
+class Attendance(EmployeeDepartmentMixin, models.Model):
     
     employee = models.ForeignKey(
         "hr.Employee",
         on_delete=models.PROTECT,
         related_name="attendance_records",
     )
+    # Copy of employee.department_id (EmployeeDepartmentMixin)
+    department = models.ForeignKey(
+        Department,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+        db_index=False,
+    )
     date = models.DateField()
     status = models.CharField(max_length=10, choices=AttendanceStatus.choices, default=AttendanceStatus.PRESENT)
     note = models.CharField(max_length=255, blank=True)
@@ -71,14 +119,32 @@ class Attendance(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
-        ordering = ["-date", "-created_at"]
+        # On Postgres the table is range-partitioned by month on date
+        # (migration 0011, manage_attendance_partitions); queries bounded on
+        # date only touch the matching partitions.
+        # id is the tie-breaker that makes the ordering usable as a keyset
+        ordering = ["-date", "-created_at", "id"]
         constraints = [
             models.UniqueConstraint(fields=["employee", "date"], name="uniq_attendance_employee_date")
         ]
+        # (employee, date) is covered by the unique constraint
         indexes=[
-            models.Index(fields=["date"])
+            models.Index(fields=["-date", "-created_at", "id"]),
+            models.Index(fields=["date", "status"]),
+            models.Index(fields=["status", "date"]),
+            models.Index(fields=["department", "date"]),
         ]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Stored state, so rollups can subtract it when the row changes
+        instance._loaded_rollup_key = instance.rollup_key()
+        return instance
+
+    def rollup_key(self):
+        return (self.__dict__.get("employee_id"), self.__dict__.get("date"), self.__dict__.get("status"))
+
     def clean(self):
         if self.date is None:
             raise ValidationError({"date": "Date is required."})
@@ -87,13 +153,22 @@ class Attendance(models.Model):
         return f"{self.employee_id} - {self.date} - {self.status}"
 
 
-class Payroll(models.Model):
+class Payroll(EmployeeDepartmentMixin, models.Model):
     
     employee = models.ForeignKey(
         "hr.Employee",
         on_delete=models.PROTECT,
         related_name="payrolls",
     )
+    # Copy of employee.department_id (EmployeeDepartmentMixin)
+    department = models.ForeignKey(
+        Department,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+        db_index=False,
+    )
 
     year = models.PositiveIntegerField(validators=[MinValueValidator(2000), MaxValueValidator(2100)])
     month = models.PositiveSmallIntegerField(validators=[MinValueValidator(1), MaxValueValidator(12)])
@@ -101,6 +176,8 @@ class Payroll(models.Model):
     base_salary = models.DecimalField(max_digits=12, decimal_places=2, validators=[MinValueValidator(0)])
     allowances = models.DecimalField(max_digits=12, decimal_places=2, default=0, validators=[MinValueValidator(0)])
     deductions = models.DecimalField(max_digits=12, decimal_places=2, default=0, validators=[MinValueValidator(0)])
+    # Computed from the period's attendance (hr.deductions), itemised in PayrollDeduction
+    attendance_deductions = models.DecimalField(max_digits=12, decimal_places=2, default=0, validators=[MinValueValidator(0)])
     net_salary = models.DecimalField(max_digits=12, decimal_places=2, validators=[MinValueValidator(0)])
 
     status = models.CharField(max_length=10, choices=PayrollStatus.choices, default=PayrollStatus.DRAFT)
@@ -110,14 +187,309 @@ class Payroll(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
-        ordering = ["-year", "-month", "-created_at"]
+        # id is the tie-breaker that makes the ordering usable as a keyset
+        ordering = ["-year", "-month", "-created_at", "id"]
         constraints = [
             models.UniqueConstraint(fields=["employee", "year", "month"], name="uniq_payroll_employee_period")
         ]
+        # (employee, year, month) is covered by the unique constraint
         indexes=[
-            models.Index(fields=["status"])
+            models.Index(fields=["-year", "-month", "-created_at", "id"]),
+            models.Index(fields=["year", "month", "status"]),
+            models.Index(fields=["status", "year", "month"]),
+            models.Index(fields=["department", "year", "month"]),
         ]
 
     def __str__(self):
         return f"{self.employee_id} {self.year}-{self.month:02d}"
-    
\ No newline at end of file
+    
+
+class AttendanceMonthlySummary(models.Model):
+    """
+    Per-employee, per-month AttendanceStatus counts. Kept in step with
+    Attendance writes by hr.rollups in the same transaction, and rebuildable
+    with the rebuild_attendance_rollups command.
+    """
+    employee = models.ForeignKey(
+        "hr.Employee",
+        on_delete=models.CASCADE,
+        related_name="attendance_summaries",
+    )
+    year = models.PositiveIntegerField()
+    month = models.PositiveSmallIntegerField()
+
+    present_days = models.PositiveIntegerField(default=0)
+    absent_days = models.PositiveIntegerField(default=0)
+    late_days = models.PositiveIntegerField(default=0)
+    leave_days = models.PositiveIntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-year", "-month", "employee"]
+        constraints = [
+            models.UniqueConstraint(fields=["employee", "year", "month"], name="uniq_attendance_summary_employee_period")
+        ]
+        indexes=[
+            models.Index(fields=["year", "month"]),
+        ]
+
+    def __str__(self):
+        return f"{self.employee_id} {self.year}-{self.month:02d}"
+
+
+class PayrollDeduction(models.Model):
+    """One line of a payroll's attendance deductions: occurrences of a status times its rate."""
+    payroll = models.ForeignKey(Payroll, on_delete=models.CASCADE, related_name="attendance_breakdown")
+    status = models.CharField(max_length=10, choices=AttendanceStatus.choices)
+    occurrences = models.PositiveIntegerField()
+    rate = models.DecimalField(max_digits=12, decimal_places=2)
+    amount = models.DecimalField(max_digits=12, decimal_places=2)
+
+    class Meta:
+        ordering = ["payroll", "status"]
+        constraints = [
+            models.UniqueConstraint(fields=["payroll", "status"], name="uniq_payroll_deduction_status")
+        ]
+
+    def __str__(self):
+        return f"{self.payroll_id} {self.status} x{self.occurrences}"
+
+
+class LeaveType(models.Model):
+    name = models.CharField(max_length=200, unique=True)
+    description = models.CharField(max_length=200, blank=True)
+    # Most working days a single request may take; null for no limit
+    max_days = models.PositiveIntegerField(null=True, blank=True)
+    is_paid = models.BooleanField(default=True)
+
+    class Meta:
+        ordering = ["name"]
+
+    def __str__(self):
+        return self.name
+
+
+class LeaveRequest(models.Model):
+    employee = models.ForeignKey(
+        "hr.Employee",
+        on_delete=models.PROTECT,
+        related_name="leave_requests",
+    )
+    leave_type = models.ForeignKey(LeaveType, on_delete=models.PROTECT, related_name="requests")
+    start_date = models.DateField()
+    end_date = models.DateField()
+    # Working days (Mon-Fri) between start_date and end_date, inclusive
+    days = models.PositiveIntegerField()
+    reason = models.CharField(max_length=255, blank=True)
+    status = models.CharField(max_length=10, choices=LeaveStatus.choices, default=LeaveStatus.PENDING)
+
+    decided_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    decided_at = models.DateTimeField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-start_date", "id"]
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(end_date__gte=models.F("start_date")),
+                name="leave_request_dates_ordered",
+            )
+        ]
+        # (employee, start_date) serves the overlap check and the employee's own list
+        indexes = [
+            models.Index(fields=["employee", "start_date"]),
+            models.Index(fields=["status", "start_date"]),
+        ]
+
+    def __str__(self):
+        return f"{self.employee_id} {self.start_date}..{self.end_date} {self.status}"
+
+
+class LeaveBalance(models.Model):
+    """
+    Running totals per employee and leave type, so checking a balance is a
+    single-row lookup. Only hr.leave writes it, always under a row lock and
+    together with the LeaveLedgerEntry that explains the change.
+    """
+    employee = models.ForeignKey(
+        "hr.Employee",
+        on_delete=models.CASCADE,
+        related_name="leave_balances",
+    )
+    leave_type = models.ForeignKey(LeaveType, on_delete=models.PROTECT, related_name="balances")
+    allocated_days = models.IntegerField(default=0)
+    used_days = models.IntegerField(default=0)
+    # allocated_days - used_days
+    balance = models.IntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["employee", "leave_type"]
+        constraints = [
+            models.UniqueConstraint(fields=["employee", "leave_type"], name="uniq_leave_balance_employee_type"),
+            models.CheckConstraint(condition=models.Q(balance__gte=0), name="leave_balance_not_negative"),
+        ]
+
+    def __str__(self):
+        return f"{self.employee_id} {self.leave_type_id}: {self.balance}"
+
+
+class LeaveLedgerEntry(models.Model):
+    """
+    Append-only history of leave balance changes: allocations (+), days
+    taken by approved requests (-) and their reversals (+). `balance_after`
+    is the running balance once the entry applied. Rows are never updated
+    or deleted; a correction is a new entry.
+    """
+    employee = models.ForeignKey(
+        "hr.Employee",
+        on_delete=models.PROTECT,
+        related_name="leave_ledger",
+    )
+    leave_type = models.ForeignKey(LeaveType, on_delete=models.PROTECT, related_name="ledger_entries")
+    kind = models.CharField(max_length=10, choices=LeaveLedgerKind.choices)
+    days = models.IntegerField()
+    balance_after = models.IntegerField()
+    leave_request = models.ForeignKey(
+        LeaveRequest,
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name="ledger_entries",
+    )
+    note = models.CharField(max_length=255, blank=True)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        # id breaks ties between entries written in the same transaction
+        ordering = ["-created_at", "-id"]
+        indexes = [
+            models.Index(fields=["employee", "leave_type", "-created_at"]),
+        ]
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValidationError("Leave ledger entries cannot be changed.")
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        raise ValidationError("Leave ledger entries cannot be deleted.")
+
+    def __str__(self):
+        return f"{self.employee_id} {self.leave_type_id} {self.kind} {self.days:+d}"
+
+
+
+class ReportRefresh(models.Model):
+    """When each report view (hr.reports) was last rebuilt, and how long it took."""
+    name = models.CharField(max_length=50, unique=True)
+    refreshed_at = models.DateTimeField()
+    duration_ms = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name} {self.refreshed_at:%Y-%m-%d %H:%M:%S}"
+
+
+class ReportRow(models.Model):
+    """
+    Columns every report shares. Report models are read-only windows on the
+    views hr.reports creates (materialized on Postgres), not tables.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    employee = models.ForeignKey("hr.Employee", on_delete=models.DO_NOTHING, related_name="+")
+    username = models.CharField(max_length=150)
+    first_name = models.CharField(max_length=150)
+    last_name = models.CharField(max_length=150)
+    email = models.CharField(max_length=254)
+    department = models.ForeignKey(Department, on_delete=models.DO_NOTHING, null=True, related_name="+")
+    department_name = models.CharField(max_length=200, null=True)
+
+    class Meta:
+        abstract = True
+        managed = False
+
+
+class EmployeeReport(ReportRow):
+    manager = models.ForeignKey("hr.Employee", on_delete=models.DO_NOTHING, null=True, related_name="+")
+    phone = models.CharField(max_length=30, null=True)
+    join_date = models.DateField(null=True)
+    salary = models.DecimalField(max_digits=12, decimal_places=2, null=True)
+
+    class Meta(ReportRow.Meta):
+        db_table = "hr_report_employees"
+        ordering = ["id"]
+
+
+class AttendanceReport(ReportRow):
+    year = models.PositiveIntegerField()
+    month = models.PositiveSmallIntegerField()
+    present_days = models.PositiveIntegerField()
+    absent_days = models.PositiveIntegerField()
+    late_days = models.PositiveIntegerField()
+    leave_days = models.PositiveIntegerField()
+    recorded_days = models.PositiveIntegerField()
+
+    class Meta(ReportRow.Meta):
+        db_table = "hr_report_attendance"
+        ordering = ["-year", "-month", "id"]
+
+
+class PayrollReport(ReportRow):
+    year = models.PositiveIntegerField()
+    month = models.PositiveSmallIntegerField()
+    base_salary = models.DecimalField(max_digits=12, decimal_places=2)
+    allowances = models.DecimalField(max_digits=12, decimal_places=2)
+    deductions = models.DecimalField(max_digits=12, decimal_places=2)
+    attendance_deductions = models.DecimalField(max_digits=12, decimal_places=2)
+    gross_salary = models.DecimalField(max_digits=12, decimal_places=2)
+    net_salary = models.DecimalField(max_digits=12, decimal_places=2)
+    status = models.CharField(max_length=10, choices=PayrollStatus.choices)
+
+    class Meta(ReportRow.Meta):
+        db_table = "hr_report_payroll"
+        ordering = ["-year", "-month", "id"]
+
+
+class LeaveBalanceReport(ReportRow):
+    leave_type = models.ForeignKey(LeaveType, on_delete=models.DO_NOTHING, related_name="+")
+    leave_type_name = models.CharField(max_length=200)
+    is_paid = models.BooleanField()
+    allocated_days = models.IntegerField()
+    used_days = models.IntegerField()
+    balance = models.IntegerField()
+
+    class Meta(ReportRow.Meta):
+        db_table = "hr_report_leave_balances"
+        ordering = ["id"]
+
+
+class LeaveRequestReport(ReportRow):
+    leave_type = models.ForeignKey(LeaveType, on_delete=models.DO_NOTHING, related_name="+")
+    leave_type_name = models.CharField(max_length=200)
+    is_paid = models.BooleanField()
+    start_date = models.DateField()
+    end_date = models.DateField()
+    days = models.PositiveIntegerField()
+    status = models.CharField(max_length=10, choices=LeaveStatus.choices)
+    created_at = models.DateTimeField()
+
+    class Meta(ReportRow.Meta):
+        db_table = "hr_report_leave_requests"
+        ordering = ["-start_date", "id"]
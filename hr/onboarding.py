@@ -0,0 +1,256 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.password_validation import validate_password
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from django.db.models import Q
+from rest_framework import serializers
+
+from accounts.models import User
+
+from .models import Department, Employee
+from .parsers import RowParseError
+
+
+class OnboardingRowSerializer(serializers.Serializer):
+    username = serializers.CharField(max_length=150)
+    email = serializers.EmailField(required=False, allow_blank=True, default="")
+    # Without one the account gets an unusable password
+    password = serializers.CharField(required=False, allow_blank=True, default="", trim_whitespace=False)
+    first_name = serializers.CharField(max_length=150, required=False, allow_blank=True, default="")
+    last_name = serializers.CharField(max_length=150, required=False, allow_blank=True, default="")
+    role = serializers.ChoiceField(choices=User.Role.choices, default=User.Role.EMPLOYEE)
+    # Department id or name
+    department = serializers.CharField(required=False, allow_blank=True, default="")
+    # Username of an existing employee or of another row in the same import
+    manager = serializers.CharField(required=False, allow_blank=True, default="")
+    phone = serializers.CharField(max_length=30, required=False, allow_blank=True, default="")
+    salary = serializers.DecimalField(max_digits=12, decimal_places=2, min_value=0, required=False)
+    join_date = serializers.DateField(required=False)
+
+    def validate_username(self, value):
+        User.username_validator(value)
+        return value
+
+
+def _hash(password):
+    return make_password(password)
+
+
+def hash_passwords(passwords, workers=None, parallel_threshold=None):
+    """
+    make_password() for each password, in order. Large batches are spread
+    over a process pool (each worker runs django.setup() once), since the
+    PBKDF2 hasher is CPU-bound; small ones are hashed inline.
+    """
+    if parallel_threshold is None:
+        parallel_threshold = getattr(settings, "HRMS_ONBOARDING_PARALLEL_THRESHOLD", 64)
+    if workers == 1 or len(passwords) < parallel_threshold:
+        return [_hash(password) for password in passwords]
+    with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as pool:
+        return list(pool.map(_hash, passwords, chunksize=max(1, len(passwords) // ((workers or 8) * 4))))
+
+
+def import_employees(rows, batch_size=1000, workers=None, parallel_threshold=None):
+    """
+    Create a User and an Employee for each row.
+
+    `rows` is any iterable of dicts (a JSON array or a lazily parsed
+    NDJSON/CSV body). Usernames and emails, departments (by id or name) and
+    managers (by username: an existing employee, else another row of the
+    import) are each checked with one query for the whole import. Valid rows
+    are written together: passwords hashed by hash_passwords(), users and
+    employees inserted with bulk_create in chunks, and managers that are
+    rows of the import set with one bulk_update. Rows that fail, or whose
+    manager's row fails, are reported and skipped.
+    """
+    row_serializer = OnboardingRowSerializer()
+    results, parsed = [], []
+
+    for index, row in enumerate(rows, start=1):
+        entry = {"row": index}
+        results.append(entry)
+        if isinstance(row, RowParseError):
+            _fail(entry, {"non_field_errors": [row.message]})
+            continue
+        if not isinstance(row, dict):
+            _fail(entry, {"non_field_errors": ["Expected an object."]})
+            continue
+        try:
+            data = row_serializer.run_validation(row)
+        except serializers.ValidationError as exc:
+            _fail(entry, exc.detail)
+            continue
+        entry["username"] = data["username"]
+        entry["_data"] = data
+        parsed.append(entry)
+
+    _check_unique(parsed, "username")
+    _check_unique(parsed, "email")
+    _check_passwords(parsed)
+    departments = _resolve_departments(parsed)
+    managers = _resolve_managers(parsed)
+    pending = [entry for entry in parsed if "result" not in entry]
+
+    with_password = [entry for entry in pending if entry["_data"]["password"]]
+    hashes = dict(zip(
+        (entry["row"] for entry in with_password),
+        hash_passwords([entry["_data"]["password"] for entry in with_password], workers, parallel_threshold),
+    ))
+
+    with transaction.atomic():
+        users = User.objects.bulk_create(
+            [
+                User(
+                    username=entry["_data"]["username"],
+                    email=entry["_data"]["email"] or None,
+                    first_name=entry["_data"]["first_name"],
+                    last_name=entry["_data"]["last_name"],
+                    role=entry["_data"]["role"],
+                    password=hashes.get(entry["row"]) or make_password(None),
+                )
+                for entry in pending
+            ],
+            batch_size=batch_size,
+        )
+        employees = Employee.objects.bulk_create(
+            [
+                Employee(
+                    user_id=user.id,
+                    department_id=departments.get(entry["_data"]["department"]),
+                    manager_id=managers.get(entry["_data"]["manager"]),
+                    phone=entry["_data"]["phone"] or None,
+                    salary=entry["_data"].get("salary"),
+                    join_date=entry["_data"].get("join_date"),
+                )
+                for entry, user in zip(pending, users)
+            ],
+            batch_size=batch_size,
+        )
+        # Managers that are rows of this import only have an id now
+        created = {entry["username"]: employee.id for entry, employee in zip(pending, employees)}
+        Employee.objects.bulk_update(
+            [
+                Employee(id=employee.id, manager_id=created[entry["_data"]["manager"]])
+                for entry, employee in zip(pending, employees)
+                if entry["_data"]["manager"] and entry["_data"]["manager"] not in managers
+            ],
+            ["manager"],
+            batch_size=batch_size,
+        )
+
+    for entry, user, employee in zip(pending, users, employees):
+        del entry["_data"]
+        entry.update({"result": "created", "user": user.id, "employee": employee.id})
+
+    return {"created": len(pending), "failed": len(results) - len(pending), "results": results}
+
+
+def _fail(entry, errors):
+    entry["result"] = "error"
+    entry["errors"] = errors
+
+
+def _alive(entries):
+    return [entry for entry in entries if "result" not in entry]
+
+
+def _check_unique(parsed, field):
+    """Fail rows whose `field` repeats within the import or is already taken (one query)."""
+    first = {}
+    for entry in _alive(parsed):
+        value = entry["_data"][field]
+        if value and value in first:
+            _fail(entry, {field: [f"Duplicate {field} in this import (row {first[value]})."]})
+        elif value:
+            first[value] = entry["row"]
+    taken = set(User.objects.filter(**{f"{field}__in": list(first)}).values_list(field, flat=True))
+    for entry in _alive(parsed):
+        if entry["_data"][field] in taken:
+            _fail(entry, {field: [f"A user with this {field} already exists."]})
+
+
+def _check_passwords(parsed):
+    for entry in _alive(parsed):
+        data = entry["_data"]
+        if not data["password"]:
+            continue
+        user = User(username=data["username"], email=data["email"], first_name=data["first_name"], last_name=data["last_name"])
+        try:
+            validate_password(data["password"], user)
+        except DjangoValidationError as exc:
+            _fail(entry, {"password": list(exc.messages)})
+
+
+def _resolve_departments(parsed):
+    """{reference: department id} for every department reference (one query)."""
+    refs = {entry["_data"]["department"] for entry in _alive(parsed) if entry["_data"]["department"]}
+    ids = {int(ref) for ref in refs if ref.isdigit()}
+    found = {}
+    for department_id, name in Department.objects.filter(Q(id__in=ids) | Q(name__in=refs)).values_list("id", "name"):
+        found[name] = department_id
+        found[str(department_id)] = department_id
+    for entry in _alive(parsed):
+        ref = entry["_data"]["department"]
+        if ref and ref not in found:
+            _fail(entry, {"department": [f"Department '{ref}' not found."]})
+    return found
+
+
+def _resolve_managers(parsed):
+    """
+    {username: employee id} of the existing employees referenced as
+    managers (one query). Other references must be rows of the import; a
+    row fails if its manager is missing, not a MANAGER, itself, part of a
+    reference cycle, or a row that failed.
+    """
+    refs = {entry["_data"]["manager"] for entry in _alive(parsed) if entry["_data"]["manager"]}
+    existing = {
+        username: (employee_id, role)
+        for employee_id, username, role in (
+            Employee.objects.filter(user__username__in=refs).values_list("id", "user__username", "user__role")
+        )
+    }
+    rows = {}
+    for entry in parsed:
+        rows.setdefault(entry["username"], entry)
+
+    for entry in _alive(parsed):
+        ref = entry["_data"]["manager"]
+        if not ref:
+            continue
+        if ref == entry["username"]:
+            error = "Employee cannot be their own manager."
+        elif ref in existing:
+            error = None if existing[ref][1] == User.Role.MANAGER else "Manager must have role MANAGER."
+        elif ref in rows:
+            error = None if rows[ref]["_data"]["role"] == User.Role.MANAGER else "Manager must have role MANAGER."
+        else:
+            error = f"Manager '{ref}' not found."
+        if error:
+            _fail(entry, {"manager": [error]})
+
+    # Only rows of the import can point at each other, so only they can loop
+    for entry in _alive(parsed):
+        seen, ref = {entry["username"]}, entry["_data"]["manager"]
+        while ref in rows and ref not in existing:
+            if ref in seen:
+                _fail(entry, {"manager": ["The manager references form a cycle."]})
+                break
+            seen.add(ref)
+            ref = rows[ref]["_data"]["manager"]
+
+    # A failed manager row fails its reports, and theirs in turn
+    changed = True
+    while changed:
+        changed = False
+        for entry in _alive(parsed):
+            ref = entry["_data"]["manager"]
+            if ref and ref not in existing and "result" in rows[ref]:
+                _fail(entry, {"manager": [f"The row for manager '{ref}' failed."]})
+                changed = True
+
+    return {username: employee_id for username, (employee_id, _) in existing.items()}
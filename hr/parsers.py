@@ -0,0 +1,76 @@
+import codecs
+import csv
+import json
+import os
+from types import GeneratorType
+
+from django.conf import settings
+from rest_framework.parsers import BaseParser, JSONParser
+
+
+class RowParseError:
+    """Placeholder yielded for a line that could not be decoded, so one bad line
+    is reported against its row instead of aborting the whole upload."""
+
+    def __init__(self, message):
+        self.message = message
+
+
+def is_row_list(data):
+    """Whether a parsed bulk body is a list of rows: a JSON array or an NDJSON/CSV row generator."""
+    return isinstance(data, (list, GeneratorType))
+
+
+class NDJSONParser(BaseParser):
+    """
+    Newline-delimited JSON. Rows are yielded lazily while the body is read,
+    so large uploads are never held in memory as one document.
+    """
+    media_type = "application/x-ndjson"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get("encoding", settings.DEFAULT_CHARSET)
+        return self._rows(stream, encoding)
+
+    def _rows(self, stream, encoding):
+        if stream is None:
+            return
+        for line in codecs.iterdecode(stream, encoding):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as exc:
+                yield RowParseError(f"Invalid JSON: {exc}")
+
+
+class CSVParser(BaseParser):
+    """
+    CSV with a header row. Empty cells are dropped so field defaults apply.
+    """
+    media_type = "text/csv"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get("encoding", settings.DEFAULT_CHARSET)
+        return self._rows(stream, encoding)
+
+    def _rows(self, stream, encoding):
+        if stream is None:
+            return
+        reader = csv.DictReader(codecs.iterdecode(stream, encoding))
+        try:
+            for row in reader:
+                yield {key: value for key, value in row.items() if key and value not in ("", None)}
+        except csv.Error as exc:
+            yield RowParseError(f"Invalid CSV: {exc}")
+
+
+def file_parser(path, file_format=None):
+    """Parser for an uploaded file given as a path: by `file_format` (csv, json, ndjson) or the extension."""
+    file_format = file_format or os.path.splitext(path)[1].lstrip(".").lower()
+    parsers = {"csv": CSVParser, "json": JSONParser, "ndjson": NDJSONParser}
+    if file_format not in parsers:
+        raise ValueError("Cannot tell the file format; pass --format (csv, json or ndjson).")
+    return parsers[file_format]()
+
@@ -0,0 +1,105 @@
+import re
+from datetime import date
+
+from django.db import connection, transaction
+
+from .models import Attendance
+
+# pg_get_expr() of a range partition bound: FOR VALUES FROM ('2026-09-01') TO ('2026-10-01')
+_RANGE_BOUND = re.compile(r"FROM \('(\d{4}-\d{2}-\d{2})'\) TO \('(\d{4}-\d{2}-\d{2})'\)")
+
+
+def add_months(day, months):
+    """First day of the month `months` away from `day`'s month."""
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table, first_day):
+    return f"{table}_y{first_day.year}m{first_day.month:02d}"
+
+
+def parse_bound(expression):
+    """(from, to) dates of a monthly range partition, None for DEFAULT or anything else."""
+    match = _RANGE_BOUND.search(expression or "")
+    if not match:
+        return None
+    return date.fromisoformat(match.group(1)), date.fromisoformat(match.group(2))
+
+
+def is_partitioned(table=None):
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s))",
+            [table or Attendance._meta.db_table],
+        )
+        return cursor.fetchone()[0]
+
+
+def list_partitions(table=None):
+    """[(name, (from, to) or None)] for every partition of `table`, oldest first, DEFAULT last."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT c.relname, pg_get_expr(c.relpartbound, c.oid)
+            FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = to_regclass(%s)
+            """,
+            [table or Attendance._meta.db_table],
+        )
+        partitions = [(name, parse_bound(bound)) for name, bound in cursor.fetchall()]
+    return sorted(partitions, key=lambda p: (p[1] is None, p[1] or (date.max, date.max), p[0]))
+
+
+def _default_partition(partitions):
+    return next((name for name, bound in partitions if bound is None), None)
+
+
+def create_month_partition(first_day, table=None, partitions=None):
+    """
+    Add the partition for `first_day`'s month. Rows for that month already
+    sitting in the DEFAULT partition are moved into it first, so attaching
+    cannot fail. Returns the partition name, or None if it already exists.
+    """
+    table = table or Attendance._meta.db_table
+    partitions = list_partitions(table) if partitions is None else partitions
+    start, end = first_day.replace(day=1), add_months(first_day, 1)
+    if any(bound == (start, end) for _, bound in partitions):
+        return None
+
+    qn = connection.ops.quote_name
+    name = partition_name(table, start)
+    date_column = qn(Attendance._meta.get_field("date").column)
+    default = _default_partition(partitions)
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"CREATE TABLE {qn(name)} (LIKE {qn(table)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+        if default:
+            cursor.execute(
+                f"WITH moved AS (DELETE FROM {qn(default)} WHERE {date_column} >= %s AND {date_column} < %s RETURNING *) "
+                f"INSERT INTO {qn(name)} SELECT * FROM moved",
+                [start, end],
+            )
+        # Bounds are dates we computed; DDL cannot take bind parameters
+        cursor.execute(
+            f"ALTER TABLE {qn(table)} ATTACH PARTITION {qn(name)} "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+    return name
+
+
+def expired_partitions(retain_months, today=None, table=None, partitions=None):
+    """Monthly partitions that end before the retention window (this month and the `retain_months` before it)."""
+    cutoff = add_months(today or date.today(), -retain_months)
+    partitions = list_partitions(table) if partitions is None else partitions
+    return [name for name, bound in partitions if bound is not None and bound[1] <= cutoff]
+
+
+def detach_partition(name, drop=False, table=None):
+    """Detach a partition, leaving it as a standalone table, or drop it outright."""
+    qn = connection.ops.quote_name
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {qn(table or Attendance._meta.db_table)} DETACH PARTITION {qn(name)}")
+        if drop:
+            cursor.execute(f"DROP TABLE {qn(name)}")
@@ -0,0 +1,157 @@
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .deductions import apply_attendance_deductions, deduction_rates
+from .models import Employee, Payroll
+from .status import PAYROLL_TRANSITIONS, PayrollStatus
+
+
+def run_payroll(year, month, department_id=None, batch_size=1000, progress=None, recompute_deductions=False):
+    """
+    Create DRAFT payrolls for `year`/`month` for every employee (optionally
+    limited to one department) with a single INSERT ... SELECT per batch.
+
+    base_salary and net_salary are snapshotted from Employee.salary in SQL.
+    Employees that already have a payroll for the period are skipped by the
+    uniq_payroll_employee_period constraint (ON CONFLICT DO NOTHING), so a run
+    can be repeated safely. Employees without a salary are reported as failures.
+
+    When HRMS_ATTENDANCE_DEDUCTION_RATES is set, each batch's new payrolls get
+    their attendance deductions in the same transaction
+    (hr.deductions.apply_attendance_deductions). `recompute_deductions`
+    recomputes them afterwards for every DRAFT payroll of the period in
+    scope, e.g. after attendance was corrected.
+
+    `progress(done, total, created)` is called after every batch.
+    """
+    employees = Employee.objects.all()
+    if department_id is not None:
+        employees = employees.filter(department_id=department_id)
+
+    failed = [
+        {"employee": employee_id, "error": "Employee has no salary."}
+        for employee_id in employees.filter(salary__isnull=True).order_by("id").values_list("id", flat=True)
+    ]
+    employee_ids = list(employees.filter(salary__isnull=False).order_by("id").values_list("id", flat=True))
+
+    deduct = bool(deduction_rates())
+    total = len(employee_ids)
+    created = 0
+    for start in range(0, total, batch_size):
+        batch = employee_ids[start:start + batch_size]
+        with transaction.atomic():
+            created_ids = _insert_payroll_batch(year, month, batch[0], batch[-1], department_id)
+            if deduct and created_ids:
+                apply_attendance_deductions(year, month, payroll_ids=created_ids, batch_size=batch_size)
+        created += len(created_ids)
+        if progress:
+            progress(min(start + batch_size, total), total, created)
+
+    deductions = None
+    if recompute_deductions:
+        deductions = apply_attendance_deductions(year, month, department_id=department_id, batch_size=batch_size)
+
+    return {
+        "year": year,
+        "month": month,
+        "department": department_id,
+        "employees": total + len(failed),
+        "created": created,
+        "skipped": total - created,
+        "failed": failed,
+        "deductions": deductions,
+    }
+
+
+def _insert_payroll_batch(year, month, first_id, last_id, department_id=None):
+    qn = connection.ops.quote_name
+    payroll = Payroll._meta
+    employee = Employee._meta
+
+    def col(name):
+        return qn(payroll.get_field(name).column)
+
+    now = connection.ops.adapt_datetimefield_value(timezone.now())
+    salary = f"e.{qn(employee.get_field('salary').column)}"
+    department = f"e.{qn(employee.get_field('department').column)}"
+    where = [f"e.{qn(employee.pk.column)} BETWEEN %s AND %s", f"{salary} IS NOT NULL"]
+    params = [year, month, PayrollStatus.DRAFT, now, now, first_id, last_id]
+    if department_id is not None:
+        where.append(f"{department} = %s")
+        params.append(department_id)
+
+    sql = f"""
+        INSERT INTO {qn(payroll.db_table)} (
+            {col('employee')}, {col('department')}, {col('year')}, {col('month')},
+            {col('base_salary')}, {col('allowances')}, {col('deductions')}, {col('attendance_deductions')},
+            {col('net_salary')}, {col('status')}, {col('note')}, {col('created_at')}, {col('updated_at')}
+        )
+        SELECT
+            e.{qn(employee.pk.column)}, {department}, %s, %s,
+            {salary}, 0, 0, 0,
+            {salary}, %s, '', %s, %s
+        FROM {qn(employee.db_table)} e
+        WHERE {" AND ".join(where)}
+        ON CONFLICT ({col('employee')}, {col('year')}, {col('month')}) DO NOTHING
+        RETURNING {qn(payroll.pk.column)}
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [row[0] for row in cursor.fetchall()]
+
+
+def transition_payrolls(status, ids=None, filters=None, batch_size=1000, skip_locked=True):
+    """
+    Move payrolls one step along DRAFT -> FINAL -> PAID, to `status`.
+
+    Candidates are the payrolls in the preceding status that match `ids`
+    and/or `filters` (ORM lookups). They are walked in id order, one batch
+    per transaction: the batch is locked with SELECT ... FOR UPDATE SKIP
+    LOCKED and moved with a single UPDATE, so concurrent runs never
+    transition a row twice and do not wait on each other. Rows locked by
+    someone else are reported as skipped rather than waited for
+    (skip_locked=False waits instead). Requested ids that are missing or in
+    another status are reported as invalid.
+    """
+    source = next((s for s, target in PAYROLL_TRANSITIONS.items() if target == status), None)
+    if source is None:
+        raise ValueError(f"No transition leads to {status}.")
+
+    payrolls = Payroll.objects.filter(**(filters or {}))
+    if ids is not None:
+        payrolls = payrolls.filter(id__in=ids)
+    candidates = payrolls.filter(status=source).order_by("id")
+
+    invalid = []
+    if ids is not None:
+        found = dict(payrolls.values_list("id", "status"))
+        invalid = [
+            {"id": payroll_id, "status": found.get(payroll_id)}
+            for payroll_id in sorted(set(ids))
+            if found.get(payroll_id) != source
+        ]
+
+    transitioned, skipped, last_id = 0, [], 0
+    while True:
+        batch = list(candidates.filter(id__gt=last_id).values_list("id", flat=True)[:batch_size])
+        if not batch:
+            break
+        last_id = batch[-1]
+        with transaction.atomic():
+            mine = list(
+                Payroll.objects.filter(id__in=batch, status=source)
+                .select_for_update(skip_locked=skip_locked)
+                .values_list("id", flat=True)
+            )
+            transitioned += Payroll.objects.filter(id__in=mine).update(status=status, updated_at=timezone.now())
+        # Locked by another transaction, or moved on since the batch was read
+        skipped.extend(sorted(set(batch) - set(mine)))
+
+    return {
+        "from": source,
+        "to": status,
+        "transitioned": transitioned,
+        "skipped": skipped,
+        "invalid": invalid,
+    }
+
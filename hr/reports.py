@@ -0,0 +1,184 @@
+from time import perf_counter
+
+from django.db import connections, transaction
+from django.utils import timezone
+
+from .models import (
+    AttendanceReport,
+    EmployeeReport,
+    LeaveBalanceReport,
+    LeaveRequestReport,
+    PayrollReport,
+    ReportRefresh,
+)
+
+# Report name -> (model, tables read, SELECT the view is built from). These
+# are the reports in `sql task/DatabaseQueries.sql`, written over the hr_* tables.
+REPORTS = {
+    "employees": (
+        EmployeeReport,
+        ["hr_employee", "accounts_user", "hr_department"],
+        """
+        SELECT e.id, e.id AS employee_id, u.username, u.first_name, u.last_name, u.email,
+               e.department_id, d.name AS department_name,
+               e.manager_id, e.phone, e.join_date, e.salary
+        FROM hr_employee e
+        JOIN accounts_user u ON u.id = e.user_id
+        LEFT JOIN hr_department d ON d.id = e.department_id
+        """,
+    ),
+    # From the monthly rollups, so neither the view nor its refresh scans raw attendance
+    "attendance": (
+        AttendanceReport,
+        ["hr_attendancemonthlysummary", "hr_employee", "accounts_user", "hr_department"],
+        """
+        SELECT s.id, s.employee_id, u.username, u.first_name, u.last_name, u.email,
+               e.department_id, d.name AS department_name,
+               s.year, s.month, s.present_days, s.absent_days, s.late_days, s.leave_days,
+               s.present_days + s.absent_days + s.late_days + s.leave_days AS recorded_days
+        FROM hr_attendancemonthlysummary s
+        JOIN hr_employee e ON e.id = s.employee_id
+        JOIN accounts_user u ON u.id = e.user_id
+        LEFT JOIN hr_department d ON d.id = e.department_id
+        """,
+    ),
+    "payroll": (
+        PayrollReport,
+        ["hr_payroll", "hr_employee", "accounts_user", "hr_department"],
+        """
+        SELECT p.id, p.employee_id, u.username, u.first_name, u.last_name, u.email,
+               p.department_id, d.name AS department_name,
+               p.year, p.month, p.base_salary, p.allowances, p.deductions, p.attendance_deductions,
+               p.base_salary + p.allowances AS gross_salary, p.net_salary, p.status
+        FROM hr_payroll p
+        JOIN hr_employee e ON e.id = p.employee_id
+        JOIN accounts_user u ON u.id = e.user_id
+        LEFT JOIN hr_department d ON d.id = p.department_id
+        """,
+    ),
+    "leave-balances": (
+        LeaveBalanceReport,
+        ["hr_leavebalance", "hr_leavetype", "hr_employee", "accounts_user", "hr_department"],
+        """
+        SELECT b.id, b.employee_id, u.username, u.first_name, u.last_name, u.email,
+               e.department_id, d.name AS department_name,
+               b.leave_type_id, t.name AS leave_type_name, t.is_paid,
+               b.allocated_days, b.used_days, b.balance
+        FROM hr_leavebalance b
+        JOIN hr_leavetype t ON t.id = b.leave_type_id
+        JOIN hr_employee e ON e.id = b.employee_id
+        JOIN accounts_user u ON u.id = e.user_id
+        LEFT JOIN hr_department d ON d.id = e.department_id
+        """,
+    ),
+    "leave-requests": (
+        LeaveRequestReport,
+        ["hr_leaverequest", "hr_leavetype", "hr_employee", "accounts_user", "hr_department"],
+        """
+        SELECT r.id, r.employee_id, u.username, u.first_name, u.last_name, u.email,
+               e.department_id, d.name AS department_name,
+               r.leave_type_id, t.name AS leave_type_name, t.is_paid,
+               r.start_date, r.end_date, r.days, r.status, r.created_at
+        FROM hr_leaverequest r
+        JOIN hr_leavetype t ON t.id = r.leave_type_id
+        JOIN hr_employee e ON e.id = r.employee_id
+        JOIN accounts_user u ON u.id = e.user_id
+        LEFT JOIN hr_department d ON d.id = e.department_id
+        """,
+    ),
+}
+
+
+def is_materialized(connection):
+    return connection.vendor == "postgresql"
+
+
+def _index_columns(model, qn):
+    # The model's ordering, so scoped report pages are read in index order
+    return ", ".join(
+        f"{qn(model._meta.get_field(name.lstrip('-')).column)}{' DESC' if name.startswith('-') else ''}"
+        for name in model._meta.ordering
+    )
+
+
+def _record(name, started, using):
+    ReportRefresh.objects.using(using).update_or_create(
+        name=name,
+        defaults={"refreshed_at": timezone.now(), "duration_ms": round((perf_counter() - started) * 1000)},
+    )
+
+
+def drop_report_views(using="default"):
+    """Drop every report view, e.g. before migrations rebuild the tables they read."""
+    connection = connections[using]
+    kind = "MATERIALIZED VIEW" if is_materialized(connection) else "VIEW"
+    qn = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        for model, _, _ in REPORTS.values():
+            cursor.execute(f"DROP {kind} IF EXISTS {qn(model._meta.db_table)}")
+
+
+def create_report_views(using="default"):
+    """
+    Create the report views that are missing and whose tables all exist.
+
+    On Postgres each is a materialized view with a unique index on id (which
+    REFRESH ... CONCURRENTLY needs) and indexes on (department, ordering)
+    and (employee, ordering) for the scoped reads; elsewhere a plain view.
+    Returns the names created.
+    """
+    connection = connections[using]
+    materialized = is_materialized(connection)
+    qn = connection.ops.quote_name
+    existing = set(connection.introspection.table_names(include_views=True))
+    if ReportRefresh._meta.db_table not in existing:
+        return []
+    created = []
+    for name, (model, tables, select) in REPORTS.items():
+        view = model._meta.db_table
+        if view in existing or not existing.issuperset(tables):
+            continue
+        started = perf_counter()
+        with transaction.atomic(using=using), connection.cursor() as cursor:
+            if not materialized:
+                cursor.execute(f"CREATE VIEW {qn(view)} AS {select}")
+            else:
+                order = _index_columns(model, qn)
+                cursor.execute(f"CREATE MATERIALIZED VIEW {qn(view)} AS {select}")
+                cursor.execute(f"CREATE UNIQUE INDEX {qn(view + '_id')} ON {qn(view)} (id)")
+                cursor.execute(f"CREATE INDEX {qn(view + '_department')} ON {qn(view)} (department_id, {order})")
+                cursor.execute(f"CREATE INDEX {qn(view + '_employee')} ON {qn(view)} (employee_id, {order})")
+            _record(name, started, using)
+        created.append(name)
+    return created
+
+
+def refresh_reports(names=None, using="default"):
+    """
+    Refresh the named reports (default: all) and record when. Materialized
+    views are refreshed CONCURRENTLY, so readers keep the previous contents
+    until the new ones are swapped in; plain views are always current and
+    only get the timestamp. Returns {name: milliseconds}.
+    """
+    names = list(REPORTS) if names is None else names
+    unknown = set(names) - set(REPORTS)
+    if unknown:
+        raise ValueError(f"Unknown report(s): {', '.join(sorted(unknown))}.")
+
+    connection = connections[using]
+    qn = connection.ops.quote_name
+    timings = {}
+    for name in names:
+        model = REPORTS[name][0]
+        started = perf_counter()
+        with transaction.atomic(using=using):
+            if is_materialized(connection):
+                with connection.cursor() as cursor:
+                    cursor.execute(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {qn(model._meta.db_table)}")
+            _record(name, started, using)
+        timings[name] = round((perf_counter() - started) * 1000)
+    return timings
+
+
+def report_refreshed_at(name):
+    return ReportRefresh.objects.filter(name=name).values_list("refreshed_at", flat=True).first()
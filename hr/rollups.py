@@ -0,0 +1,94 @@
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import ExtractMonth, ExtractYear, Greatest
+from django.utils import timezone
+
+from .models import Attendance, AttendanceMonthlySummary
+from .status import AttendanceStatus
+
+# AttendanceStatus value -> counter column on AttendanceMonthlySummary
+STATUS_FIELDS = {status: f"{status.lower()}_days" for status in AttendanceStatus.values}
+
+
+def apply_attendance_deltas(entries):
+    """
+    Adjust monthly rollups for attendance writes.
+
+    `entries` is an iterable of (employee_id, date, status, delta) where delta
+    is +1 for a row that now exists and -1 for the state a row had before an
+    update. Must run inside the transaction that wrote the attendance rows.
+    Updates are grouped so rows with the same change share one UPDATE.
+
+    Single-row saves and deletes are covered by the Attendance signals in
+    hr.signals; bulk writes, which bypass signals, call this directly.
+    """
+    deltas = defaultdict(Counter)
+    for employee_id, day, status, delta in entries:
+        deltas[(employee_id, day.year, day.month)][STATUS_FIELDS[status]] += delta
+
+    groups = defaultdict(list)
+    for (employee_id, year, month), counter in deltas.items():
+        change = tuple(sorted((field, n) for field, n in counter.items() if n))
+        if change:
+            groups[(year, month, change)].append(employee_id)
+    if not groups:
+        return
+
+    AttendanceMonthlySummary.objects.bulk_create(
+        [
+            AttendanceMonthlySummary(employee_id=employee_id, year=year, month=month)
+            for (year, month, _), employee_ids in groups.items()
+            for employee_id in employee_ids
+        ],
+        ignore_conflicts=True,
+    )
+    now = timezone.now()
+    for (year, month, change), employee_ids in groups.items():
+        AttendanceMonthlySummary.objects.filter(
+            year=year, month=month, employee_id__in=employee_ids,
+        ).update(updated_at=now, **{field: _adjust(field, n) for field, n in change})
+
+
+def _adjust(field, n):
+    # Never fail an attendance write over a counter that has drifted (e.g.
+    # rows changed with queryset.update()); rebuild_attendance_rollups fixes it.
+    if n < 0:
+        return Greatest(F(field) + n, 0)
+    return F(field) + n
+
+
+def rebuild_attendance_rollups(year=None, month=None, batch_size=1000):
+    """
+    Recompute rollups from hr_attendance with one grouped aggregate, replacing
+    the existing rows for the selected period (everything by default).
+    Returns the number of rollup rows written.
+    """
+    attendance = Attendance.objects.all()
+    summaries = AttendanceMonthlySummary.objects.all()
+    if year is not None:
+        attendance = attendance.filter(date__year=year)
+        summaries = summaries.filter(year=year)
+    if month is not None:
+        attendance = attendance.filter(date__month=month)
+        summaries = summaries.filter(month=month)
+
+    rows = (
+        attendance
+        .annotate(year=ExtractYear("date"), month=ExtractMonth("date"))
+        .values("employee_id", "year", "month")
+        .annotate(**{
+            field: Count("id", filter=Q(status=status))
+            for status, field in STATUS_FIELDS.items()
+        })
+        .order_by()
+    )
+
+    with transaction.atomic():
+        summaries.delete()
+        created = AttendanceMonthlySummary.objects.bulk_create(
+            (AttendanceMonthlySummary(**row) for row in rows.iterator()),
+            batch_size=batch_size,
+        )
+    return len(created)
@@ -0,0 +1,129 @@
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Case, DecimalField, F, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from rest_framework import serializers
+
+from .deductions import capped_deductions_expression
+from .models import Employee, Payroll
+from .parsers import RowParseError
+from .status import PayrollStatus
+
+
+class SalaryChangeRowSerializer(serializers.Serializer):
+    employee = serializers.IntegerField(min_value=1)
+    salary = serializers.DecimalField(max_digits=12, decimal_places=2, min_value=Decimal("0"))
+
+
+def apply_salary_changes(rows, batch_size=1000):
+    """
+    Set Employee.salary for many employees, then recompute their DRAFT payrolls.
+
+    `rows` is any iterable of {"employee", "salary"} dicts (a JSON array or a
+    lazily parsed NDJSON/CSV body). Salaries are written with one
+    UPDATE ... SET salary = CASE id WHEN ... END per batch, which also bumps
+    the employees' version (their ETag). Returns a per-row report plus the
+    recompute_draft_payrolls() result.
+    """
+    row_serializer = SalaryChangeRowSerializer()
+    results = []
+    salaries = {}  # employee_id -> new salary
+    entries = {}  # employee_id -> result entry
+
+    for index, row in enumerate(rows, start=1):
+        entry = {"row": index}
+        results.append(entry)
+
+        if isinstance(row, RowParseError):
+            _fail(entry, {"non_field_errors": [row.message]})
+            continue
+        if not isinstance(row, dict):
+            _fail(entry, {"non_field_errors": ["Expected an object."]})
+            continue
+
+        try:
+            data = row_serializer.run_validation(row)
+        except serializers.ValidationError as exc:
+            _fail(entry, exc.detail)
+            continue
+
+        employee_id = data["employee"]
+        entry["employee"] = employee_id
+        if employee_id in salaries:
+            _fail(entry, {"non_field_errors": ["Duplicate employee in this batch."]})
+            continue
+        salaries[employee_id] = data["salary"]
+        entries[employee_id] = entry
+
+    known = set(Employee.objects.filter(id__in=salaries).values_list("id", flat=True))
+    for employee_id in set(salaries) - known:
+        _fail(entries[employee_id], {"employee": ["Employee not found."]})
+        del salaries[employee_id]
+
+    with transaction.atomic():
+        employee_ids = sorted(salaries)
+        for start in range(0, len(employee_ids), batch_size):
+            batch = employee_ids[start:start + batch_size]
+            Employee.objects.filter(id__in=batch).update(
+                salary=Case(
+                    *(When(id=employee_id, then=Value(salaries[employee_id])) for employee_id in batch),
+                    output_field=DecimalField(max_digits=12, decimal_places=2),
+                ),
+                version=F("version") + 1,
+            )
+            for employee_id in batch:
+                entries[employee_id].update({"result": "updated", "salary": str(salaries[employee_id])})
+        payrolls = recompute_draft_payrolls(employee_ids)
+
+    return {
+        "updated": len(salaries),
+        "failed": sum(1 for entry in results if entry["result"] == "error"),
+        "payrolls": payrolls,
+        "results": results,
+    }
+
+
+def recompute_draft_payrolls(employee_ids=None):
+    """
+    Re-snapshot base_salary from Employee.salary and recompute net_salary for
+    the DRAFT payrolls of `employee_ids` (default: every employee) in one
+    set-based UPDATE. FINAL and PAID payrolls are never touched. Attendance
+    deductions are re-capped from their itemised total (cap_deductions());
+    drafts whose manual deductions alone exceed the new gross are left as
+    they are and reported.
+    """
+    salary = Coalesce(
+        Subquery(Employee.objects.filter(pk=OuterRef("employee_id")).values("salary")[:1]),
+        Value(Decimal("0")),
+        output_field=DecimalField(max_digits=12, decimal_places=2),
+    )
+    drafts = Payroll.objects.filter(status=PayrollStatus.DRAFT)
+    if employee_ids is not None:
+        drafts = drafts.filter(employee_id__in=employee_ids)
+    drafts = drafts.alias(
+        new_base=salary,
+        available=F("new_base") + F("allowances") - F("deductions"),
+        new_attendance=capped_deductions_expression(F("available")),
+        new_net=F("available") - F("new_attendance"),
+    )
+
+    with transaction.atomic():
+        skipped = list(
+            drafts.filter(new_net__lt=0).order_by("id").values("id", "employee", "year", "month")
+        )
+        updated = drafts.filter(new_net__gte=0).update(
+            base_salary=F("new_base"),
+            attendance_deductions=F("new_attendance"),
+            net_salary=F("new_net"),
+            updated_at=timezone.now(),
+        )
+    for payroll in skipped:
+        payroll["error"] = "Deductions would make net salary negative."
+    return {"recomputed": updated, "skipped": skipped}
+
+
+def _fail(entry, errors):
+    entry["result"] = "error"
+    entry["errors"] = errors
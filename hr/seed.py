@@ -0,0 +1,259 @@
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from accounts.models import User
+
+from .caching import invalidate_department_cache
+from .models import (
+    Attendance,
+    Department,
+    Employee,
+    LeaveBalance,
+    LeaveLedgerEntry,
+    LeaveRequest,
+    LeaveType,
+    Payroll,
+)
+from .rollups import rebuild_attendance_rollups
+from .status import AttendanceStatus, LeaveLedgerKind, LeaveStatus, PayrollStatus
+
+# Share of each AttendanceStatus on a seeded working day
+STATUS_WEIGHTS = {
+    AttendanceStatus.PRESENT: 85,
+    AttendanceStatus.LATE: 7,
+    AttendanceStatus.ABSENT: 4,
+    AttendanceStatus.LEAVE: 4,
+}
+
+CENT = Decimal("0.01")
+
+# Seeded leave types and the days every employee is allocated
+LEAVE_ALLOCATIONS = {"Annual leave": 20, "Sick leave": 10}
+
+
+def _months(end_year, end_month, count):
+    """The `count` (year, month) pairs ending at end_year-end_month, oldest first."""
+    index = end_year * 12 + end_month - 1
+    return [(i // 12, i % 12 + 1) for i in range(index - count + 1, index + 1)]
+
+
+def _bulk_create(model, objs, batch_size, progress=None):
+    # bulk_create materialises its input, so feed it one batch at a time
+    objs, total = iter(objs), 0
+    while batch := list(islice(objs, batch_size)):
+        model.objects.bulk_create(batch, batch_size=batch_size)
+        total += len(batch)
+        if progress:
+            progress(model._meta.verbose_name_plural, total)
+    return total
+
+
+def seed_hr_data(departments=10, employees=1000, years=1, span=8, prefix="seed",
+                 password="Pass12345!", end=None, seed=0, batch_size=1000, progress=None):
+    """
+    Populate the database with a synthetic organisation for benchmarking.
+
+    Employee 0 is an ADMIN at the top of the tree. Every department has a
+    head reporting to employee 0 and its members form a tree below that head
+    with at most `span` direct reports each; anyone with reports is a
+    MANAGER. Every employee gets an Attendance row for each weekday and a
+    Payroll for each month of the `years` years ending with the month before
+    `end` (default: today), PAID except the last month, which is DRAFT.
+    Each employee is allocated LEAVE_ALLOCATIONS and has one approved
+    single-day annual leave request on the last seeded day. Rollups are rebuilt at the end since bulk writes bypass the signals.
+
+    Usernames are `<prefix>_<n>`; raises ValueError if the prefix is taken.
+    Output is deterministic for a given `seed`. Returns the row counts.
+    """
+    if departments < 1 or employees < departments + 1 or years < 1 or span < 1:
+        raise ValueError("Need departments >= 1, employees > departments, years >= 1 and span >= 1.")
+    if User.objects.filter(username__startswith=f"{prefix}_").exists():
+        raise ValueError(f"Users with the prefix '{prefix}_' already exist.")
+
+    rng = random.Random(seed)
+    end = end or date.today()
+    end_year, end_month = (end.year, end.month - 1) if end.month > 1 else (end.year - 1, 12)
+    months = _months(end_year, end_month, years * 12)
+    first_day = date(months[0][0], months[0][1], 1)
+    last_day = date(end_year, end_month, 1).replace(day=28) + timedelta(days=4)
+    last_day -= timedelta(days=last_day.day)
+
+    with transaction.atomic():
+        Department.objects.bulk_create(
+            Department(name=f"{prefix} department {i:03d}", location=f"Floor {i % 20 + 1}")
+            for i in range(departments)
+        )
+        department_ids = list(
+            Department.objects.filter(name__startswith=f"{prefix} department ")
+            .order_by("name").values_list("id", flat=True)
+        )
+
+        # Index 0 is the admin; the rest are dealt round-robin into departments
+        # and form a `span`-ary tree inside each one
+        department_of, manager_of, members = {}, {}, [[] for _ in department_ids]
+        for i in range(1, employees):
+            group = members[(i - 1) % departments]
+            department_of[i] = department_ids[(i - 1) % departments]
+            manager_of[i] = group[(len(group) - 1) // span] if group else 0
+            group.append(i)
+        # Managers of others and every department head (even one without reports)
+        has_reports = set(manager_of.values()) | {group[0] for group in members if group}
+
+        password_hash = make_password(password)
+        User.objects.bulk_create(
+            (
+                User(
+                    username=f"{prefix}_{i:06d}",
+                    email=f"{prefix}_{i:06d}@example.com",
+                    password=password_hash,
+                    role=(
+                        User.Role.ADMIN if i == 0
+                        else User.Role.MANAGER if i in has_reports
+                        else User.Role.EMPLOYEE
+                    ),
+                )
+                for i in range(employees)
+            ),
+            batch_size=batch_size,
+        )
+        user_ids = dict(User.objects.filter(username__startswith=f"{prefix}_").values_list("username", "id"))
+
+        salaries = [
+            Decimal(rng.randrange(300000, 2000000)).scaleb(-2) for _ in range(employees)
+        ]
+        _bulk_create(
+            Employee,
+            (
+                Employee(
+                    user_id=user_ids[f"{prefix}_{i:06d}"],
+                    department_id=department_of.get(i, department_ids[0]),
+                    phone=f"+1555{i:07d}",
+                    salary=salaries[i],
+                    join_date=first_day - timedelta(days=rng.randrange(1, 3650)),
+                )
+                for i in range(employees)
+            ),
+            batch_size,
+        )
+        employee_ids = dict(
+            Employee.objects.filter(user__username__startswith=f"{prefix}_")
+            .values_list("user__username", "id")
+        )
+        employee_ids = [employee_ids[f"{prefix}_{i:06d}"] for i in range(employees)]
+
+        Employee.objects.bulk_update(
+            [Employee(id=employee_ids[i], manager_id=employee_ids[m]) for i, m in manager_of.items()],
+            ["manager"],
+            batch_size=batch_size,
+        )
+        Department.objects.bulk_update(
+            [Department(id=department_ids[d], manager_id=employee_ids[group[0]])
+             for d, group in enumerate(members) if group],
+            ["manager"],
+        )
+        invalidate_department_cache()
+
+    employee_departments = [department_of.get(i, department_ids[0]) for i in range(employees)]
+    statuses, weights = list(STATUS_WEIGHTS), list(STATUS_WEIGHTS.values())
+    days = [
+        first_day + timedelta(days=n)
+        for n in range((last_day - first_day).days + 1)
+        if (first_day + timedelta(days=n)).weekday() < 5
+    ]
+
+    with transaction.atomic():
+        attendance = _bulk_create(
+            Attendance,
+            (
+                Attendance(employee_id=employee_id, department_id=department_id, date=day, status=status)
+                for day in days
+                for employee_id, department_id, status in zip(
+                    employee_ids, employee_departments, rng.choices(statuses, weights, k=employees)
+                )
+            ),
+            batch_size,
+            progress,
+        )
+        rebuild_attendance_rollups(batch_size=batch_size)
+
+    def payroll(i, year, month):
+        allowances = Decimal(rng.randrange(0, 50000)).scaleb(-2)
+        deductions = Decimal(rng.randrange(0, 30000)).scaleb(-2)
+        return Payroll(
+            employee_id=employee_ids[i], department_id=employee_departments[i], year=year, month=month,
+            base_salary=salaries[i], allowances=allowances, deductions=deductions,
+            net_salary=(salaries[i] + allowances - deductions).quantize(CENT),
+            status=PayrollStatus.DRAFT if (year, month) == months[-1] else PayrollStatus.PAID,
+        )
+
+    with transaction.atomic():
+        payrolls = _bulk_create(
+            Payroll,
+            (payroll(i, year, month) for year, month in months for i in range(employees)),
+            batch_size,
+            progress,
+        )
+
+    with transaction.atomic():
+        leave_types = {
+            name: LeaveType.objects.get_or_create(name=name, defaults={"max_days": days})[0].id
+            for name, days in LEAVE_ALLOCATIONS.items()
+        }
+        annual = leave_types["Annual leave"]
+        _bulk_create(
+            LeaveRequest,
+            (
+                LeaveRequest(
+                    employee_id=employee_id, leave_type_id=annual, start_date=last_day, end_date=last_day,
+                    days=1, status=LeaveStatus.APPROVED,
+                )
+                for employee_id in employee_ids
+            ),
+            batch_size,
+        )
+        request_ids = dict(
+            LeaveRequest.objects.filter(employee_id__in=employee_ids, leave_type_id=annual, start_date=last_day)
+            .values_list("employee_id", "id")
+        )
+
+        def ledger(employee_id):
+            for name, type_id in leave_types.items():
+                allocated = LEAVE_ALLOCATIONS[name]
+                yield LeaveLedgerEntry(
+                    employee_id=employee_id, leave_type_id=type_id, kind=LeaveLedgerKind.ALLOCATION,
+                    days=allocated, balance_after=allocated, note="Seeded allocation",
+                )
+                if type_id == annual:
+                    yield LeaveLedgerEntry(
+                        employee_id=employee_id, leave_type_id=type_id, kind=LeaveLedgerKind.USAGE,
+                        days=-1, balance_after=allocated - 1, leave_request_id=request_ids[employee_id],
+                    )
+
+        _bulk_create(LeaveLedgerEntry, (entry for employee_id in employee_ids for entry in ledger(employee_id)), batch_size)
+        _bulk_create(
+            LeaveBalance,
+            (
+                LeaveBalance(
+                    employee_id=employee_id, leave_type_id=type_id, allocated_days=LEAVE_ALLOCATIONS[name],
+                    used_days=int(type_id == annual), balance=LEAVE_ALLOCATIONS[name] - int(type_id == annual),
+                )
+                for employee_id in employee_ids
+                for name, type_id in leave_types.items()
+            ),
+            batch_size,
+        )
+
+    return {
+        "departments": departments,
+        "employees": employees,
+        "attendance": attendance,
+        "payrolls": payrolls,
+        "leave_requests": len(request_ids),
+        "first_day": first_day,
+        "last_day": last_day,
+    }
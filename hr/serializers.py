@@ -1,6 +1,25 @@
 from rest_framework import serializers
 from accounts.models import User
-from .models import Department, Employee, Attendance, Payroll
+from accounts.principal import get_principal
+from .models import (
+    Department,
+    Employee,
+    Attendance,
+    Payroll,
+    LeaveType,
+    LeaveRequest,
+    LeaveBalance,
+    LeaveLedgerEntry,
+    EmployeeReport,
+    AttendanceReport,
+    PayrollReport,
+    LeaveBalanceReport,
+    LeaveRequestReport,
+)
+from .status import PAYROLL_TRANSITIONS, AttendanceStatus, LeaveStatus, PayrollStatus
+from .leave import current_balance, overlapping_requests, working_days
+from .deductions import cap_deductions, employee_deductions, save_breakdown
+from .hierarchy import creates_cycle
 from django.db import IntegrityError, transaction
 from decimal import Decimal
 
@@ -56,6 +75,10 @@ class EmployeeSerializer(serializers.ModelSerializer):
         if self.instance and manager and manager.id == self.instance.id:
             raise serializers.ValidationError({"manager": "Employee cannot be their own manager."})
 
+        # Prevent longer loops (A -> B -> ... -> A), checked in one recursive query
+        if self.instance and manager and "manager" in attrs and creates_cycle(self.instance.id, manager.id):
+            raise serializers.ValidationError({"manager": "This manager reports to the employee; it would create a cycle."})
+
         # If manager is assigned, require manager role = MANAGER (or ADMIN if you want)
         if manager and manager.user.role != User.Role.MANAGER:
             raise serializers.ValidationError({"manager": "Manager must have role MANAGER."})
@@ -78,7 +101,7 @@ class AttendanceSerializer(serializers.ModelSerializer):
         """
         #TODO: this will raise error if the context does not have "request", use .get() instead to avoid this error
         request = self.context.get("request")
-        user = request.user
+        principal = get_principal(request)
 
         # Only validate scope if employee provided (create) or existing instance (update)
         target_employee = attrs.get("employee") or getattr(self.instance, "employee", None)
@@ -87,15 +110,15 @@ class AttendanceSerializer(serializers.ModelSerializer):
             return attrs
 
         # Admin can do anything
-        if getattr(user, "role", None) == "ADMIN" or user.is_superuser:
+        if principal.is_admin:
             return attrs
 
         # Manager scope: must have employee profile and same department as target
-        if getattr(user, "role", None) == "MANAGER":
-            if not hasattr(user, "employee"):
+        if principal.is_manager:
+            if principal.employee_id is None:
                 raise serializers.ValidationError("Manager must have an Employee profile.")
 
-            if user.employee.department_id != target_employee.department_id:
+            if principal.department_id != target_employee.department_id:
                 raise serializers.ValidationError("Managers can only manage attendance within their department.")
             return attrs
 
@@ -109,7 +132,16 @@ class AttendanceSerializer(serializers.ModelSerializer):
                 return super().create(validated_data)
         except IntegrityError:
             raise serializers.ValidationError({"date": "Attendance already exists for this employee on this date."})
-        
+
+    def update(self, instance, validated_data):
+        # Atomic so the rollup adjustment made on save commits with the row
+        try:
+            with transaction.atomic():
+                return super().update(instance, validated_data)
+        except IntegrityError:
+            raise serializers.ValidationError({"date": "Attendance already exists for this employee on this date."})
+
+
 class PayrollSerializer(serializers.ModelSerializer):
     class Meta:
         model = Payroll
@@ -121,20 +153,27 @@ class PayrollSerializer(serializers.ModelSerializer):
             "base_salary",
             "allowances",
             "deductions",
+            "attendance_deductions",
             "net_salary",
             "status",
             "note",
             "created_at",
             "updated_at",
         ]
-        read_only_fields = ["id", "base_salary", "net_salary", "created_at", "updated_at"]
+        read_only_fields = ["id", "base_salary", "attendance_deductions", "net_salary", "created_at", "updated_at"]
 
-    def _compute_net(self, base: Decimal, allowances: Decimal, deductions: Decimal) -> Decimal:
-        net = (base or Decimal("0")) + (allowances or Decimal("0")) - (deductions or Decimal("0"))
+    def _compute_net(self, base: Decimal, allowances: Decimal, deductions: Decimal, attendance: Decimal = Decimal("0")) -> Decimal:
+        net = (base or Decimal("0")) + (allowances or Decimal("0")) - (deductions or Decimal("0")) - attendance
         if net < 0:
             raise serializers.ValidationError({"deductions": "Deductions cannot make net salary negative."})
         return net
 
+    def validate_status(self, value):
+        # Updates follow DRAFT -> FINAL -> PAID one step at a time
+        if self.instance is not None and value not in (self.instance.status, PAYROLL_TRANSITIONS.get(self.instance.status)):
+            raise serializers.ValidationError(f"Cannot move a {self.instance.status} payroll to {value}.")
+        return value
+
     def validate(self, attrs):
         """
         RBAC rule for write actions:
@@ -142,11 +181,11 @@ class PayrollSerializer(serializers.ModelSerializer):
         Managers & Employees are read-only
         """
         request = self.context["request"]
-        user = request.user
+        principal = get_principal(request)
 
         # Allow read for anyone authenticated; writes handled here
         if request.method in ("POST", "PUT", "PATCH", "DELETE"):
-            if not (user.is_superuser or getattr(user, "role", None) == "ADMIN"):
+            if not principal.is_admin:
                 raise serializers.ValidationError("Only admins can create or modify payroll records.")
         return attrs
 
@@ -158,12 +197,19 @@ class PayrollSerializer(serializers.ModelSerializer):
         allowances = validated_data.get("allowances", Decimal("0"))
         deductions = validated_data.get("deductions", Decimal("0"))
 
+        # Attendance deductions for the period (hr.deductions), itemised after saving
+        attendance, lines = employee_deductions(employee.id, validated_data["year"], validated_data["month"])
+        attendance, _ = cap_deductions(base + allowances - deductions, attendance)
+
         validated_data["base_salary"] = base
-        validated_data["net_salary"] = self._compute_net(base, allowances, deductions)
+        validated_data["attendance_deductions"] = attendance
+        validated_data["net_salary"] = self._compute_net(base, allowances, deductions, attendance)
 
         try:
             with transaction.atomic():
-                return super().create(validated_data)
+                payroll = super().create(validated_data)
+                save_breakdown(payroll.id, lines)
+                return payroll
         except IntegrityError:
             raise serializers.ValidationError(
                 {"non_field_errors": ["Payroll already exists for this employee in this month."]}
@@ -173,12 +219,290 @@ class PayrollSerializer(serializers.ModelSerializer):
         """
         Keep base_salary locked to Employee.salary at the time of update as well
         (optional, but matches your requirement strictly).
+
+        Only drafts are re-snapshotted: FINAL and PAID payrolls keep their
+        amounts (a status move or note edit leaves them as stored) and reject
+        changes to allowances and deductions.
         """
+        if instance.status != PayrollStatus.DRAFT:
+            changed = [
+                name for name in ("allowances", "deductions")
+                if name in validated_data and validated_data[name] != getattr(instance, name)
+            ]
+            if changed:
+                raise serializers.ValidationError(
+                    {name: f"Cannot change the amounts of a {instance.status} payroll." for name in changed}
+                )
+            return super().update(instance, validated_data)
+
         base = instance.employee.salary or Decimal("0")
         allowances = validated_data.get("allowances", instance.allowances)
         deductions = validated_data.get("deductions", instance.deductions)
 
+        # Attendance deductions are recomputed while the payroll is and stays a draft
+        attendance, lines = instance.attendance_deductions, None
+        if instance.status == validated_data.get("status", instance.status) == PayrollStatus.DRAFT:
+            attendance, lines = employee_deductions(
+                instance.employee_id,
+                validated_data.get("year", instance.year),
+                validated_data.get("month", instance.month),
+            )
+            attendance, _ = cap_deductions(base + allowances - deductions, attendance)
+
         validated_data["base_salary"] = base
-        validated_data["net_salary"] = self._compute_net(base, allowances, deductions)
+        validated_data["attendance_deductions"] = attendance
+        validated_data["net_salary"] = self._compute_net(base, allowances, deductions, attendance)
+
+        with transaction.atomic():
+            payroll = super().update(instance, validated_data)
+            if lines is not None:
+                save_breakdown(payroll.id, lines)
+        return payroll
+
+
+class PayrollRunSerializer(serializers.Serializer):
+    year = serializers.IntegerField(min_value=2000, max_value=2100)
+    month = serializers.IntegerField(min_value=1, max_value=12)
+    department = serializers.PrimaryKeyRelatedField(queryset=Department.objects.all(), required=False, allow_null=True)
+    # Also recompute attendance deductions of the period's existing drafts
+    recompute_deductions = serializers.BooleanField(default=False)
+
+
+class PayrollTransitionSerializer(serializers.Serializer):
+    # Target status; the source is the one before it
+    status = serializers.ChoiceField(choices=list(PAYROLL_TRANSITIONS.values()))
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False, required=False)
+    year = serializers.IntegerField(min_value=2000, max_value=2100, required=False)
+    month = serializers.IntegerField(min_value=1, max_value=12, required=False)
+    department = serializers.IntegerField(min_value=1, required=False)
+    employee = serializers.IntegerField(min_value=1, required=False)
+
+    def validate(self, attrs):
+        if not attrs.keys() - {"status"}:
+            raise serializers.ValidationError("Pass ids or at least one of year, month, department, employee.")
+        return attrs
+
+
+class AttendanceSummaryQuerySerializer(serializers.Serializer):
+    year = serializers.IntegerField(min_value=2000, max_value=2100, required=False)
+    month = serializers.IntegerField(min_value=1, max_value=12, required=False)
+    group_by = serializers.ChoiceField(choices=["employee", "department"], default="employee")
+
+
+class AttendanceSummarySerializer(serializers.Serializer):
+    employee = serializers.IntegerField(required=False)
+    department = serializers.IntegerField(allow_null=True, required=False)
+    year = serializers.IntegerField()
+    month = serializers.IntegerField()
+    present_days = serializers.IntegerField()
+    absent_days = serializers.IntegerField()
+    late_days = serializers.IntegerField()
+    leave_days = serializers.IntegerField()
+
+
+class AttendanceFilterSerializer(serializers.Serializer):
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+    status = serializers.ChoiceField(choices=AttendanceStatus.choices, required=False)
+    employee = serializers.IntegerField(min_value=1, required=False)
+    department = serializers.IntegerField(min_value=1, required=False)
+
+    def validate(self, attrs):
+        if attrs.get("date_from") and attrs.get("date_to") and attrs["date_from"] > attrs["date_to"]:
+            raise serializers.ValidationError({"date_to": "Must not be before date_from."})
+        return attrs
+
+
+class PayrollFilterSerializer(serializers.Serializer):
+    year = serializers.IntegerField(min_value=2000, max_value=2100, required=False)
+    month = serializers.IntegerField(min_value=1, max_value=12, required=False)
+    status = serializers.ChoiceField(choices=PayrollStatus.choices, required=False)
+    employee = serializers.IntegerField(min_value=1, required=False)
+
+
+class LeaveTypeSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = LeaveType
+        fields = ["id", "name", "description", "max_days", "is_paid"]
+
+
+class LeaveRequestSerializer(serializers.ModelSerializer):
+    # Defaults to the caller's own employee profile
+    employee = serializers.PrimaryKeyRelatedField(queryset=Employee.objects.all(), required=False)
+
+    class Meta:
+        model = LeaveRequest
+        fields = [
+            "id",
+            "employee",
+            "leave_type",
+            "start_date",
+            "end_date",
+            "days",
+            "reason",
+            "status",
+            "decided_by",
+            "decided_at",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = ["id", "days", "status", "decided_by", "decided_at", "created_at", "updated_at"]
+
+    def validate(self, attrs):
+        """
+        - Employees request leave for themselves, managers within their
+          department, admins for anyone.
+        - The range must hold working days, respect the type's max_days and
+          not overlap another pending or approved request.
+        - The balance must cover it right now (approval checks again under lock).
+        """
+        principal = get_principal(self.context["request"])
+        employee = attrs.get("employee")
+        if employee is None:
+            if principal.employee_id is None:
+                raise serializers.ValidationError({"employee": "This field is required."})
+            employee = Employee.objects.only("id", "department_id").get(pk=principal.employee_id)
+            attrs["employee"] = employee
+
+        if not principal.is_admin:
+            if principal.is_manager:
+                if principal.department_id is None or employee.department_id != principal.department_id:
+                    raise serializers.ValidationError("Managers can only request leave within their department.")
+            elif employee.id != principal.employee_id:
+                raise serializers.ValidationError("Employees can only request leave for themselves.")
+
+        start, end = attrs["start_date"], attrs["end_date"]
+        if end < start:
+            raise serializers.ValidationError({"end_date": "Must not be before start_date."})
+        days = working_days(start, end)
+        if days == 0:
+            raise serializers.ValidationError({"end_date": "The range has no working days."})
+
+        leave_type = attrs["leave_type"]
+        if leave_type.max_days is not None and days > leave_type.max_days:
+            raise serializers.ValidationError(
+                {"end_date": f"{leave_type.name} allows at most {leave_type.max_days} day(s) per request."}
+            )
+        if overlapping_requests(employee.id, start, end).exists():
+            raise serializers.ValidationError({"start_date": "Overlaps another pending or approved leave request."})
+        left = current_balance(employee.id, leave_type.id)
+        if days > left:
+            raise serializers.ValidationError({"days": f"Insufficient leave balance: {left} day(s) left."})
+
+        attrs["days"] = days
+        return attrs
+
+
+class LeaveBalanceSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = LeaveBalance
+        fields = ["id", "employee", "leave_type", "allocated_days", "used_days", "balance", "updated_at"]
+
+
+class LeaveLedgerEntrySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = LeaveLedgerEntry
+        fields = [
+            "id",
+            "employee",
+            "leave_type",
+            "kind",
+            "days",
+            "balance_after",
+            "leave_request",
+            "note",
+            "created_by",
+            "created_at",
+        ]
+
+
+class LeaveAllocationSerializer(serializers.Serializer):
+    employee = serializers.PrimaryKeyRelatedField(queryset=Employee.objects.all())
+    leave_type = serializers.PrimaryKeyRelatedField(queryset=LeaveType.objects.all())
+    # Negative to withdraw days
+    days = serializers.IntegerField()
+    note = serializers.CharField(max_length=255, required=False, allow_blank=True, default="")
+
+
+class LeaveFilterSerializer(serializers.Serializer):
+    employee = serializers.IntegerField(min_value=1, required=False)
+    leave_type = serializers.IntegerField(min_value=1, required=False)
+
+
+class LeaveRequestFilterSerializer(LeaveFilterSerializer):
+    status = serializers.ChoiceField(choices=LeaveStatus.choices, required=False)
+
+
+# Columns every report row carries (hr.models.ReportRow)
+REPORT_ROW_FIELDS = ["id", "employee", "username", "first_name", "last_name", "email", "department", "department_name"]
+
+
+class EmployeeReportSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = EmployeeReport
+        fields = [*REPORT_ROW_FIELDS, "manager", "phone", "join_date", "salary"]
+
+
+class AttendanceReportSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = AttendanceReport
+        fields = [
+            *REPORT_ROW_FIELDS,
+            "year",
+            "month",
+            "present_days",
+            "absent_days",
+            "late_days",
+            "leave_days",
+            "recorded_days",
+        ]
+
+
+class PayrollReportSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = PayrollReport
+        fields = [
+            *REPORT_ROW_FIELDS,
+            "year",
+            "month",
+            "base_salary",
+            "allowances",
+            "deductions",
+            "attendance_deductions",
+            "gross_salary",
+            "net_salary",
+            "status",
+        ]
+
+
+class LeaveBalanceReportSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = LeaveBalanceReport
+        fields = [*REPORT_ROW_FIELDS, "leave_type", "leave_type_name", "is_paid", "allocated_days", "used_days", "balance"]
+
+
+class LeaveRequestReportSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = LeaveRequestReport
+        fields = [
+            *REPORT_ROW_FIELDS,
+            "leave_type",
+            "leave_type_name",
+            "is_paid",
+            "start_date",
+            "end_date",
+            "days",
+            "status",
+            "created_at",
+        ]
+
+
+class ReportFilterSerializer(serializers.Serializer):
+    employee = serializers.IntegerField(min_value=1, required=False)
+    department = serializers.IntegerField(min_value=1, required=False)
+
+
+class ReportPeriodFilterSerializer(ReportFilterSerializer):
+    year = serializers.IntegerField(min_value=2000, max_value=2100, required=False)
+    month = serializers.IntegerField(min_value=1, max_value=12, required=False)
 
-        return super().update(instance, validated_data)
\ No newline at end of file
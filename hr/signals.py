@@ -0,0 +1,67 @@
+from django.db.models.signals import post_delete, post_migrate, post_save, pre_migrate
+from django.dispatch import receiver
+
+from accounts.models import User
+from .caching import invalidate_department_cache
+from .departments import sync_department_copies
+from .models import Attendance, Department, Employee
+from .reports import create_report_views, drop_report_views
+from .rollups import apply_attendance_deltas
+
+
+@receiver(post_save, sender=Employee)
+def employee_saved(sender, instance, created, **kwargs):
+    # employee_id/department_id are access token claims; make old tokens stale
+    loaded = getattr(instance, "_loaded_department_id", None)
+    if created or loaded != instance.department_id:
+        User.bump_token_version(instance.user_id)
+        if not created:
+            # Scoping reads the department copied onto these rows
+            sync_department_copies([instance.id])
+            if Department.objects.filter(manager=instance).exists():
+                invalidate_department_cache()
+    instance._loaded_department_id = instance.department_id
+
+
+@receiver(post_delete, sender=Employee)
+def employee_deleted(sender, instance, **kwargs):
+    User.bump_token_version(instance.user_id)
+    # Departments it managed were set to manager=NULL without signals
+    invalidate_department_cache()
+
+
+@receiver(post_save, sender=Department)
+@receiver(post_delete, sender=Department)
+def department_changed(sender, instance, **kwargs):
+    invalidate_department_cache()
+
+
+@receiver(post_save, sender=Attendance)
+def attendance_saved(sender, instance, created, **kwargs):
+    current = instance.rollup_key()
+    loaded = getattr(instance, "_loaded_rollup_key", None)
+    if created:
+        apply_attendance_deltas([(*current, 1)])
+    elif loaded is not None and None not in loaded and loaded != current:
+        apply_attendance_deltas([(*loaded, -1), (*current, 1)])
+    instance._loaded_rollup_key = current
+
+
+@receiver(post_delete, sender=Attendance)
+def attendance_deleted(sender, instance, **kwargs):
+    apply_attendance_deltas([(*instance.rollup_key(), -1)])
+
+
+@receiver(pre_migrate)
+def drop_reports_before_migrating(sender, using, plan=None, **kwargs):
+    # Views pin the tables they read (SQLite rebuilds a table to alter it,
+    # Postgres refuses to retype a column a view uses); rebuilt after migrating
+    if sender.name == "hr" and plan:
+        drop_report_views(using)
+
+
+@receiver(post_migrate)
+def create_reports_after_migrating(sender, using, **kwargs):
+    if sender.name == "hr":
+        create_report_views(using)
+
@@ -10,4 +10,24 @@ class AttendanceStatus(models.TextChoices):
 class PayrollStatus(models.TextChoices):
     DRAFT = "DRAFT", "Draft"
     FINAL = "FINAL", "Final"
-    PAID = "PAID", "Paid"
\ No newline at end of file
+    PAID = "PAID", "Paid"
+
+
+# The only forward move out of each payroll status; PAID is final
+PAYROLL_TRANSITIONS = {
+    PayrollStatus.DRAFT: PayrollStatus.FINAL,
+    PayrollStatus.FINAL: PayrollStatus.PAID,
+}
+
+
+class LeaveStatus(models.TextChoices):
+    PENDING = "PENDING", "Pending"
+    APPROVED = "APPROVED", "Approved"
+    REJECTED = "REJECTED", "Rejected"
+    CANCELLED = "CANCELLED", "Cancelled"
+
+
+class LeaveLedgerKind(models.TextChoices):
+    ALLOCATION = "ALLOCATION", "Allocation"
+    USAGE = "USAGE", "Usage"
+    REVERSAL = "REVERSAL", "Reversal"
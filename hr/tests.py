@@ -398,3 +398,2199 @@ class PayrollAPITests(PaginationMixin, APITestCase):
         detail_url = reverse("payroll-detail", args=[self.p2.id])
         res = self.client.get(detail_url)
         self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+
+from unittest import mock
+from urllib.parse import urlsplit
+from hr.pagination import KeysetPagination
+
+
+class KeysetPaginationTests(PaginationMixin, APITestCase):
+    def setUp(self):
+        self.dept = Department.objects.create(name="Dept K")
+        self.admin = User.objects.create_user(
+            username="admin_ks", password="Pass12345!", role=User.Role.ADMIN, email="admin_ks@test.com"
+        )
+        self.emp_users = [
+            User.objects.create_user(username=f"emp_ks{i}", password="Pass12345!", email=f"emp_ks{i}@test.com")
+            for i in range(2)
+        ]
+        self.emps = [Employee.objects.create(user=u, department=self.dept, salary=Decimal("1000")) for u in self.emp_users]
+
+        # Two employees on the same dates so (date, created_at) ties are broken by id
+        for day in range(1, 4):
+            for emp in self.emps:
+                Attendance.objects.create(employee=emp, date=date(2025, 11, day))
+        for month in range(1, 4):
+            for emp in self.emps:
+                Payroll.objects.create(
+                    employee=emp, year=2025, month=month,
+                    base_salary=Decimal("1000"), net_salary=Decimal("1000"),
+                )
+
+        self.client.force_authenticate(user=self.admin)
+
+    def walk(self, url):
+        ids, pages = [], []
+        while url:
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertNotIn("count", res.data)
+            pages.append(res.data)
+            ids.extend(item["id"] for item in res.data["results"])
+            url = res.data["next"]
+        return ids, pages
+
+    def test_attendance_cursor_pages_match_default_ordering(self):
+        expected = list(Attendance.objects.values_list("id", flat=True))
+        with mock.patch.object(KeysetPagination, "page_size", 4):
+            ids, pages = self.walk(reverse("attendance-list") + "?cursor=")
+        self.assertEqual(ids, expected)
+        self.assertEqual(len(pages), 2)
+        self.assertIsNone(pages[0]["previous"])
+
+    def test_payroll_cursor_pages_match_default_ordering(self):
+        expected = list(Payroll.objects.values_list("id", flat=True))
+        with mock.patch.object(KeysetPagination, "page_size", 2):
+            ids, pages = self.walk(reverse("payroll-list") + "?cursor=")
+        self.assertEqual(ids, expected)
+        self.assertEqual(len(pages), 3)
+
+    def test_previous_cursor_returns_prior_page(self):
+        with mock.patch.object(KeysetPagination, "page_size", 2):
+            first = self.client.get(reverse("attendance-list") + "?cursor=").data
+            second = self.client.get(first["next"]).data
+            back = self.client.get(second["previous"]).data
+        self.assertEqual(
+            [item["id"] for item in back["results"]],
+            [item["id"] for item in first["results"]],
+        )
+        self.assertIsNone(back["previous"])
+        self.assertIn("cursor=", urlsplit(back["next"]).query)
+
+    def test_invalid_cursor_is_not_found(self):
+        res = self.client.get(reverse("attendance-list") + "?cursor=not-a-cursor")
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_page_number_pagination_is_still_default(self):
+        res = self.client.get(reverse("attendance-list"))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["count"], 6)
+
+
+class AttendanceBulkIngestTests(APITestCase):
+    def setUp(self):
+        self.dept_a = Department.objects.create(name="Dept A")
+        self.dept_b = Department.objects.create(name="Dept B")
+
+        self.admin = User.objects.create_user(
+            username="admin_bulk", password="Pass12345!", role=User.Role.ADMIN, email="admin_bulk@test.com"
+        )
+        self.manager_user = User.objects.create_user(
+            username="mgr_bulk", password="Pass12345!", role=User.Role.MANAGER, email="mgr_bulk@test.com"
+        )
+        self.employee_user = User.objects.create_user(
+            username="emp_bulk", password="Pass12345!", role=User.Role.EMPLOYEE, email="emp_bulk@test.com"
+        )
+        self.other_user = User.objects.create_user(
+            username="emp2_bulk", password="Pass12345!", role=User.Role.EMPLOYEE, email="emp2_bulk@test.com"
+        )
+
+        self.manager_emp = Employee.objects.create(user=self.manager_user, department=self.dept_a)
+        self.emp_a = Employee.objects.create(user=self.employee_user, department=self.dept_a)
+        self.emp_b = Employee.objects.create(user=self.other_user, department=self.dept_b)
+
+        self.existing = Attendance.objects.create(employee=self.emp_a, date=date(2025, 12, 1), status="PRESENT")
+        self.url = reverse("attendance-bulk")
+
+    def test_json_array_upserts_on_employee_and_date(self):
+        self.client.force_authenticate(user=self.admin)
+        payload = [
+            {"employee": self.emp_a.id, "date": "2025-12-01", "status": "LATE", "note": "badge"},
+            {"employee": self.emp_b.id, "date": "2025-12-01", "status": "ABSENT"},
+        ]
+        res = self.client.post(self.url, payload, format="json")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual((res.data["created"], res.data["updated"], res.data["failed"]), (1, 1, 0))
+        self.assertEqual([r["result"] for r in res.data["results"]], ["updated", "created"])
+
+        self.existing.refresh_from_db()
+        self.assertEqual(self.existing.status, "LATE")
+        self.assertEqual(self.existing.note, "badge")
+        self.assertEqual(Attendance.objects.count(), 2)
+
+    def test_ndjson_body_reports_bad_rows(self):
+        self.client.force_authenticate(user=self.admin)
+        body = "\n".join([
+            f'{{"employee": {self.emp_a.id}, "date": "2025-12-02"}}',
+            "{not json",
+            f'{{"employee": {self.emp_a.id}, "date": "2025-12-02", "status": "LATE"}}',
+            '{"employee": 999999, "date": "2025-12-02"}',
+            f'{{"employee": {self.emp_b.id}, "date": "2025-12-02", "status": "NOPE"}}',
+        ])
+        res = self.client.post(self.url, body, content_type="application/x-ndjson")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [r["result"] for r in res.data["results"]],
+            ["created", "error", "error", "error", "error"],
+        )
+        self.assertIn("employee", res.data["results"][3]["errors"])
+        self.assertIn("status", res.data["results"][4]["errors"])
+        self.assertTrue(Attendance.objects.filter(employee=self.emp_a, date=date(2025, 12, 2)).exists())
+
+    def test_csv_body(self):
+        self.client.force_authenticate(user=self.admin)
+        body = (
+            "employee,date,status,note\n"
+            f"{self.emp_a.id},2025-12-03,ABSENT,\n"
+            f"{self.emp_b.id},2025-12-03,,sick\n"
+        )
+        res = self.client.post(self.url, body, content_type="text/csv")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["created"], 2)
+        self.assertEqual(Attendance.objects.get(employee=self.emp_b, date=date(2025, 12, 3)).status, "PRESENT")
+
+    def test_manager_rows_outside_department_are_rejected(self):
+        self.client.force_authenticate(user=self.manager_user)
+        payload = [
+            {"employee": self.emp_a.id, "date": "2025-12-04"},
+            {"employee": self.emp_b.id, "date": "2025-12-04"},
+        ]
+        res = self.client.post(self.url, payload, format="json")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([r["result"] for r in res.data["results"]], ["created", "error"])
+        self.assertFalse(Attendance.objects.filter(employee=self.emp_b, date=date(2025, 12, 4)).exists())
+
+    def test_employee_cannot_bulk_ingest(self):
+        self.client.force_authenticate(user=self.employee_user)
+        res = self.client.post(self.url, [], format="json")
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_object_body_rejected(self):
+        self.client.force_authenticate(user=self.admin)
+        res = self.client.post(self.url, {"employee": self.emp_a.id}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        for body in ("5", '"rows"', "null", ""):
+            res = self.client.post(self.url, body, content_type="application/json")
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST, body)
+
+
+from io import StringIO
+from django.core.management import call_command
+
+
+class PayrollRunTests(APITestCase):
+    def setUp(self):
+        self.dept_a = Department.objects.create(name="Dept A")
+        self.dept_b = Department.objects.create(name="Dept B")
+
+        self.admin = User.objects.create_user(
+            username="admin_run", password="Pass12345!", role=User.Role.ADMIN, email="admin_run@test.com"
+        )
+        self.manager_user = User.objects.create_user(
+            username="mgr_run", password="Pass12345!", role=User.Role.MANAGER, email="mgr_run@test.com"
+        )
+        users = [
+            User.objects.create_user(username=f"emp_run{i}", password="Pass12345!", email=f"emp_run{i}@test.com")
+            for i in range(4)
+        ]
+        self.manager_emp = Employee.objects.create(user=self.manager_user, department=self.dept_a, salary=Decimal("5000"))
+        self.emp_a = Employee.objects.create(user=users[0], department=self.dept_a, salary=Decimal("3000"))
+        self.emp_b = Employee.objects.create(user=users[1], department=self.dept_b, salary=Decimal("4000"))
+        self.emp_no_salary = Employee.objects.create(user=users[2], department=self.dept_a)
+        self.emp_paid = Employee.objects.create(user=users[3], department=self.dept_b, salary=Decimal("2000"))
+
+        self.existing = Payroll.objects.create(
+            employee=self.emp_paid, year=2026, month=1,
+            base_salary=Decimal("1500"), net_salary=Decimal("1500"), status=PayrollStatus.PAID,
+        )
+        self.url = reverse("payroll-run")
+
+    def test_admin_run_creates_missing_drafts_from_salary(self):
+        self.client.force_authenticate(user=self.admin)
+        res = self.client.post(self.url, {"year": 2026, "month": 1}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["created"], 3)
+        self.assertEqual(res.data["skipped"], 1)
+        self.assertEqual(res.data["failed"], [{"employee": self.emp_no_salary.id, "error": "Employee has no salary."}])
+
+        payroll = Payroll.objects.get(employee=self.emp_b, year=2026, month=1)
+        self.assertEqual(payroll.base_salary, Decimal("4000"))
+        self.assertEqual(payroll.net_salary, Decimal("4000"))
+        self.assertEqual(payroll.status, PayrollStatus.DRAFT)
+
+        # The existing PAID payroll is left alone
+        self.existing.refresh_from_db()
+        self.assertEqual(self.existing.base_salary, Decimal("1500"))
+        self.assertEqual(self.existing.status, PayrollStatus.PAID)
+
+    def test_run_is_idempotent(self):
+        self.client.force_authenticate(user=self.admin)
+        self.client.post(self.url, {"year": 2026, "month": 2}, format="json")
+        res = self.client.post(self.url, {"year": 2026, "month": 2}, format="json")
+        self.assertEqual(res.data["created"], 0)
+        self.assertEqual(Payroll.objects.filter(year=2026, month=2).count(), 4)
+
+    def test_run_limited_to_department(self):
+        self.client.force_authenticate(user=self.admin)
+        res = self.client.post(self.url, {"year": 2026, "month": 3, "department": self.dept_b.id}, format="json")
+        self.assertEqual(res.data["created"], 2)
+        self.assertEqual(
+            set(Payroll.objects.filter(year=2026, month=3).values_list("employee_id", flat=True)),
+            {self.emp_b.id, self.emp_paid.id},
+        )
+
+    def test_manager_cannot_run_payroll(self):
+        self.client.force_authenticate(user=self.manager_user)
+        res = self.client.post(self.url, {"year": 2026, "month": 1}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_invalid_month_rejected(self):
+        self.client.force_authenticate(user=self.admin)
+        res = self.client.post(self.url, {"year": 2026, "month": 13}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_management_command_reports_progress(self):
+        out, err = StringIO(), StringIO()
+        call_command("run_payroll", year=2026, month=4, batch_size=2, stdout=out, stderr=err)
+        self.assertIn("2/4 employees processed", out.getvalue())
+        self.assertIn("4 created", out.getvalue())
+        self.assertIn(f"employee {self.emp_no_salary.id}", err.getvalue())
+
+
+import accounts.principal
+
+
+class PrincipalQueryTests(APITestCase):
+    def setUp(self):
+        self.dept = Department.objects.create(name="Dept P")
+        manager = User.objects.create_user(
+            username="mgr_p", password="Pass12345!", role=User.Role.MANAGER, email="mgr_p@test.com"
+        )
+        employee = User.objects.create_user(username="emp_p", password="Pass12345!", email="emp_p@test.com")
+        self.manager_emp = Employee.objects.create(user=manager, department=self.dept)
+        self.emp = Employee.objects.create(user=employee, department=self.dept)
+        Attendance.objects.create(employee=self.emp, date=date(2025, 12, 1))
+
+        # Fresh instance: nothing cached on the user, like a token-authenticated request
+        self.manager = User.objects.get(pk=manager.pk)
+        self.client.force_authenticate(user=self.manager)
+
+    def count_identity_lookups(self):
+        return mock.patch.object(
+            accounts.principal, "_load_employee", wraps=accounts.principal._load_employee
+        )
+
+    def test_scoped_list_resolves_identity_once(self):
+        with self.count_identity_lookups() as lookup, self.assertNumQueries(3):
+            # identity + count + page
+            res = self.client.get(reverse("attendance-list"))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(lookup.call_count, 1)
+
+    def test_create_shares_identity_between_permission_and_serializer(self):
+        payload = {"employee": self.emp.id, "date": "2025-12-02", "status": "LATE"}
+        with self.count_identity_lookups() as lookup:
+            res = self.client.post(reverse("attendance-list"), payload, format="json")
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(lookup.call_count, 1)
+
+    def test_role_only_check_does_not_resolve_employee(self):
+        with self.count_identity_lookups() as lookup:
+            res = self.client.post(reverse("payroll-run"), {"year": 2026, "month": 1}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(lookup.call_count, 0)
+
+
+from hr.models import AttendanceMonthlySummary
+
+
+class AttendanceRollupTests(PaginationMixin, APITestCase):
+    def setUp(self):
+        self.dept_a = Department.objects.create(name="Dept A")
+        self.dept_b = Department.objects.create(name="Dept B")
+        self.admin = User.objects.create_user(
+            username="admin_roll", password="Pass12345!", role=User.Role.ADMIN, email="admin_roll@test.com"
+        )
+        self.manager_user = User.objects.create_user(
+            username="mgr_roll", password="Pass12345!", role=User.Role.MANAGER, email="mgr_roll@test.com"
+        )
+        emp_users = [
+            User.objects.create_user(username=f"emp_roll{i}", password="Pass12345!", email=f"emp_roll{i}@test.com")
+            for i in range(3)
+        ]
+        self.manager_emp = Employee.objects.create(user=self.manager_user, department=self.dept_a)
+        self.emp_a1 = Employee.objects.create(user=emp_users[0], department=self.dept_a)
+        self.emp_a2 = Employee.objects.create(user=emp_users[1], department=self.dept_a)
+        self.emp_b = Employee.objects.create(user=emp_users[2], department=self.dept_b)
+        self.summary_url = reverse("attendance-summary")
+
+    def counts(self, employee, year=2025, month=12):
+        summary = AttendanceMonthlySummary.objects.get(employee=employee, year=year, month=month)
+        return (summary.present_days, summary.absent_days, summary.late_days, summary.leave_days)
+
+    def test_create_and_update_maintain_rollup(self):
+        self.client.force_authenticate(user=self.admin)
+        res = self.client.post(
+            reverse("attendance-list"), {"employee": self.emp_a1.id, "date": "2025-12-01", "status": "LATE"}, format="json"
+        )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.client.post(
+            reverse("attendance-list"), {"employee": self.emp_a1.id, "date": "2025-12-02", "status": "ABSENT"}, format="json"
+        )
+        self.assertEqual(self.counts(self.emp_a1), (0, 1, 1, 0))
+
+        res = self.client.patch(reverse("attendance-detail", args=[res.data["id"]]), {"status": "PRESENT"}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.counts(self.emp_a1), (1, 1, 0, 0))
+
+        # moving a record to another month moves its count too
+        self.client.patch(reverse("attendance-detail", args=[res.data["id"]]), {"date": "2026-01-05"}, format="json")
+        self.assertEqual(self.counts(self.emp_a1), (0, 1, 0, 0))
+        self.assertEqual(self.counts(self.emp_a1, 2026, 1), (1, 0, 0, 0))
+
+    def test_bulk_ingest_maintains_rollup(self):
+        Attendance.objects.create(employee=self.emp_a1, date=date(2025, 12, 1), status="PRESENT")
+        self.client.force_authenticate(user=self.admin)
+        self.client.post(reverse("attendance-list"), {"employee": self.emp_a2.id, "date": "2025-12-01"}, format="json")
+
+        payload = [
+            {"employee": self.emp_a2.id, "date": "2025-12-01", "status": "LEAVE"},
+            {"employee": self.emp_a2.id, "date": "2025-12-02", "status": "LEAVE"},
+            {"employee": self.emp_b.id, "date": "2025-12-02", "status": "ABSENT"},
+        ]
+        self.client.post(reverse("attendance-bulk"), payload, format="json")
+        self.assertEqual(self.counts(self.emp_a2), (0, 0, 0, 2))
+        self.assertEqual(self.counts(self.emp_b), (0, 1, 0, 0))
+
+    def test_rebuild_command_matches_attendance(self):
+        Attendance.objects.create(employee=self.emp_a1, date=date(2025, 12, 1), status="PRESENT")
+        Attendance.objects.create(employee=self.emp_a1, date=date(2025, 12, 2), status="LATE")
+        Attendance.objects.create(employee=self.emp_b, date=date(2025, 11, 30), status="ABSENT")
+        AttendanceMonthlySummary.objects.create(employee=self.emp_a2, year=2025, month=12, present_days=9)
+
+        call_command("rebuild_attendance_rollups", stdout=StringIO())
+        self.assertEqual(self.counts(self.emp_a1), (1, 0, 1, 0))
+        self.assertEqual(self.counts(self.emp_b, 2025, 11), (0, 1, 0, 0))
+        self.assertFalse(AttendanceMonthlySummary.objects.filter(employee=self.emp_a2).exists())
+
+    def test_summary_is_scoped_and_grouped(self):
+        AttendanceMonthlySummary.objects.create(employee=self.emp_a1, year=2025, month=12, present_days=3, late_days=1)
+        AttendanceMonthlySummary.objects.create(employee=self.emp_a2, year=2025, month=12, present_days=2, absent_days=2)
+        AttendanceMonthlySummary.objects.create(employee=self.emp_b, year=2025, month=12, leave_days=5)
+
+        self.client.force_authenticate(user=self.manager_user)
+        res = self.client.get(self.summary_url, {"year": 2025, "month": 12})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual({row["employee"] for row in self.results(res)}, {self.emp_a1.id, self.emp_a2.id})
+
+        res = self.client.get(self.summary_url, {"year": 2025, "month": 12, "group_by": "department"})
+        rows = self.results(res)
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["department"], self.dept_a.id)
+        self.assertEqual(
+            (rows[0]["present_days"], rows[0]["absent_days"], rows[0]["late_days"], rows[0]["leave_days"]),
+            (5, 2, 1, 0),
+        )
+
+    def test_summary_rejects_bad_grouping(self):
+        self.client.force_authenticate(user=self.admin)
+        res = self.client.get(self.summary_url, {"group_by": "team"})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+import csv
+import json
+from django.http import StreamingHttpResponse
+
+
+class ExportTests(APITestCase):
+    def setUp(self):
+        self.dept_a = Department.objects.create(name="Dept A")
+        self.dept_b = Department.objects.create(name="Dept B")
+        self.admin = User.objects.create_user(
+            username="admin_exp", password="Pass12345!", role=User.Role.ADMIN, email="admin_exp@test.com"
+        )
+        self.manager_user = User.objects.create_user(
+            username="mgr_exp", password="Pass12345!", role=User.Role.MANAGER, email="mgr_exp@test.com"
+        )
+        u1 = User.objects.create_user(username="emp_exp1", password="Pass12345!", email="emp_exp1@test.com")
+        u2 = User.objects.create_user(username="emp_exp2", password="Pass12345!", email="emp_exp2@test.com")
+        self.manager_emp = Employee.objects.create(user=self.manager_user, department=self.dept_a)
+        self.emp_a = Employee.objects.create(user=u1, department=self.dept_a, salary=Decimal("1000"))
+        self.emp_b = Employee.objects.create(user=u2, department=self.dept_b, salary=Decimal("2000"))
+
+        self.a1 = Attendance.objects.create(employee=self.emp_a, date=date(2025, 12, 1), status="LATE", note="train, delayed")
+        Attendance.objects.create(employee=self.emp_b, date=date(2025, 12, 1), status="ABSENT")
+        self.p1 = Payroll.objects.create(
+            employee=self.emp_a, year=2025, month=12,
+            base_salary=Decimal("1000"), net_salary=Decimal("1000"),
+        )
+        Payroll.objects.create(
+            employee=self.emp_b, year=2025, month=12,
+            base_salary=Decimal("2000"), net_salary=Decimal("2000"),
+        )
+
+    def content(self, res):
+        self.assertIsInstance(res, StreamingHttpResponse)
+        return b"".join(res.streaming_content).decode()
+
+    def test_attendance_csv_export_is_scoped(self):
+        self.client.force_authenticate(user=self.manager_user)
+        res = self.client.get(reverse("attendance-export"))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res["Content-Type"], "text/csv")
+
+        rows = list(csv.DictReader(StringIO(self.content(res))))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["id"], str(self.a1.id))
+        self.assertEqual(rows[0]["note"], "train, delayed")
+        self.assertEqual(rows[0]["date"], "2025-12-01")
+
+    def test_payroll_ndjson_export_matches_api_values(self):
+        self.client.force_authenticate(user=self.admin)
+        res = self.client.get(reverse("payroll-export"), {"output": "ndjson"})
+        self.assertEqual(res["Content-Type"], "application/x-ndjson")
+
+        records = [json.loads(line) for line in self.content(res).splitlines()]
+        self.assertEqual(len(records), 2)
+        detail = self.client.get(reverse("payroll-detail", args=[self.p1.id])).data
+        exported = next(r for r in records if r["id"] == self.p1.id)
+        self.assertEqual(exported, dict(detail))
+
+    def test_employee_export_sees_self_only(self):
+        self.client.force_authenticate(user=self.emp_a.user)
+        res = self.client.get(reverse("payroll-export"), {"output": "ndjson"})
+        records = [json.loads(line) for line in self.content(res).splitlines()]
+        self.assertEqual([r["employee"] for r in records], [self.emp_a.id])
+
+    def test_unknown_output_rejected(self):
+        self.client.force_authenticate(user=self.admin)
+        res = self.client.get(reverse("attendance-export"), {"output": "xml"})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class OrgChartTests(PaginationMixin, APITestCase):
+    def setUp(self):
+        self.dept_a = Department.objects.create(name="Dept A")
+        self.dept_b = Department.objects.create(name="Dept B")
+        self.admin = User.objects.create_user(
+            username="admin_org", password="Pass12345!", role=User.Role.ADMIN, email="admin_org@test.com"
+        )
+
+        def employee(name, department, manager=None, role=User.Role.MANAGER):
+            user = User.objects.create_user(username=name, password="Pass12345!", role=role, email=f"{name}@test.com")
+            return Employee.objects.create(user=user, department=department, manager=manager)
+
+        # ceo -> vp -> lead -> dev ; vp -> ops (other department)
+        self.ceo = employee("ceo", self.dept_a)
+        self.vp = employee("vp", self.dept_a, self.ceo)
+        self.lead = employee("lead", self.dept_a, self.vp)
+        self.dev = employee("dev", self.dept_a, self.lead, role=User.Role.EMPLOYEE)
+        self.ops = employee("ops", self.dept_b, self.vp, role=User.Role.EMPLOYEE)
+
+    def test_reports_return_whole_subtree_with_depth(self):
+        self.client.force_authenticate(user=self.admin)
+        with self.assertNumQueries(3):
+            # root lookup + one recursive CTE for the subtree + one query for the page
+            res = self.client.get(reverse("employee-reports", args=[self.ceo.id]))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        depths = {item["id"]: item["depth"] for item in self.results(res)}
+        self.assertEqual(depths, {self.vp.id: 1, self.lead.id: 2, self.ops.id: 2, self.dev.id: 3})
+
+    def test_manager_reports_limited_to_department(self):
+        self.client.force_authenticate(user=self.vp.user)
+        res = self.client.get(reverse("employee-reports", args=[self.vp.id]))
+        ids = {item["id"] for item in self.results(res)}
+        self.assertEqual(ids, {self.lead.id, self.dev.id})
+
+    def test_chain_lists_managers_nearest_first(self):
+        self.client.force_authenticate(user=self.admin)
+        res = self.client.get(reverse("employee-chain", args=[self.dev.id]))
+        self.assertEqual(
+            [(item["id"], item["depth"]) for item in res.data],
+            [(self.lead.id, 1), (self.vp.id, 2), (self.ceo.id, 3)],
+        )
+
+    def test_depth(self):
+        self.client.force_authenticate(user=self.admin)
+        res = self.client.get(reverse("employee-depth", args=[self.vp.id]))
+        self.assertEqual(res.data, {"employee": self.vp.id, "depth": 1, "reports": 3, "max_report_depth": 2})
+
+    def test_manager_depth_limited_to_department(self):
+        self.ops.manager = None
+        self.ops.save()
+        self.dev.manager = self.vp
+        self.dev.save()
+        Employee.objects.create(
+            user=User.objects.create_user(username="ops_dev", password="Pass12345!", email="ops_dev@test.com"),
+            department=self.dept_b,
+            manager=self.lead,
+        )
+        self.client.force_authenticate(user=self.vp.user)
+        res = self.client.get(reverse("employee-depth", args=[self.vp.id]))
+        self.assertEqual(res.data, {"employee": self.vp.id, "depth": 1, "reports": 2, "max_report_depth": 1})
+        self.assertEqual(res.data["reports"], len(self.results(self.client.get(reverse("employee-reports", args=[self.vp.id])))))
+
+    def test_indirect_cycle_rejected(self):
+        self.client.force_authenticate(user=self.admin)
+        res = self.client.patch(reverse("employee-detail", args=[self.ceo.id]), {"manager": self.lead.id}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("manager", res.data)
+
+    def test_non_cyclic_reassignment_allowed(self):
+        self.client.force_authenticate(user=self.admin)
+        res = self.client.patch(reverse("employee-detail", args=[self.lead.id]), {"manager": self.ceo.id}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+
+from rest_framework.renderers import JSONRenderer
+from hr.fastpath import values_serializer_for
+from hr.serializers import AttendanceSerializer, DepartmentSerializer, EmployeeSerializer, PayrollSerializer
+
+
+class ValuesSerializerParityTests(APITestCase):
+    def setUp(self):
+        self.dept = Department.objects.create(name="Dept Ä", location=None)
+        Department.objects.create(name="Dept Empty", location="Floor 9")
+        manager = User.objects.create_user(
+            username="mgr_fast", password="Pass12345!", role=User.Role.MANAGER, email="mgr_fast@test.com"
+        )
+        self.admin = User.objects.create_user(
+            username="admin_fast", password="Pass12345!", role=User.Role.ADMIN, email="admin_fast@test.com"
+        )
+        employee = User.objects.create_user(username="emp_fast", password="Pass12345!", email=None)
+        self.manager_emp = Employee.objects.create(
+            user=manager, department=self.dept, salary=Decimal("12345.6"), join_date=date(2024, 2, 29)
+        )
+        self.emp = Employee.objects.create(user=employee, manager=self.manager_emp, phone="+20 100")
+        self.dept.manager = self.manager_emp
+        self.dept.save()
+
+        Attendance.objects.create(employee=self.emp, date=date(2025, 12, 1), status="LATE", note="ü")
+        Attendance.objects.create(employee=self.manager_emp, date=date(2025, 12, 1))
+        Payroll.objects.create(
+            employee=self.emp, year=2025, month=12, base_salary=Decimal("0"),
+            allowances=Decimal("10.5"), net_salary=Decimal("10.50"),
+        )
+
+    def assert_parity(self, serializer_class, queryset):
+        expected = JSONRenderer().render(serializer_class(queryset, many=True).data)
+        values = values_serializer_for(serializer_class)
+        actual = JSONRenderer().render(values.to_representation(queryset.values(*values.columns)))
+        self.assertEqual(actual, expected)
+
+    def test_department_parity(self):
+        self.assert_parity(DepartmentSerializer, Department.objects.order_by("id"))
+
+    def test_employee_parity(self):
+        self.assert_parity(EmployeeSerializer, Employee.objects.order_by("id"))
+
+    def test_attendance_parity(self):
+        self.assert_parity(AttendanceSerializer, Attendance.objects.all())
+
+    def test_payroll_parity(self):
+        self.assert_parity(PayrollSerializer, Payroll.objects.all())
+
+    def test_list_endpoint_matches_serializer_output(self):
+        self.client.force_authenticate(user=self.admin)
+        res = self.client.get(reverse("employee-list"))
+        expected = JSONRenderer().render(EmployeeSerializer(Employee.objects.order_by("id"), many=True).data)
+        self.assertEqual(JSONRenderer().render(res.data["results"]), expected)
+
+
+import tempfile
+from django.core.management.base import CommandError
+from hr import benchmark
+from hr.seed import seed_hr_data
+
+
+class SeedAndBenchmarkTests(APITestCase):
+    def seed(self, **kwargs):
+        options = {"departments": 2, "employees": 12, "years": 1, "span": 2, "end": date(2025, 2, 10)}
+        options.update(kwargs)
+        return seed_hr_data(**options)
+
+    def test_seed_builds_tree_and_history(self):
+        result = self.seed()
+        self.assertEqual((result["first_day"], result["last_day"]), (date(2024, 2, 1), date(2025, 1, 31)))
+
+        employees = Employee.objects.select_related("user")
+        root = employees.get(manager__isnull=True)
+        self.assertEqual(root.user.role, User.Role.ADMIN)
+        for department in Department.objects.all():
+            self.assertEqual(department.manager.manager_id, root.id)
+            self.assertEqual(department.manager.department_id, department.id)
+        for employee in employees.exclude(id=root.id):
+            self.assertLessEqual(employee.subordinates.count(), 2)
+            heads = Department.objects.filter(manager=employee).exists()
+            expected = User.Role.MANAGER if heads or employee.subordinates.exists() else User.Role.EMPLOYEE
+            self.assertEqual(employee.user.role, expected)
+
+        weekdays = Attendance.objects.filter(employee=root).count()
+        self.assertEqual(weekdays, 262)
+        self.assertEqual(result["attendance"], 12 * weekdays)
+        self.assertEqual(Attendance.objects.count(), result["attendance"])
+        self.assertEqual(Payroll.objects.count(), 12 * 12)
+        self.assertEqual(Payroll.objects.filter(status=PayrollStatus.DRAFT, year=2025, month=1).count(), 12)
+        self.assertEqual(
+            sum(AttendanceMonthlySummary.objects.values_list("present_days", flat=True)),
+            Attendance.objects.filter(status=AttendanceStatus.PRESENT).count(),
+        )
+
+    def test_single_member_department_heads_are_managers(self):
+        # Five members over three departments: the last one has a head and nobody else
+        self.seed(departments=3, employees=6)
+        heads = [department.manager for department in Department.objects.select_related("manager__user")]
+        self.assertEqual({head.user.role for head in heads}, {User.Role.MANAGER})
+        self.assertTrue(any(not head.subordinates.exists() for head in heads))
+
+    def test_seed_rejects_taken_prefix(self):
+        self.seed()
+        with self.assertRaises(ValueError):
+            self.seed()
+
+    def test_benchmark_covers_every_get_route_per_role(self):
+        self.seed(years=1)
+        report = benchmark.run_benchmark(iterations=2, warmup=0)
+
+        self.assertEqual(report["meta"]["data"]["employees"], 12)
+        seen = {(r["route"], r["role"]) for r in report["results"]}
+        names = {name for name, _ in benchmark.get_routes()}
+        self.assertEqual(seen, {(name, role) for name in names for role in benchmark.ROLES})
+        self.assertNotIn("attendance-bulk", names)
+        self.assertNotIn("token_obtain_pair", names)
+        for result in report["results"]:
+            expected = status.HTTP_403_FORBIDDEN if result["route"] in ("list-users", "list-users-export") and result["role"] != User.Role.ADMIN else status.HTTP_200_OK
+            self.assertEqual(result["status"], expected, result["route"])
+            self.assertLessEqual(result["latency_ms"]["p50"], result["latency_ms"]["p99"])
+        # Measured requests are rolled back and leave nothing behind
+        self.assertEqual(Attendance.objects.count(), 12 * 262)
+
+    def test_benchmark_command_writes_json_and_reports_regressions(self):
+        self.seed()
+        with tempfile.NamedTemporaryFile("w+", suffix=".json") as fh:
+            call_command("benchmark_api", iterations=1, warmup=0, route=["me"], output=fh.name, stderr=StringIO())
+            report = json.load(fh)
+        self.assertEqual({r["route"] for r in report["results"]}, {"me"})
+
+        slower = json.loads(json.dumps(report))
+        slower["results"][0]["latency_ms"]["p50"] = report["results"][0]["latency_ms"]["p50"] * 2 + 1
+        slower["results"][0]["queries"] += 1
+        regressions = benchmark.compare(report, slower)
+        self.assertEqual(len(regressions), 1)
+        self.assertEqual(set(regressions[0]["changes"]), {"p50_ms", "queries"})
+        self.assertEqual(benchmark.compare(slower, report), [])
+
+
+from core import metrics
+from hr.fastpath import ValuesSerializer
+
+
+class RequestMetricsTests(APITestCase):
+    def setUp(self):
+        metrics.route_samples.clear()
+        self.addCleanup(metrics.route_samples.clear)
+        self.admin = User.objects.create_user(
+            username="admin_metrics", password="Pass12345!", role=User.Role.ADMIN, email="admin_metrics@test.com"
+        )
+        self.dept = Department.objects.create(name="Metrics Dept")
+        self.client.force_authenticate(user=self.admin)
+
+    def add_employees(self, count):
+        for _ in range(count):
+            n = Employee.objects.count()
+            user = User.objects.create_user(
+                username=f"metrics_emp{n}", password="Pass12345!", email=f"metrics_emp{n}@test.com"
+            )
+            Employee.objects.create(user=user, department=self.dept)
+
+    def log_records(self, logs):
+        return [json.loads(record.getMessage()) for record in logs.records if record.levelname == "INFO"]
+
+    def test_server_timing_and_log_line(self):
+        self.add_employees(2)
+        with self.assertLogs("hrms.requests", "INFO") as logs:
+            res = self.client.get(reverse("employee-list"))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        (record,) = self.log_records(logs)
+        self.assertEqual(record["route"], "api/employees/")
+        self.assertEqual(record["role"], User.Role.ADMIN)
+        self.assertEqual(record["results"], 2)
+        self.assertEqual(record["queries"], 2)
+        self.assertIn("serialize_ms", record)
+        self.assertEqual(record["duplicates"], [])
+
+        timing = res["Server-Timing"]
+        self.assertIn('db;dur=', timing)
+        self.assertIn('desc="2 queries"', timing)
+        self.assertIn("serialize;dur=", timing)
+        self.assertIn("total;dur=", timing)
+
+    def test_streamed_response_is_logged_after_the_body(self):
+        Attendance.objects.create(employee=Employee.objects.create(
+            user=User.objects.create_user(username="metrics_stream", password="Pass12345!", email="ms@test.com"), department=self.dept,
+        ), date=date(2026, 1, 5))
+        with self.assertLogs("hrms.requests", "INFO") as logs:
+            res = self.client.get(reverse("attendance-export"))
+            self.assertEqual(self.log_records(logs), [])
+            b"".join(res.streaming_content)
+        (record,) = self.log_records(logs)
+        self.assertEqual(record["route"], "api/attendance/export/")
+        self.assertGreaterEqual(record["queries"], 1)
+
+    def test_query_per_row_is_flagged(self):
+        original = ValuesSerializer.to_representation
+
+        def one_query_per_row(serializer, rows):
+            rows = list(rows)
+            for row in rows:
+                Employee.objects.filter(id=row["id"]).exists()
+            return original(serializer, rows)
+
+        self.add_employees(2)
+        with mock.patch.object(ValuesSerializer, "to_representation", one_query_per_row):
+            with self.assertLogs("hrms.requests", "INFO") as logs:
+                self.client.get(reverse("employee-list"))
+                self.add_employees(4)
+                self.client.get(reverse("employee-list"))
+                self.client.get(reverse("employee-list"))
+
+        warnings = [r.getMessage() for r in logs.records if r.levelname == "WARNING"]
+        self.assertEqual(len(warnings), 1)
+        self.assertIn("api/employees/", warnings[0])
+        self.assertEqual(self.log_records(logs)[-1]["duplicates"][0]["count"], 6)
+
+    def test_constant_query_count_is_not_flagged(self):
+        self.assertFalse(metrics.route_samples.record(("GET", "r", None), 3, 2))
+        self.assertFalse(metrics.route_samples.record(("GET", "r", None), 20, 3))
+        self.assertFalse(metrics.route_samples.record(("GET", "r", None), 0, 9))
+        self.assertTrue(metrics.route_samples.record(("GET", "r", None), 10, 7))
+
+    def test_fingerprint_folds_placeholder_lists(self):
+        self.assertEqual(
+            metrics.fingerprint('SELECT 1 FROM t WHERE id IN (%s, %s,%s)'),
+            metrics.fingerprint('SELECT  1 FROM t\nWHERE id IN (%s, %s)'),
+        )
+        self.assertEqual(
+            metrics.fingerprint("INSERT INTO t VALUES (%s, %s), (%s, %s), (%s, %s)"),
+            "INSERT INTO t VALUES (...)",
+        )
+
+
+from django.core.cache import cache
+from accounts.serializers import CustomTokenObtainPairSerializer
+
+
+class DepartmentCacheTests(PaginationMixin, APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_user(
+            username="admin_cache", password="Pass12345!", role=User.Role.ADMIN, email="admin_cache@test.com"
+        )
+        self.manager = User.objects.create_user(
+            username="manager_cache", password="Pass12345!", role=User.Role.MANAGER, email="manager_cache@test.com"
+        )
+        self.dept_a = Department.objects.create(name="Cache A")
+        self.dept_b = Department.objects.create(name="Cache B")
+        self.manager_emp = Employee.objects.create(user=self.manager, department=self.dept_a)
+        self.dept_a.manager = self.manager_emp
+        self.dept_a.save()
+
+    def auth_as(self, user):
+        # As a fresh login would: current token_version and employee claims
+        user.refresh_from_db()
+        token = CustomTokenObtainPairSerializer.get_token(user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def test_repeat_reads_do_not_touch_the_database(self):
+        self.auth_as(self.manager)
+        list_url, detail_url = reverse("department-list"), reverse("department-detail", args=[self.dept_a.id])
+        first_list, first_detail = self.client.get(list_url), self.client.get(detail_url)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(list_url)
+            detail = self.client.get(detail_url)
+        self.assertEqual(res.data, first_list.data)
+        self.assertEqual(detail.data, first_detail.data)
+        self.assertEqual([d["id"] for d in self.results(res)], [self.dept_a.id])
+
+    def test_entries_are_scoped_by_role_and_department(self):
+        self.auth_as(self.admin)
+        self.assertEqual(len(self.results(self.client.get(reverse("department-list")))), 2)
+
+        self.auth_as(self.manager)
+        res = self.client.get(reverse("department-list"))
+        self.assertEqual([d["id"] for d in self.results(res)], [self.dept_a.id])
+        res = self.client.get(reverse("department-detail", args=[self.dept_b.id]))
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_department_writes_invalidate(self):
+        self.auth_as(self.admin)
+        url = reverse("department-detail", args=[self.dept_b.id])
+        self.client.get(url)
+        self.client.get(reverse("department-list"))
+
+        res = self.client.patch(url, {"name": "Cache B2"}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.get(url).data["name"], "Cache B2")
+
+        Department.objects.create(name="Cache C")
+        names = {d["name"] for d in self.results(self.client.get(reverse("department-list")))}
+        self.assertEqual(names, {"Cache A", "Cache B2", "Cache C"})
+
+    def test_deleting_the_manager_invalidates(self):
+        self.auth_as(self.admin)
+        url = reverse("department-detail", args=[self.dept_a.id])
+        self.assertEqual(self.client.get(url).data["manager"], self.manager_emp.id)
+
+        self.manager_emp.delete()
+        self.assertIsNone(self.client.get(url).data["manager"])
+
+
+from django.utils.http import http_date
+
+
+class ConditionalRequestTests(PaginationMixin, APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            username="admin_cond", password="Pass12345!", role=User.Role.ADMIN, email="admin_cond@test.com"
+        )
+        self.manager = User.objects.create_user(
+            username="manager_cond", password="Pass12345!", role=User.Role.MANAGER, email="manager_cond@test.com"
+        )
+        self.dept = Department.objects.create(name="Cond Dept")
+        self.manager_emp = Employee.objects.create(user=self.manager, department=self.dept, salary=Decimal("1000"))
+        self.attendance = Attendance.objects.create(employee=self.manager_emp, date=date(2026, 3, 2))
+        self.payroll = Payroll.objects.create(
+            employee=self.manager_emp, year=2026, month=3, base_salary=Decimal("1000"), net_salary=Decimal("1000"),
+        )
+        self.client.force_authenticate(user=self.admin)
+
+    def test_detail_not_modified(self):
+        url = reverse("attendance-detail", args=[self.attendance.id])
+        res = self.client.get(url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn("Last-Modified", res)
+
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=res["ETag"])
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res.content, b"")
+        self.assertTrue(res["ETag"])
+
+        self.attendance.note = "changed"
+        self.attendance.save()
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=res["ETag"])
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["note"], "changed")
+
+    def test_if_match_rejects_stale_update(self):
+        url = reverse("payroll-detail", args=[self.payroll.id])
+        etag = self.client.get(url)["ETag"]
+
+        res = self.client.patch(url, {"allowances": "10.00"}, format="json", HTTP_IF_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res["ETag"], etag)
+
+        # A second editor still holding the old ETag
+        res = self.client.patch(url, {"allowances": "99.00"}, format="json", HTTP_IF_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.payroll.refresh_from_db()
+        self.assertEqual(self.payroll.allowances, Decimal("10.00"))
+
+        res = self.client.patch(url, {"note": "no precondition"}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn("ETag", res)
+
+    def test_list_not_modified_until_rows_change(self):
+        url = reverse("payroll-list")
+        res = self.client.get(url)
+        self.assertEqual(len(self.results(res)), 1)
+        self.assertNotIn("Last-Modified", res)
+
+        with self.assertNumQueries(1):
+            not_modified = self.client.get(url, HTTP_IF_NONE_MATCH=res["ETag"])
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        other = self.client.get(url, {"page": 1}, HTTP_IF_NONE_MATCH=res["ETag"])
+        self.assertEqual(other.status_code, status.HTTP_200_OK)
+
+        Payroll.objects.create(
+            employee=self.manager_emp, year=2026, month=4, base_salary=Decimal("1000"), net_salary=Decimal("1000"),
+        )
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=res["ETag"])
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["count"], 2)
+
+    def test_list_etag_changes_when_an_older_row_is_deleted(self):
+        url = reverse("payroll-list")
+        newer = Payroll.objects.create(
+            employee=self.manager_emp, year=2026, month=4, base_salary=Decimal("1000"), net_salary=Decimal("1000"),
+        )
+        etag = self.client.get(url)["ETag"]
+        self.payroll.delete()
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag, HTTP_IF_MODIFIED_SINCE=http_date(newer.updated_at.timestamp()))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["count"], 1)
+        # If-Modified-Since alone has no list validator to match against
+        res = self.client.get(url, HTTP_IF_MODIFIED_SINCE=http_date(newer.updated_at.timestamp() + 60))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_employee_version(self):
+        self.assertEqual(self.manager_emp.version, 1)
+        url = reverse("employee-detail", args=[self.manager_emp.id])
+        etag = self.client.get(url)["ETag"]
+
+        res = self.client.patch(url, {"phone": "123"}, format="json", HTTP_IF_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.manager_emp.refresh_from_db()
+        self.assertEqual(self.manager_emp.version, 2)
+
+        res = self.client.patch(url, {"phone": "456"}, format="json", HTTP_IF_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_412_PRECONDITION_FAILED)
+
+        self.manager_emp.save(update_fields=["phone"])
+        self.manager_emp.refresh_from_db()
+        self.assertEqual(self.manager_emp.version, 3)
+
+
+from django.db import connection
+from hr.views import AttendanceListCreateView, PayrollListCreateView
+
+
+class ListFilterTests(PaginationMixin, APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            username="admin_filter", password="Pass12345!", role=User.Role.ADMIN, email="admin_filter@test.com"
+        )
+        self.dept_a = Department.objects.create(name="Filter A")
+        self.dept_b = Department.objects.create(name="Filter B")
+        self.emp_a = Employee.objects.create(
+            user=User.objects.create_user(username="filter_a", password="Pass12345!", email="filter_a@test.com"),
+            department=self.dept_a,
+        )
+        self.emp_b = Employee.objects.create(
+            user=User.objects.create_user(username="filter_b", password="Pass12345!", email="filter_b@test.com"),
+            department=self.dept_b,
+        )
+        for day, status_a, status_b in [(1, "PRESENT", "LATE"), (2, "LATE", "PRESENT"), (3, "ABSENT", "LATE")]:
+            Attendance.objects.create(employee=self.emp_a, date=date(2026, 9, day), status=status_a)
+            Attendance.objects.create(employee=self.emp_b, date=date(2026, 9, day), status=status_b)
+        for month, payroll_status in [(8, PayrollStatus.PAID), (9, PayrollStatus.DRAFT)]:
+            for employee in (self.emp_a, self.emp_b):
+                Payroll.objects.create(
+                    employee=employee, year=2026, month=month, status=payroll_status,
+                    base_salary=Decimal("100"), net_salary=Decimal("100"),
+                )
+        self.client.force_authenticate(user=self.admin)
+
+    def ids(self, url, params):
+        res = self.client.get(url, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK, res.data)
+        return {(item["employee"], str(item.get("date") or item["month"])) for item in self.results(res)}
+
+    def test_attendance_filters(self):
+        url = reverse("attendance-list")
+        self.assertEqual(
+            self.ids(url, {"status": "LATE", "date_from": "2026-09-02", "date_to": "2026-09-03"}),
+            {(self.emp_a.id, "2026-09-02"), (self.emp_b.id, "2026-09-03")},
+        )
+        self.assertEqual(
+            self.ids(url, {"department": self.dept_b.id, "date_to": "2026-09-01"}),
+            {(self.emp_b.id, "2026-09-01")},
+        )
+        self.assertEqual(len(self.ids(url, {"employee": self.emp_a.id, "cursor": ""})), 3)
+
+    def test_payroll_filters(self):
+        url = reverse("payroll-list")
+        self.assertEqual(
+            self.ids(url, {"year": 2026, "month": 9, "status": "DRAFT"}),
+            {(self.emp_a.id, "9"), (self.emp_b.id, "9")},
+        )
+        self.assertEqual(self.ids(url, {"status": "PAID", "employee": self.emp_b.id}), {(self.emp_b.id, "8")})
+
+    def test_filters_apply_to_exports(self):
+        res = self.client.get(reverse("payroll-export"), {"status": "DRAFT", "output": "ndjson"})
+        rows = [json.loads(line) for line in b"".join(res.streaming_content).decode().splitlines()]
+        self.assertEqual({row["month"] for row in rows}, {9})
+
+    def test_invalid_filters_are_rejected(self):
+        for url, params in [
+            (reverse("attendance-list"), {"status": "SICK"}),
+            (reverse("attendance-list"), {"date_from": "yesterday"}),
+            (reverse("attendance-list"), {"date_from": "2026-09-03", "date_to": "2026-09-01"}),
+            (reverse("attendance-list"), {"department": "x"}),
+            (reverse("payroll-list"), {"month": 13}),
+            (reverse("payroll-list"), {"year": 1999}),
+        ]:
+            res = self.client.get(url, params)
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST, params)
+
+
+import re
+
+
+class ListFilterPlanTests(APITestCase):
+    """
+    Every supported filter combination is answered by searching one of the
+    indexes meant for it (an index condition, not a full table or index
+    scan). Indexes are given by their columns; names are looked up.
+    """
+
+    DATE_RANGE = {"date_from": date(2026, 9, 1), "date_to": date(2026, 9, 7)}
+    ATTENDANCE_FILTERS = [
+        (DATE_RANGE, [("date", "status"), ("date", "created_at", "id")]),
+        ({"status": "LATE"}, [("status", "date")]),
+        ({"status": "LATE", **DATE_RANGE}, [("status", "date")]),
+        ({"employee": 1}, [("employee_id", "date"), ("employee_id",)]),
+        ({"employee": 1, "date_from": date(2026, 9, 1)}, [("employee_id", "date")]),
+        ({"employee": 1, "status": "LATE"}, [("employee_id", "date"), ("employee_id",)]),
+        ({"department": 1}, [("department_id", "date")]),
+        ({"department": 1, "status": "ABSENT", "date_from": date(2026, 9, 1)}, [("department_id", "date")]),
+    ]
+    PAYROLL_FILTERS = [
+        ({"year": 2026}, [("year", "month", "status"), ("year", "month", "created_at", "id")]),
+        ({"year": 2026, "month": 9}, [("year", "month", "status"), ("year", "month", "created_at", "id")]),
+        (
+            {"year": 2026, "month": 9, "status": "DRAFT"},
+            [("year", "month", "status"), ("status", "year", "month"), ("year", "month", "created_at", "id")],
+        ),
+        ({"status": "DRAFT"}, [("status", "year", "month")]),
+        ({"employee": 1}, [("employee_id", "year", "month"), ("employee_id",)]),
+        ({"employee": 1, "year": 2026}, [("employee_id", "year", "month")]),
+        ({"status": "PAID", "employee": 1}, [("employee_id", "year", "month"), ("employee_id",)]),
+    ]
+
+    def plan(self, queryset):
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+        return queryset.explain()
+
+    def index_columns(self, table):
+        """{index name: columns} for the table's indexes, including the per-partition ones on Postgres."""
+        with connection.cursor() as cursor:
+            if connection.vendor == "sqlite":
+                # Unique constraints show up as sqlite_autoindex_* here
+                cursor.execute(f"PRAGMA index_list({table})")
+                names = [row[1] for row in cursor.fetchall()]
+                columns = {}
+                for name in names:
+                    cursor.execute(f"PRAGMA index_info({name})")
+                    columns[name] = tuple(row[2] for row in cursor.fetchall())
+                return columns
+
+            columns = {
+                name: tuple(info["columns"])
+                for name, info in connection.introspection.get_constraints(cursor, table).items()
+                if info["index"] or info["unique"]
+            }
+            cursor.execute(
+                "SELECT child.relname, parent.relname FROM pg_inherits "
+                "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+                "WHERE parent.relname = ANY(%s)",
+                [list(columns)],
+            )
+            for child, parent in cursor.fetchall():
+                columns[child] = columns[parent]
+            return columns
+
+    def searched_indexes(self, plan, table):
+        """Indexes the plan searches with an index condition; None if it also scans the table in full."""
+        lines = plan.splitlines()
+        if connection.vendor == "sqlite":
+            if any(f"SCAN {table}" in line for line in lines):
+                return None
+            return {
+                match.group(1)
+                for line in lines
+                for match in [re.search(rf"SEARCH {table} USING (?:COVERING )?INDEX (\S+) \(", line)]
+                if match
+            }
+        if any(f"Seq Scan on {table}" in line for line in lines):
+            return None
+        searched = set()
+        for i, line in enumerate(lines):
+            match = re.search(r"(?:Index(?: Only)? Scan using|Bitmap Index Scan on) (\S+)", line)
+            if not match:
+                continue
+            details = []
+            for following in lines[i + 1:]:
+                if "->" in following:
+                    break
+                details.append(following)
+            if any("Index Cond:" in detail for detail in details):
+                searched.add(match.group(1))
+        return searched
+
+    def assert_indexed(self, model, view, combinations):
+        table = model._meta.db_table
+        index_columns = self.index_columns(table)
+        for params, expected in combinations:
+            allowed = {name for name, columns in index_columns.items() if columns in expected}
+            self.assertTrue(allowed, expected)
+            filters = {view.filter_lookups[name]: value for name, value in params.items()}
+            queryset = model.objects.filter(**filters)
+            for query in (queryset, queryset.order_by()):
+                with self.subTest(params=params, ordered=query.ordered):
+                    plan = self.plan(query.values("id"))
+                    searched = self.searched_indexes(plan, table)
+                    self.assertTrue(searched, plan)
+                    self.assertLessEqual(searched, allowed, plan)
+
+    def test_attendance_filters_use_indexes(self):
+        self.assert_indexed(Attendance, AttendanceListCreateView, self.ATTENDANCE_FILTERS)
+
+    def test_payroll_filters_use_indexes(self):
+        self.assert_indexed(Payroll, PayrollListCreateView, self.PAYROLL_FILTERS)
+
+
+from django.test.utils import CaptureQueriesContext
+from hr.ingest import ingest_attendance
+from hr.payroll import run_payroll
+from hr.departments import move_employees
+
+
+class DenormalizedDepartmentTests(PaginationMixin, APITestCase):
+    def setUp(self):
+        self.dept_a = Department.objects.create(name="Denorm A")
+        self.dept_b = Department.objects.create(name="Denorm B")
+        self.manager_b = User.objects.create_user(
+            username="denorm_mgr", password="Pass12345!", role=User.Role.MANAGER, email="denorm_mgr@test.com"
+        )
+        Employee.objects.create(user=self.manager_b, department=self.dept_b)
+        self.emp = Employee.objects.create(
+            user=User.objects.create_user(username="denorm_emp", password="Pass12345!", email="denorm_emp@test.com"),
+            department=self.dept_a,
+            salary=Decimal("500"),
+        )
+
+    def test_writes_copy_the_employee_department(self):
+        attendance = Attendance.objects.create(employee=self.emp, date=date(2026, 5, 4))
+        self.assertEqual(attendance.department_id, self.dept_a.id)
+
+        ingest_attendance([{"employee": self.emp.id, "date": "2026-05-05", "status": "LATE"}])
+        run_payroll(2026, 5)
+        self.assertEqual(
+            set(Attendance.objects.values_list("department_id", flat=True))
+            | set(Payroll.objects.values_list("department_id", flat=True)),
+            {self.dept_a.id},
+        )
+
+        # Reloaded without the employee: the department is looked up
+        attendance = Attendance.objects.get(id=attendance.id)
+        attendance.department_id = None
+        attendance.save(update_fields=["note"])
+        attendance.refresh_from_db()
+        self.assertEqual(attendance.department_id, self.dept_a.id)
+
+    def test_department_move_follows_the_employee(self):
+        Attendance.objects.create(employee=self.emp, date=date(2026, 5, 4))
+        Payroll.objects.create(
+            employee=self.emp, year=2026, month=5, base_salary=Decimal("500"), net_salary=Decimal("500"),
+        )
+        self.client.force_authenticate(user=self.manager_b)
+        self.assertEqual(self.results(self.client.get(reverse("attendance-list"))), [])
+        stamped = Attendance.objects.get().updated_at
+
+        self.emp.department = self.dept_b
+        self.emp.save()
+        self.assertEqual(set(Attendance.objects.values_list("department_id", flat=True)), {self.dept_b.id})
+        self.assertEqual(set(Payroll.objects.values_list("department_id", flat=True)), {self.dept_b.id})
+        self.assertGreater(Attendance.objects.get().updated_at, stamped)
+        self.assertEqual(len(self.results(self.client.get(reverse("attendance-list")))), 1)
+        self.assertEqual(len(self.results(self.client.get(reverse("payroll-list")))), 1)
+
+    def test_bulk_move_syncs_copies_and_tokens(self):
+        Attendance.objects.create(employee=self.emp, date=date(2026, 5, 4))
+        self.client.force_authenticate(user=User.objects.create_user(
+            username="denorm_admin", password="Pass12345!", role=User.Role.ADMIN, email="denorm_admin@test.com"
+        ))
+        url = reverse("attendance-list")
+        etag = self.client.get(url, {"department": self.dept_b.id})["ETag"]
+        self.emp.user.refresh_from_db()
+        version, token_version = self.emp.version, self.emp.user.token_version
+
+        self.assertEqual(move_employees([self.emp.id], self.dept_b.id), 1)
+        self.assertEqual(move_employees([self.emp.id], self.dept_b.id), 0)
+        self.emp.refresh_from_db()
+        self.emp.user.refresh_from_db()
+        self.assertEqual(self.emp.department_id, self.dept_b.id)
+        self.assertEqual((self.emp.version, self.emp.user.token_version), (version + 1, token_version + 1))
+        self.assertEqual(set(Attendance.objects.values_list("department_id", flat=True)), {self.dept_b.id})
+        res = self.client.get(url, {"department": self.dept_b.id}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["count"], 1)
+
+    def test_manager_scope_does_not_join_employees(self):
+        Attendance.objects.create(employee=self.emp, date=date(2026, 5, 4))
+        self.client.force_authenticate(user=self.manager_b)
+        for name in ("attendance-list", "payroll-list"):
+            with CaptureQueriesContext(connection) as queries:
+                self.client.get(reverse(name))
+            scoped = [q["sql"] for q in queries if 'FROM "hr_attendance"' in q["sql"] or 'FROM "hr_payroll"' in q["sql"]]
+            self.assertTrue(scoped)
+            for sql in scoped:
+                self.assertNotIn("hr_employee", sql)
+
+
+import unittest
+from hr import partitions
+
+
+class AttendancePartitionTests(APITestCase):
+    def test_month_arithmetic_and_bounds(self):
+        self.assertEqual(partitions.add_months(date(2026, 11, 17), 2), date(2027, 1, 1))
+        self.assertEqual(partitions.add_months(date(2026, 1, 31), -13), date(2024, 12, 1))
+        self.assertEqual(partitions.partition_name("hr_attendance", date(2026, 3, 1)), "hr_attendance_y2026m03")
+        self.assertEqual(
+            partitions.parse_bound("FOR VALUES FROM ('2026-09-01') TO ('2026-10-01')"),
+            (date(2026, 9, 1), date(2026, 10, 1)),
+        )
+        self.assertIsNone(partitions.parse_bound("DEFAULT"))
+
+    def test_expired_partitions_follow_retention(self):
+        listed = [
+            ("hr_attendance_y2025m08", (date(2025, 8, 1), date(2025, 9, 1))),
+            ("hr_attendance_y2025m09", (date(2025, 9, 1), date(2025, 10, 1))),
+            ("hr_attendance_y2025m10", (date(2025, 10, 1), date(2025, 11, 1))),
+            ("hr_attendance_default", None),
+        ]
+        expired = partitions.expired_partitions(12, today=date(2026, 10, 17), partitions=listed)
+        self.assertEqual(expired, ["hr_attendance_y2025m08", "hr_attendance_y2025m09"])
+
+    @unittest.skipIf(connection.vendor == "postgresql", "covered by the Postgres test below")
+    def test_command_is_a_no_op_without_postgres(self):
+        out = StringIO()
+        call_command("manage_attendance_partitions", retain_months=1, drop=True, stdout=out)
+        self.assertIn("nothing to do", out.getvalue())
+
+    @unittest.skipUnless(connection.vendor == "postgresql", "partitioning is Postgres-only")
+    def test_partitions_on_postgres(self):
+        self.assertTrue(partitions.is_partitioned())
+        employee = Employee.objects.create(
+            user=User.objects.create_user(username="part_emp", password="Pass12345!", email="part_emp@test.com")
+        )
+        # Far outside the migrated range: lands in DEFAULT, then moves to its own partition
+        Attendance.objects.create(employee=employee, date=date(2040, 1, 2))
+        self.assertEqual(partitions.create_month_partition(date(2040, 1, 1)), "hr_attendance_y2040m01")
+        self.assertIsNone(partitions.create_month_partition(date(2040, 1, 1)))
+        self.assertEqual(Attendance.objects.filter(date__year=2040).count(), 1)
+
+        plan = Attendance.objects.filter(date__gte=date(2040, 1, 1), date__lt=date(2040, 2, 1)).explain()
+        self.assertIn("hr_attendance_y2040m01", plan)
+        self.assertNotIn("hr_attendance_default", plan)
+
+
+from asgiref.sync import sync_to_async
+from django.db.models import F
+from accounts.models import token_version_cache_key
+
+
+class AsyncEndpointTests(PaginationMixin, APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_user(
+            username="admin_async", password="Pass12345!", role=User.Role.ADMIN, email="admin_async@test.com"
+        )
+        self.manager = User.objects.create_user(
+            username="manager_async", password="Pass12345!", role=User.Role.MANAGER, email="manager_async@test.com"
+        )
+        self.dept_a = Department.objects.create(name="Async A")
+        self.dept_b = Department.objects.create(name="Async B")
+        self.manager_emp = Employee.objects.create(user=self.manager, department=self.dept_a, salary=Decimal("900"))
+        self.other = Employee.objects.create(
+            user=User.objects.create_user(username="other_async", password="Pass12345!", email="other_async@test.com"),
+            department=self.dept_b,
+            salary=Decimal("800"),
+        )
+        for employee in (self.manager_emp, self.other):
+            Attendance.objects.create(employee=employee, date=date(2026, 4, 1))
+            Payroll.objects.create(
+                employee=employee, year=2026, month=4, base_salary=employee.salary, net_salary=employee.salary,
+            )
+
+    def token(self, user):
+        user.refresh_from_db()
+        return str(CustomTokenObtainPairSerializer.get_token(user).access_token)
+
+    def auth_as(self, user):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token(user)}")
+
+    def test_lists_and_details_match_the_sync_views(self):
+        for user in (self.admin, self.manager):
+            self.auth_as(user)
+            for name in ("department-list", "employee-list", "attendance-list", "payroll-list"):
+                sync, async_ = self.client.get(reverse(name)), self.client.get(reverse(f"{name}-async"))
+                self.assertEqual(async_.status_code, status.HTTP_200_OK, name)
+                self.assertEqual(async_.json()["count"], sync.data["count"], name)
+                self.assertEqual(async_.json()["results"], json.loads(JSONRenderer().render(self.results(sync))), name)
+
+            detail = self.client.get(reverse("payroll-detail-async", args=[self.manager_emp.payrolls.get().id]))
+            self.assertEqual(detail.json()["net_salary"], "900.00")
+            self.assertEqual(self.client.get(reverse("me-async")).json(), self.client.get(reverse("me")).data)
+
+    def test_scope_filters_and_pagination(self):
+        self.auth_as(self.manager)
+        res = self.client.get(reverse("employee-detail-async", args=[self.other.id]))
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(res.json(), {"detail": "Not found."})
+
+        res = self.client.get(reverse("attendance-list-async"), {"status": "bogus"})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("status", res.json())
+
+        self.auth_as(self.admin)
+        res = self.client.get(reverse("attendance-list-async"), {"cursor": ""})
+        self.assertNotIn("count", res.json())
+        self.assertEqual(len(res.json()["results"]), 2)
+        self.assertEqual(self.client.get(reverse("employee-list-async"), {"page": 9}).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_authentication(self):
+        res = self.client.get(reverse("employee-list-async"))
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIn("WWW-Authenticate", res)
+
+        self.auth_as(self.admin)
+        self.assertEqual(self.client.post(reverse("employee-list-async")).status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+        # A stale token falls back to the user row, which enforces is_active
+        User.objects.filter(pk=self.admin.pk).update(token_version=F("token_version") + 1, is_active=False)
+        cache.delete(token_version_cache_key(self.admin.pk))
+        self.assertEqual(self.client.get(reverse("me-async")).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_query_counts(self):
+        self.auth_as(self.manager)
+        self.client.get(reverse("me-async"))
+        with self.assertNumQueries(0):
+            self.client.get(reverse("me-async"))
+        # Aggregate for the ETag (doubling as the count) and the page
+        with self.assertNumQueries(2):
+            res = self.client.get(reverse("attendance-list-async"))
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                self.client.get(reverse("attendance-list-async"), HTTP_IF_NONE_MATCH=res["ETag"]).status_code,
+                status.HTTP_304_NOT_MODIFIED,
+            )
+        self.client.get(reverse("department-list-async"))
+        with self.assertNumQueries(0):
+            self.client.get(reverse("department-list-async"))
+
+    async def test_served_natively_under_asgi(self):
+        token = await sync_to_async(self.token)(self.manager)
+        headers = {"authorization": f"Bearer {token}"}
+        await self.async_client.get(reverse("employee-list-async"), headers=headers)
+        # Token version now cached: count and page only, recorded from the ORM's thread
+        res = await self.async_client.get(reverse("employee-list-async"), headers=headers)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([e["id"] for e in res.json()["results"]], [self.manager_emp.id])
+        self.assertIn('desc="2 queries"', res["Server-Timing"])
+
+    def test_concurrency_benchmark(self):
+        report = benchmark.run_concurrency_benchmark(requests=4, concurrency=2, warmup=0, routes=["employee-list", "me"])
+        self.assertEqual([r["route"] for r in report["results"]], ["employee-list", "me"])
+        for result in report["results"]:
+            self.assertEqual(result["sync"]["statuses"], {"200": 4})
+            self.assertEqual(result["async"]["statuses"], {"200": 4})
+            self.assertGreater(result["async"]["rps"], 0)
+
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse
+from django.core.exceptions import MiddlewareNotUsed
+from django.test import RequestFactory, override_settings
+from core import db_router
+from hr.async_views import AsyncDepartmentDetailView
+from hr.views import DepartmentListCreateView, EmployeeListCreateView, EmployeeReportsView
+
+
+class ReplicaRoutingTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch.object(db_router, "replica_alias", return_value="replica")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def read_alias(self, method, view_class, asynchronous=False, **headers):
+        """Alias the router picks for a read inside a request to `view_class`."""
+        seen = {}
+        request = RequestFactory().generic(method, "/", **headers)
+
+        def view(request):
+            middleware.process_view(request, view_class.as_view(), (), {})
+            seen["alias"] = db_router.ReplicaRouter().db_for_read(Employee)
+            return HttpResponse()
+
+        async def async_view(request):
+            return view(request)
+
+        middleware = db_router.ReplicaRoutingMiddleware(async_view if asynchronous else view)
+        if asynchronous:
+            async_to_sync(middleware)(request)
+        else:
+            middleware(request)
+        return seen["alias"]
+
+    def test_list_and_detail_gets_read_from_the_replica(self):
+        self.assertEqual(self.read_alias("GET", EmployeeListCreateView), "replica")
+        self.assertEqual(self.read_alias("HEAD", EmployeeListCreateView), "replica")
+        self.assertEqual(self.read_alias("GET", EmployeeListCreateView, asynchronous=True), "replica")
+        self.assertIsNone(self.read_alias("GET", EmployeeReportsView))
+        # Cached responses are shared, so their misses must not read a lagging replica
+        self.assertIsNone(self.read_alias("GET", DepartmentListCreateView))
+        self.assertIsNone(self.read_alias("GET", AsyncDepartmentDetailView, asynchronous=True))
+        self.assertIsNone(self.read_alias("POST", EmployeeListCreateView))
+        # Outside a request everything stays on default
+        self.assertIsNone(db_router.ReplicaRouter().db_for_read(Employee))
+
+    def test_writes_pin_the_session_to_the_primary(self):
+        alice, bob = {"HTTP_AUTHORIZATION": "Bearer alice"}, {"HTTP_AUTHORIZATION": "Bearer bob"}
+        self.read_alias("PATCH", EmployeeListCreateView, **alice)
+        self.assertIsNone(self.read_alias("GET", EmployeeListCreateView, **alice))
+        self.assertEqual(self.read_alias("GET", EmployeeListCreateView, **bob), "replica")
+
+        session = {"HTTP_COOKIE": f"{settings.SESSION_COOKIE_NAME}=abc"}
+        self.read_alias("POST", EmployeeListCreateView, asynchronous=True, **session)
+        self.assertIsNone(self.read_alias("GET", EmployeeListCreateView, **session))
+
+        with self.settings(HRMS_DB_REPLICA_PIN_SECONDS=0):
+            self.read_alias("DELETE", EmployeeListCreateView, **bob)
+        self.assertEqual(self.read_alias("GET", EmployeeListCreateView, **bob), "replica")
+
+    def test_not_installed_without_a_replica(self):
+        with mock.patch.object(db_router, "replica_alias", return_value=None):
+            with self.assertRaises(MiddlewareNotUsed):
+                db_router.ReplicaRoutingMiddleware(lambda request: HttpResponse())
+
+
+# A second database with its own test copy, e.g. another SQLite file
+SEPARATE_REPLICA = "replica" in connections and not connections["replica"].settings_dict["TEST"]["MIRROR"]
+
+
+@unittest.skipUnless(SEPARATE_REPLICA, "needs a second, non-mirrored 'replica' database")
+@override_settings(HRMS_DB_REPLICA_ALIAS="replica")
+class ReplicaDatabaseTests(PaginationMixin, APITestCase):
+    """
+    Routing switched on for this class only, against two real databases.
+    The replica's test database stays empty, so reads served by it show.
+    """
+
+    databases = {"default", "replica"} if SEPARATE_REPLICA else {"default"}
+
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_user(
+            username="admin_replica", password="Pass12345!", role=User.Role.ADMIN, email="admin_replica@test.com"
+        )
+        self.employee = Employee.objects.create(
+            user=User.objects.create_user(username="emp_replica", password="Pass12345!", email="emp_replica@test.com"),
+            department=Department.objects.create(name="Replica"),
+        )
+        self.admin.refresh_from_db()
+        self.token = CustomTokenObtainPairSerializer.get_token(self.admin).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+
+    def test_reads_follow_the_replica_until_the_caller_writes(self):
+        self.assertEqual(self.results(self.client.get(reverse("employee-list"))), [])
+        self.assertEqual(self.client.get(reverse("employee-detail", args=[self.employee.id])).status_code, 404)
+
+        res = self.client.patch(reverse("employee-detail", args=[self.employee.id]), {"phone": "555"}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([e["phone"] for e in self.results(self.client.get(reverse("employee-list")))], ["555"])
+
+        # Another session is not pinned
+        other = CustomTokenObtainPairSerializer.get_token(self.admin).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {other}")
+        self.assertEqual(self.results(self.client.get(reverse("employee-list"))), [])
+
+
+from hr.leave import allocate_leave, working_days
+from hr.models import LeaveBalance, LeaveLedgerEntry, LeaveRequest, LeaveType
+from hr.status import LeaveLedgerKind, LeaveStatus
+from rest_framework.exceptions import ValidationError
+
+
+class LeaveTests(PaginationMixin, APITestCase):
+    def setUp(self):
+        self.dept = Department.objects.create(name="Leave dept")
+        self.other_dept = Department.objects.create(name="Leave other")
+        self.admin = User.objects.create_user(
+            username="leave_admin", password="Pass12345!", role=User.Role.ADMIN, email="leave_admin@test.com"
+        )
+        self.manager = User.objects.create_user(
+            username="leave_mgr", password="Pass12345!", role=User.Role.MANAGER, email="leave_mgr@test.com"
+        )
+        self.manager_emp = Employee.objects.create(user=self.manager, department=self.dept)
+        self.user = User.objects.create_user(username="leave_emp", password="Pass12345!", email="leave_emp@test.com")
+        self.emp = Employee.objects.create(user=self.user, department=self.dept)
+        self.outsider = Employee.objects.create(
+            user=User.objects.create_user(username="leave_out", password="Pass12345!", email="leave_out@test.com"),
+            department=self.other_dept,
+        )
+        self.annual = LeaveType.objects.create(name="Annual", max_days=10)
+        allocate_leave(self.emp.id, self.annual.id, 5)
+
+    def request_leave(self, start, end, **extra):
+        self.client.force_authenticate(user=self.user)
+        return self.client.post(
+            reverse("leaverequest-list"),
+            {"leave_type": self.annual.id, "start_date": start, "end_date": end, **extra},
+            format="json",
+        )
+
+    def balance(self):
+        return LeaveBalance.objects.get(employee=self.emp, leave_type=self.annual)
+
+    def test_working_days(self):
+        # 2026-05-01 is a Friday
+        self.assertEqual(working_days(date(2026, 5, 1), date(2026, 5, 4)), 2)
+        self.assertEqual(working_days(date(2026, 5, 2), date(2026, 5, 3)), 0)
+        self.assertEqual(working_days(date(2026, 5, 4), date(2026, 5, 31)), 20)
+        self.assertEqual(working_days(date(2026, 5, 4), date(2026, 5, 1)), 0)
+
+    def test_request_and_approve_updates_balance_and_ledger(self):
+        res = self.request_leave("2026-05-04", "2026-05-06", reason="Trip")
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual((res.data["employee"], res.data["days"], res.data["status"]), (self.emp.id, 3, "PENDING"))
+        self.assertEqual(self.balance().balance, 5)
+
+        self.client.force_authenticate(user=self.manager)
+        res = self.client.post(reverse("leaverequest-approve", args=[res.data["id"]]))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual((res.data["status"], res.data["decided_by"]), ("APPROVED", self.manager.id))
+
+        balance = self.balance()
+        self.assertEqual((balance.allocated_days, balance.used_days, balance.balance), (5, 3, 2))
+        self.assertEqual(
+            list(LeaveLedgerEntry.objects.order_by("id").values_list("kind", "days", "balance_after")),
+            [(LeaveLedgerKind.ALLOCATION, 5, 5), (LeaveLedgerKind.USAGE, -3, 2)],
+        )
+
+        # Already decided
+        res = self.client.post(reverse("leaverequest-reject", args=[res.data["id"]]))
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_request_validation(self):
+        self.assertEqual(self.request_leave("2026-05-04", "2026-05-15").status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.request_leave("2026-05-09", "2026-05-10").status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.request_leave("2026-05-06", "2026-05-04").status_code, status.HTTP_400_BAD_REQUEST)
+        res = self.request_leave("2026-05-04", "2026-05-19")
+        self.assertIn("at most 10", str(res.data["end_date"]))
+
+        self.assertEqual(self.request_leave("2026-05-04", "2026-05-05").status_code, status.HTTP_201_CREATED)
+        res = self.request_leave("2026-05-05", "2026-05-06")
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("start_date", res.data)
+
+        # Another employee's leave, or one outside the manager's department
+        res = self.request_leave("2026-06-01", "2026-06-01", employee=self.outsider.id)
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.client.force_authenticate(user=self.manager)
+        res = self.client.post(
+            reverse("leaverequest-list"),
+            {"employee": self.outsider.id, "leave_type": self.annual.id, "start_date": "2026-06-01", "end_date": "2026-06-01"},
+            format="json",
+        )
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_approval_cannot_overdraw(self):
+        first = LeaveRequest.objects.create(
+            employee=self.emp, leave_type=self.annual, start_date=date(2026, 5, 4), end_date=date(2026, 5, 7), days=4
+        )
+        second = LeaveRequest.objects.create(
+            employee=self.emp, leave_type=self.annual, start_date=date(2026, 6, 1), end_date=date(2026, 6, 2), days=2
+        )
+        self.client.force_authenticate(user=self.admin)
+        self.assertEqual(self.client.post(reverse("leaverequest-approve", args=[first.id])).status_code, 200)
+        res = self.client.post(reverse("leaverequest-approve", args=[second.id]))
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.balance().balance, 1)
+        second.refresh_from_db()
+        self.assertEqual(second.status, LeaveStatus.PENDING)
+
+    def test_reject_and_cancel(self):
+        pending = self.request_leave("2026-05-04", "2026-05-04").data["id"]
+        approved = self.request_leave("2026-05-05", "2026-05-06").data["id"]
+
+        self.client.force_authenticate(user=self.manager)
+        self.assertEqual(self.client.post(reverse("leaverequest-reject", args=[pending])).data["status"], "REJECTED")
+        self.client.post(reverse("leaverequest-approve", args=[approved]))
+        self.assertEqual(self.balance().balance, 3)
+
+        # Only the requester or an admin cancels
+        self.assertEqual(self.client.post(reverse("leaverequest-cancel", args=[approved])).status_code, 403)
+        self.client.force_authenticate(user=self.user)
+        self.assertEqual(self.client.post(reverse("leaverequest-cancel", args=[approved])).data["status"], "CANCELLED")
+        balance = self.balance()
+        self.assertEqual((balance.used_days, balance.balance), (0, 5))
+        self.assertEqual(
+            LeaveLedgerEntry.objects.filter(leave_request_id=approved).order_by("id").last().kind,
+            LeaveLedgerKind.REVERSAL,
+        )
+
+    def test_decisions_are_scoped(self):
+        mine = LeaveRequest.objects.create(
+            employee=self.manager_emp, leave_type=self.annual, start_date=date(2026, 5, 4), end_date=date(2026, 5, 4), days=1
+        )
+        outside = LeaveRequest.objects.create(
+            employee=self.outsider, leave_type=self.annual, start_date=date(2026, 5, 4), end_date=date(2026, 5, 4), days=1
+        )
+        self.client.force_authenticate(user=self.manager)
+        self.assertEqual(self.client.post(reverse("leaverequest-approve", args=[mine.id])).status_code, 403)
+        self.assertEqual(self.client.post(reverse("leaverequest-approve", args=[outside.id])).status_code, 404)
+        self.client.force_authenticate(user=self.user)
+        self.assertEqual(self.client.post(reverse("leaverequest-approve", args=[outside.id])).status_code, 403)
+
+        self.assertEqual(
+            {row["id"] for row in self.results(self.client.get(reverse("leaverequest-list")))}, set()
+        )
+        self.client.force_authenticate(user=self.manager)
+        self.assertEqual(
+            {row["id"] for row in self.results(self.client.get(reverse("leaverequest-list")))}, {mine.id}
+        )
+        self.client.force_authenticate(user=self.admin)
+        res = self.client.get(reverse("leaverequest-list"), {"employee": self.outsider.id})
+        self.assertEqual({row["id"] for row in self.results(res)}, {outside.id})
+
+    def test_allocation_endpoint_balances_and_ledger(self):
+        self.client.force_authenticate(user=self.user)
+        url = reverse("leave-allocate")
+        body = {"employee": self.emp.id, "leave_type": self.annual.id, "days": 3}
+        self.assertEqual(self.client.post(url, body, format="json").status_code, 403)
+
+        self.client.force_authenticate(user=self.admin)
+        res = self.client.post(url, body, format="json")
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual((res.data["kind"], res.data["balance_after"]), ("ALLOCATION", 8))
+        self.assertEqual(self.client.post(url, {**body, "days": -9}, format="json").status_code, 400)
+
+        self.client.force_authenticate(user=self.user)
+        balances = self.results(self.client.get(reverse("leavebalance-list")))
+        self.assertEqual([(b["allocated_days"], b["balance"]) for b in balances], [(8, 8)])
+        self.assertEqual(len(self.results(self.client.get(reverse("leaveledger-list")))), 2)
+        self.client.force_authenticate(user=User.objects.get(username="leave_out"))
+        self.assertEqual(self.results(self.client.get(reverse("leavebalance-list"))), [])
+
+    def test_ledger_is_append_only(self):
+        entry = LeaveLedgerEntry.objects.get()
+        entry.days = 50
+        with self.assertRaises(ValidationError):
+            entry.save()
+        with self.assertRaises(ValidationError):
+            entry.delete()
+
+    def test_approval_query_count_does_not_grow_with_history(self):
+        for i in range(20):
+            allocate_leave(self.emp.id, self.annual.id, 1)
+        leave_request = LeaveRequest.objects.create(
+            employee=self.emp, leave_type=self.annual, start_date=date(2026, 5, 4), end_date=date(2026, 5, 4), days=1
+        )
+        self.client.force_authenticate(user=self.admin)
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.post(reverse("leaverequest-approve", args=[leave_request.id]))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertFalse([q["sql"] for q in queries if "SUM(" in q["sql"].upper()])
+        self.assertLessEqual(len(queries), 12)
+
+
+from hr.models import ReportRefresh
+from hr.reports import REPORTS, create_report_views, drop_report_views, refresh_reports
+
+
+class ReportTests(PaginationMixin, APITestCase):
+    def setUp(self):
+        self.dept_a = Department.objects.create(name="Report A")
+        self.dept_b = Department.objects.create(name="Report B")
+        self.admin = User.objects.create_user(
+            username="report_admin", password="Pass12345!", role=User.Role.ADMIN, email="report_admin@test.com"
+        )
+        self.manager = User.objects.create_user(
+            username="report_mgr", password="Pass12345!", role=User.Role.MANAGER, email="report_mgr@test.com"
+        )
+        self.manager_emp = Employee.objects.create(user=self.manager, department=self.dept_a, salary=Decimal("900"))
+        self.user = User.objects.create_user(
+            username="report_emp", password="Pass12345!", email="report_emp@test.com", first_name="Ada"
+        )
+        self.emp = Employee.objects.create(user=self.user, department=self.dept_a, salary=Decimal("500"))
+        self.outsider = Employee.objects.create(
+            user=User.objects.create_user(username="report_out", password="Pass12345!", email="report_out@test.com"),
+            department=self.dept_b,
+            salary=Decimal("700"),
+        )
+        Attendance.objects.create(employee=self.emp, date=date(2026, 5, 4), status=AttendanceStatus.LATE)
+        Attendance.objects.create(employee=self.emp, date=date(2026, 5, 5))
+        Attendance.objects.create(employee=self.outsider, date=date(2026, 5, 4))
+        Payroll.objects.create(
+            employee=self.emp, year=2026, month=5, base_salary=Decimal("500"),
+            allowances=Decimal("50"), deductions=Decimal("20"), net_salary=Decimal("530"),
+        )
+
+    def get(self, user, name, **params):
+        self.client.force_authenticate(user=user)
+        res = self.client.get(reverse(name), params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res
+
+    def test_reports_are_scoped(self):
+        for name in ("report-employees", "report-attendance"):
+            admin = {row["employee"] for row in self.results(self.get(self.admin, name))}
+            manager = {row["employee"] for row in self.results(self.get(self.manager, name))}
+            own = {row["employee"] for row in self.results(self.get(self.user, name))}
+            self.assertTrue({self.emp.id, self.outsider.id} <= admin)
+            self.assertNotIn(self.outsider.id, manager)
+            self.assertEqual(own, {self.emp.id})
+
+    def test_report_rows(self):
+        [row] = self.results(self.get(self.user, "report-attendance"))
+        self.assertEqual(
+            (row["first_name"], row["department_name"], row["year"], row["month"], row["late_days"], row["recorded_days"]),
+            ("Ada", "Report A", 2026, 5, 1, 2),
+        )
+        [row] = self.results(self.get(self.admin, "report-payroll", year=2026, month=5))
+        self.assertEqual((row["gross_salary"], row["net_salary"], row["status"]), ("550.00", "530.00", "DRAFT"))
+        self.assertEqual(self.results(self.get(self.admin, "report-payroll", year=2026, month=4)), [])
+
+        self.client.force_authenticate(user=self.admin)
+        self.assertEqual(self.client.get(reverse("report-payroll"), {"month": 13}).status_code, 400)
+
+    def test_refresh_timestamps(self):
+        refresh_reports()
+        before = ReportRefresh.objects.get(name="payroll").refreshed_at
+        res = self.get(self.admin, "report-payroll")
+        self.assertIsNotNone(res.data["refreshed_at"])
+
+        self.client.post(reverse("payroll-run"), {"year": 2026, "month": 6}, format="json")
+        self.assertGreater(ReportRefresh.objects.get(name="payroll").refreshed_at, before)
+        self.assertEqual(len(self.results(self.get(self.admin, "report-payroll", month=6))), 3)
+
+        with self.assertRaises(ValueError):
+            refresh_reports(["salaries"])
+
+    def test_views_can_be_rebuilt(self):
+        drop_report_views()
+        self.assertEqual(create_report_views(), list(REPORTS))
+        self.assertEqual(create_report_views(), [])
+        self.assertEqual(len(self.results(self.get(self.admin, "report-employees"))), 3)
+
+
+import tempfile
+from django.core.management.base import CommandError
+from hr.salaries import apply_salary_changes
+
+
+class SalaryChangeTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            username="salary_admin", password="Pass12345!", role=User.Role.ADMIN, email="salary_admin@test.com"
+        )
+        self.emps = [
+            Employee.objects.create(
+                user=User.objects.create_user(username=f"salary_{i}", password="Pass12345!", email=f"salary_{i}@test.com"),
+                salary=Decimal("1000"),
+            )
+            for i in range(3)
+        ]
+        self.draft = Payroll.objects.create(
+            employee=self.emps[0], year=2026, month=5, base_salary=Decimal("1000"),
+            allowances=Decimal("100"), deductions=Decimal("50"), net_salary=Decimal("1050"),
+        )
+        self.final = Payroll.objects.create(
+            employee=self.emps[0], year=2026, month=4, base_salary=Decimal("1000"),
+            net_salary=Decimal("1000"), status=PayrollStatus.FINAL,
+        )
+        self.overdrawn = Payroll.objects.create(
+            employee=self.emps[1], year=2026, month=5, base_salary=Decimal("1000"),
+            deductions=Decimal("800"), net_salary=Decimal("200"),
+        )
+        self.url = reverse("employee-salaries")
+
+    def test_bulk_update_recomputes_drafts_only(self):
+        self.client.force_authenticate(user=self.admin)
+        body = [
+            {"employee": self.emps[0].id, "salary": "1200.00"},
+            {"employee": self.emps[1].id, "salary": "500"},
+            {"employee": self.emps[2].id, "salary": "-1"},
+            {"employee": 999999, "salary": "10"},
+            {"employee": self.emps[0].id, "salary": "1300"},
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.post(self.url, body, format="json")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual((res.data["updated"], res.data["failed"]), (2, 3))
+        self.assertEqual([r["result"] for r in res.data["results"]], ["updated", "updated", "error", "error", "error"])
+        self.assertEqual(res.data["payrolls"]["recomputed"], 1)
+        self.assertEqual([p["id"] for p in res.data["payrolls"]["skipped"]], [self.overdrawn.id])
+        updates = [q["sql"] for q in queries if q["sql"].startswith("UPDATE")]
+        self.assertEqual(len(updates), 2)
+
+        emp = Employee.objects.get(id=self.emps[0].id)
+        self.assertEqual((emp.salary, emp.version), (Decimal("1200.00"), 2))
+        self.draft.refresh_from_db()
+        self.assertEqual((self.draft.base_salary, self.draft.net_salary), (Decimal("1200.00"), Decimal("1250.00")))
+        self.final.refresh_from_db()
+        self.assertEqual(self.final.base_salary, Decimal("1000.00"))
+        self.overdrawn.refresh_from_db()
+        self.assertEqual(self.overdrawn.net_salary, Decimal("200.00"))
+        self.assertEqual(Employee.objects.get(id=self.emps[1].id).salary, Decimal("500.00"))
+
+    def test_csv_upload_and_admin_only(self):
+        body = f"employee,salary\n{self.emps[2].id},2000\n"
+        self.client.force_authenticate(user=User.objects.get(username="salary_2"))
+        self.assertEqual(self.client.post(self.url, body, content_type="text/csv").status_code, 403)
+
+        self.client.force_authenticate(user=self.admin)
+        res = self.client.post(self.url, body, content_type="text/csv")
+        self.assertEqual(res.data["updated"], 1)
+        self.assertEqual(Employee.objects.get(id=self.emps[2].id).salary, Decimal("2000.00"))
+        self.assertEqual(self.client.post(self.url, {"employee": 1}, format="json").status_code, 400)
+        self.assertEqual(self.client.post(self.url, "5", content_type="application/json").status_code, 400)
+
+    def test_final_and_paid_payrolls_keep_their_amounts(self):
+        self.client.force_authenticate(user=self.admin)
+        apply_salary_changes([{"employee": self.emps[0].id, "salary": "2000"}])
+        url = reverse("payroll-detail", args=[self.final.id])
+
+        res = self.client.patch(url, {"status": "PAID"}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.final.refresh_from_db()
+        self.assertEqual(self.final.status, PayrollStatus.PAID)
+        self.assertEqual((self.final.base_salary, self.final.net_salary), (Decimal("1000.00"), Decimal("1000.00")))
+
+        res = self.client.patch(url, {"note": "paid late"}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual((res.data["base_salary"], res.data["net_salary"]), ("1000.00", "1000.00"))
+
+        res = self.client.patch(url, {"allowances": "50", "deductions": "0"}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("allowances", res.data)
+        self.assertNotIn("deductions", res.data)
+        self.final.refresh_from_db()
+        self.assertEqual(self.final.allowances, Decimal("0.00"))
+
+    def test_command(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv") as handle:
+            handle.write(f"employee,salary\n{self.emps[0].id},1100\n{self.emps[1].id},100\n")
+            handle.flush()
+            out, err = StringIO(), StringIO()
+            call_command("apply_salary_changes", handle.name, stdout=out, stderr=err)
+        self.assertIn("2 salaries updated, 0 failed; 1 draft payrolls recomputed, 1 skipped.", out.getvalue())
+        self.assertIn(f"payroll {self.overdrawn.id} (2026-05)", err.getvalue())
+        self.draft.refresh_from_db()
+        self.assertEqual(self.draft.net_salary, Decimal("1150.00"))
+
+        with self.assertRaises(CommandError):
+            call_command("apply_salary_changes", "salaries.txt")
+        with tempfile.NamedTemporaryFile("w", suffix=".json") as handle:
+            handle.write("5")
+            handle.flush()
+            with self.assertRaises(CommandError):
+                call_command("apply_salary_changes", handle.name)
+
+
+from unittest import mock
+from hr.payroll import transition_payrolls
+
+
+class PayrollTransitionTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            username="transition_admin", password="Pass12345!", role=User.Role.ADMIN, email="transition_admin@test.com"
+        )
+        self.dept = Department.objects.create(name="Transition dept")
+        self.emps = [
+            Employee.objects.create(
+                user=User.objects.create_user(username=f"transition_{i}", password="Pass12345!", email=f"transition_{i}@test.com"),
+                department=self.dept if i < 3 else None,
+            )
+            for i in range(4)
+        ]
+        self.may = [
+            Payroll.objects.create(employee=emp, year=2026, month=5, base_salary=Decimal("100"), net_salary=Decimal("100"))
+            for emp in self.emps
+        ]
+        self.june = Payroll.objects.create(
+            employee=self.emps[0], year=2026, month=6, base_salary=Decimal("100"), net_salary=Decimal("100")
+        )
+        self.url = reverse("payroll-transition")
+        self.client.force_authenticate(user=self.admin)
+
+    def statuses(self, payrolls):
+        return list(Payroll.objects.filter(id__in=[p.id for p in payrolls]).order_by("id").values_list("status", flat=True))
+
+    def test_transition_by_filters_in_batches(self):
+        with mock.patch("hr.views.transition_payrolls", wraps=lambda *a, **kw: transition_payrolls(*a, **kw, batch_size=2)):
+            res = self.client.post(self.url, {"status": "FINAL", "year": 2026, "month": 5, "department": self.dept.id}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            (res.data["from"], res.data["to"], res.data["transitioned"], res.data["skipped"], res.data["invalid"]),
+            ("DRAFT", "FINAL", 3, [], []),
+        )
+        self.assertEqual(self.statuses(self.may), ["FINAL", "FINAL", "FINAL", "DRAFT"])
+        self.assertEqual(self.statuses([self.june]), ["DRAFT"])
+
+        res = self.client.post(self.url, {"status": "PAID", "year": 2026, "month": 5}, format="json")
+        self.assertEqual(res.data["transitioned"], 3)
+        self.assertEqual(self.statuses(self.may), ["PAID", "PAID", "PAID", "DRAFT"])
+
+    def test_transition_by_ids_reports_invalid(self):
+        res = self.client.post(self.url, {"status": "PAID", "ids": [self.may[0].id, 999999]}, format="json")
+        self.assertEqual(res.data["transitioned"], 0)
+        self.assertEqual(res.data["invalid"], [{"id": self.may[0].id, "status": "DRAFT"}, {"id": 999999, "status": None}])
+
+        res = self.client.post(self.url, {"status": "FINAL", "ids": [self.may[0].id, self.june.id]}, format="json")
+        self.assertEqual((res.data["transitioned"], res.data["invalid"]), (2, []))
+
+    def test_validation_and_permissions(self):
+        for body in ({"status": "DRAFT", "year": 2026}, {"status": "FINAL"}, {"status": "FINAL", "ids": []}):
+            self.assertEqual(self.client.post(self.url, body, format="json").status_code, 400)
+        self.client.force_authenticate(user=User.objects.get(username="transition_0"))
+        self.assertEqual(self.client.post(self.url, {"status": "FINAL", "year": 2026}, format="json").status_code, 403)
+
+    def test_rows_gone_from_the_lock_are_skipped(self):
+        # Stand-in for a concurrent transaction holding the lock: SKIP LOCKED leaves the row out
+        real = Payroll.objects.filter
+
+        def locking_filter(*args, **kwargs):
+            qs = real(*args, **kwargs)
+            return qs.exclude(id=self.may[1].id) if "id__in" in kwargs and "status" in kwargs else qs
+
+        with mock.patch.object(Payroll.objects, "filter", side_effect=locking_filter):
+            result = transition_payrolls(PayrollStatus.FINAL, filters={"year": 2026, "month": 5})
+        self.assertEqual((result["transitioned"], result["skipped"]), (3, [self.may[1].id]))
+        self.assertEqual(self.statuses(self.may[1:2]), ["DRAFT"])
+
+    def test_single_update_follows_the_state_machine(self):
+        url = reverse("payroll-detail", args=[self.june.id])
+        self.assertEqual(self.client.patch(url, {"status": "PAID"}, format="json").status_code, 400)
+        self.assertEqual(self.client.patch(url, {"status": "FINAL"}, format="json").status_code, 200)
+        self.assertEqual(self.client.patch(url, {"status": "DRAFT"}, format="json").status_code, 400)
+
+
+from django.test import override_settings
+from hr.deductions import apply_attendance_deductions
+from hr.models import PayrollDeduction
+
+
+@override_settings(HRMS_ATTENDANCE_DEDUCTION_RATES={"ABSENT": "50", "LATE": "10.00"})
+class AttendanceDeductionTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            username="deduct_admin", password="Pass12345!", role=User.Role.ADMIN, email="deduct_admin@test.com"
+        )
+        self.dept = Department.objects.create(name="Deduct dept")
+        self.emps = [
+            Employee.objects.create(
+                user=User.objects.create_user(username=f"deduct_{i}", password="Pass12345!", email=f"deduct_{i}@test.com"),
+                department=self.dept,
+                salary=Decimal("1000") if i < 2 else Decimal("60"),
+            )
+            for i in range(3)
+        ]
+        statuses = {
+            0: [AttendanceStatus.ABSENT, AttendanceStatus.ABSENT, AttendanceStatus.LATE, AttendanceStatus.PRESENT],
+            1: [AttendanceStatus.PRESENT, AttendanceStatus.LEAVE],
+            2: [AttendanceStatus.ABSENT, AttendanceStatus.ABSENT],
+        }
+        for i, days in statuses.items():
+            for day, attendance_status in enumerate(days, start=4):
+                Attendance.objects.create(employee=self.emps[i], date=date(2026, 5, day), status=attendance_status)
+        # Outside the period
+        Attendance.objects.create(employee=self.emps[1], date=date(2026, 6, 1), status=AttendanceStatus.ABSENT)
+        self.client.force_authenticate(user=self.admin)
+
+    def breakdown(self, payroll):
+        return list(
+            PayrollDeduction.objects.filter(payroll=payroll).values_list("status", "occurrences", "rate", "amount")
+        )
+
+    def test_payroll_run_applies_deductions_from_one_aggregate(self):
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.post(reverse("payroll-run"), {"year": 2026, "month": 5}, format="json")
+        self.assertEqual(res.data["created"], 3)
+        aggregates = [q["sql"] for q in queries if 'FROM "hr_attendance"' in q["sql"] and "COUNT(" in q["sql"]]
+        self.assertEqual(len(aggregates), 1)
+
+        payrolls = {p.employee_id: p for p in Payroll.objects.filter(year=2026, month=5)}
+        first = payrolls[self.emps[0].id]
+        self.assertEqual((first.attendance_deductions, first.net_salary), (Decimal("110.00"), Decimal("890.00")))
+        self.assertEqual(
+            self.breakdown(first),
+            [("ABSENT", 2, Decimal("50.00"), Decimal("100.00")), ("LATE", 1, Decimal("10.00"), Decimal("10.00"))],
+        )
+        self.assertEqual(payrolls[self.emps[1].id].attendance_deductions, Decimal("0.00"))
+        # Capped at the net salary
+        capped = payrolls[self.emps[2].id]
+        self.assertEqual((capped.attendance_deductions, capped.net_salary), (Decimal("60.00"), Decimal("0.00")))
+
+    def test_create_update_and_recompute(self):
+        res = self.client.post(
+            reverse("payroll-list"),
+            {"employee": self.emps[0].id, "year": 2026, "month": 5, "allowances": "20"},
+            format="json",
+        )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual((res.data["attendance_deductions"], res.data["net_salary"]), ("110.00", "910.00"))
+
+        payroll_id = res.data["id"]
+        Attendance.objects.create(employee=self.emps[0], date=date(2026, 5, 11), status=AttendanceStatus.LATE)
+        res = self.client.patch(reverse("payroll-detail", args=[payroll_id]), {"deductions": "1100"}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        res = self.client.patch(reverse("payroll-detail", args=[payroll_id]), {"deductions": "5"}, format="json")
+        self.assertEqual((res.data["attendance_deductions"], res.data["net_salary"]), ("120.00", "895.00"))
+
+        Attendance.objects.create(employee=self.emps[0], date=date(2026, 5, 12), status=AttendanceStatus.ABSENT)
+        res = self.client.post(reverse("payroll-run"), {"year": 2026, "month": 5, "recompute_deductions": True}, format="json")
+        self.assertEqual(res.data["deductions"]["payrolls"], 3)
+        payroll = Payroll.objects.get(id=payroll_id)
+        self.assertEqual((payroll.attendance_deductions, payroll.net_salary), (Decimal("170.00"), Decimal("845.00")))
+        self.assertEqual(self.breakdown(payroll)[0][:2], ("ABSENT", 3))
+
+        # Finalized payrolls keep their deductions
+        Payroll.objects.filter(id=payroll_id).update(status=PayrollStatus.FINAL)
+        apply_attendance_deductions(2026, 5)
+        self.assertEqual(Payroll.objects.get(id=payroll_id).attendance_deductions, Decimal("170.00"))
+
+    def test_capped_draft_stays_editable_and_recomputable(self):
+        self.client.post(reverse("payroll-run"), {"year": 2026, "month": 5}, format="json")
+        capped = Payroll.objects.get(employee=self.emps[2], year=2026, month=5)
+        self.assertEqual((capped.attendance_deductions, capped.net_salary), (Decimal("60.00"), Decimal("0.00")))
+
+        # The same cap applies on edit: the draft run capped is still editable
+        url = reverse("payroll-detail", args=[capped.id])
+        res = self.client.patch(url, {"note": "hello"}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual((res.data["attendance_deductions"], res.data["net_salary"]), ("60.00", "0.00"))
+        res = self.client.patch(url, {"allowances": "10"}, format="json")
+        self.assertEqual((res.data["attendance_deductions"], res.data["net_salary"]), ("70.00", "0.00"))
+
+        # ...and on salary recompute, which lifts it again up to the itemised 100.00
+        apply_salary_changes([{"employee": self.emps[2].id, "salary": "50"}])
+        capped.refresh_from_db()
+        self.assertEqual((capped.attendance_deductions, capped.net_salary), (Decimal("60.00"), Decimal("0.00")))
+        result = apply_salary_changes([{"employee": self.emps[2].id, "salary": "500"}])
+        self.assertEqual(result["payrolls"]["skipped"], [])
+        capped.refresh_from_db()
+        self.assertEqual((capped.attendance_deductions, capped.net_salary), (Decimal("100.00"), Decimal("410.00")))
+
+    @override_settings(HRMS_ATTENDANCE_DEDUCTION_RATES={})
+    def test_no_rates_no_deductions(self):
+        self.client.post(reverse("payroll-run"), {"year": 2026, "month": 5}, format="json")
+        self.assertFalse(Payroll.objects.exclude(attendance_deductions=0).exists())
+        self.assertFalse(PayrollDeduction.objects.exists())
+
+
+from hr.onboarding import hash_passwords, import_employees
+
+
+class OnboardingTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            username="onboard_admin", password="Pass12345!", role=User.Role.ADMIN, email="onboard_admin@test.com"
+        )
+        self.dept = Department.objects.create(name="Onboarding")
+        self.boss = Employee.objects.create(
+            user=User.objects.create_user(
+                username="onboard_boss", password="Pass12345!", role=User.Role.MANAGER, email="onboard_boss@test.com"
+            ),
+            department=self.dept,
+        )
+        self.url = reverse("employee-import")
+
+    def test_import_creates_users_and_employees(self):
+        self.client.force_authenticate(user=self.admin)
+        body = [
+            # Reports to a manager further down the file
+            {"username": "new_dev", "email": "new_dev@test.com", "password": "Onboard123!",
+             "department": "Onboarding", "manager": "new_lead", "salary": "900", "join_date": "2026-09-01"},
+            {"username": "new_lead", "email": "new_lead@test.com", "password": "Onboard123!",
+             "role": "MANAGER", "department": str(self.dept.id), "manager": "onboard_boss"},
+            {"username": "new_blank"},
+            {"username": "onboard_admin"},
+            {"username": "new_dev", "email": "other@test.com"},
+            {"username": "new_lost", "department": "Nowhere"},
+            {"username": "new_weak", "password": "123"},
+            {"username": "new_bad", "manager": "new_blank"},
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.post(self.url, body, format="json")
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual((res.data["created"], res.data["failed"]), (3, 5))
+        self.assertEqual(
+            [r["result"] for r in res.data["results"]],
+            ["created", "created", "created", "error", "error", "error", "error", "error"],
+        )
+        self.assertIn("username", res.data["results"][3]["errors"])
+        self.assertIn("Duplicate", str(res.data["results"][4]["errors"]))
+        self.assertIn("department", res.data["results"][5]["errors"])
+        self.assertIn("password", res.data["results"][6]["errors"])
+        self.assertIn("MANAGER", str(res.data["results"][7]["errors"]))
+        inserts = [q["sql"] for q in queries if q["sql"].startswith("INSERT")]
+        self.assertEqual(len(inserts), 2)
+
+        dev = Employee.objects.select_related("user", "manager__user").get(user__username="new_dev")
+        self.assertEqual((dev.department_id, dev.manager.user.username), (self.dept.id, "new_lead"))
+        self.assertEqual((dev.salary, dev.join_date), (Decimal("900.00"), date(2026, 9, 1)))
+        self.assertTrue(dev.user.check_password("Onboard123!"))
+        lead = Employee.objects.get(user__username="new_lead")
+        self.assertEqual(lead.manager_id, self.boss.id)
+        self.assertFalse(User.objects.get(username="new_blank").has_usable_password())
+
+    def test_failed_managers_fail_their_reports(self):
+        rows = [
+            {"username": "cycle_a", "role": "MANAGER", "manager": "cycle_b"},
+            {"username": "cycle_b", "role": "MANAGER", "manager": "cycle_a"},
+            {"username": "chain_lead", "role": "MANAGER", "department": "Nowhere"},
+            {"username": "chain_mid", "role": "MANAGER", "manager": "chain_lead"},
+            {"username": "chain_dev", "manager": "chain_mid"},
+            {"username": "self_ref", "role": "MANAGER", "manager": "self_ref"},
+            {"username": "orphan", "manager": "nobody"},
+        ]
+        result = import_employees(rows)
+        self.assertEqual((result["created"], result["failed"]), (0, 7))
+        self.assertIn("cycle", str(result["results"][0]["errors"]))
+        self.assertIn("chain_lead", str(result["results"][3]["errors"]))
+        self.assertIn("chain_mid", str(result["results"][4]["errors"]))
+        self.assertIn("own manager", str(result["results"][5]["errors"]))
+        self.assertIn("not found", str(result["results"][6]["errors"]))
+        self.assertFalse(User.objects.filter(username__in=[row["username"] for row in rows]).exists())
+
+    def test_csv_upload_and_admin_only(self):
+        body = "username,email,password,department,manager\ncsv_dev,csv_dev@test.com,Onboard123!,Onboarding,onboard_boss\n"
+        self.client.force_authenticate(user=self.boss.user)
+        self.assertEqual(self.client.post(self.url, body, content_type="text/csv").status_code, 403)
+
+        self.client.force_authenticate(user=self.admin)
+        res = self.client.post(self.url, body, content_type="text/csv")
+        self.assertEqual(res.data["created"], 1)
+        self.assertEqual(Employee.objects.get(user__username="csv_dev").manager_id, self.boss.id)
+        self.assertEqual(self.client.post(self.url, {"username": "x"}, format="json").status_code, 400)
+        self.assertEqual(self.client.post(self.url, "5", content_type="application/json").status_code, 400)
+
+    def test_command(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".ndjson") as handle:
+            handle.write('{"username": "cmd_dev", "password": "Onboard123!"}\n{"username": "onboard_boss"}\n')
+            handle.flush()
+            out, err = StringIO(), StringIO()
+            call_command("import_employees", handle.name, "--workers", "1", stdout=out, stderr=err)
+        self.assertIn("1 employees created, 1 failed.", out.getvalue())
+        self.assertIn("row 2:", err.getvalue())
+        self.assertTrue(User.objects.get(username="cmd_dev").check_password("Onboard123!"))
+
+        with self.assertRaises(CommandError):
+            call_command("import_employees", "people.txt")
+        with tempfile.NamedTemporaryFile("w", suffix=".json") as handle:
+            handle.write("5")
+            handle.flush()
+            with self.assertRaises(CommandError):
+                call_command("import_employees", handle.name)
+
+    def test_hash_passwords_in_pool(self):
+        hashes = hash_passwords(["first-secret", "second-secret", "third-secret"], workers=2, parallel_threshold=1)
+        self.assertEqual(len(hashes), 3)
+        user = User(username="hash_check")
+        user.password = hashes[1]
+        self.assertTrue(user.check_password("second-secret"))
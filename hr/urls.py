@@ -4,19 +4,88 @@ from hr.views import (
     DepartmentDetailView,
     EmployeeListCreateView,
     EmployeeDetailView,
+    EmployeeSalaryUpdateView,
+    EmployeeImportView,
+    EmployeeReportsView,
+    EmployeeChainView,
+    EmployeeDepthView,
     AttendanceListCreateView,
     AttendanceDetailUpdateView,
+    AttendanceBulkIngestView,
+    AttendanceSummaryView,
+    AttendanceExportView,
     PayrollListCreateView,
     PayrollDetailView,
+    PayrollRunView,
+    PayrollTransitionView,
+    PayrollExportView,
+    LeaveTypeListCreateView,
+    LeaveTypeDetailView,
+    LeaveRequestListCreateView,
+    LeaveRequestDetailView,
+    LeaveRequestDecisionView,
+    LeaveBalanceListView,
+    LeaveLedgerListView,
+    LeaveAllocationView,
+    EmployeeReportView,
+    AttendanceReportView,
+    PayrollReportView,
+    LeaveBalanceReportView,
+    LeaveRequestReportView,
+)
+from hr.async_views import (
+    AsyncDepartmentListView,
+    AsyncDepartmentDetailView,
+    AsyncEmployeeListView,
+    AsyncEmployeeDetailView,
+    AsyncAttendanceListView,
+    AsyncAttendanceDetailView,
+    AsyncPayrollListView,
+    AsyncPayrollDetailView,
 )
 
 urlpatterns = [
     path("departments/", DepartmentListCreateView.as_view(), name="department-list"),
     path("departments/<int:pk>/", DepartmentDetailView.as_view(), name="department-detail"),
     path("employees/", EmployeeListCreateView.as_view(), name="employee-list"),
+    path("employees/salaries/", EmployeeSalaryUpdateView.as_view(), name="employee-salaries"),
+    path("employees/import/", EmployeeImportView.as_view(), name="employee-import"),
     path("employees/<int:pk>/", EmployeeDetailView.as_view(), name="employee-detail"),
+    path("employees/<int:pk>/reports/", EmployeeReportsView.as_view(), name="employee-reports"),
+    path("employees/<int:pk>/chain/", EmployeeChainView.as_view(), name="employee-chain"),
+    path("employees/<int:pk>/depth/", EmployeeDepthView.as_view(), name="employee-depth"),
     path("attendance/", AttendanceListCreateView.as_view(), name="attendance-list"),
+    path("attendance/export/", AttendanceExportView.as_view(), name="attendance-export"),
+    path("attendance/summary/", AttendanceSummaryView.as_view(), name="attendance-summary"),
+    path("attendance/bulk/", AttendanceBulkIngestView.as_view(), name="attendance-bulk"),
     path("attendance/<int:pk>/", AttendanceDetailUpdateView.as_view(), name="attendance-detail"),
     path("payrolls/", PayrollListCreateView.as_view(), name="payroll-list"),
+    path("payrolls/export/", PayrollExportView.as_view(), name="payroll-export"),
+    path("payrolls/run/", PayrollRunView.as_view(), name="payroll-run"),
+    path("payrolls/transition/", PayrollTransitionView.as_view(), name="payroll-transition"),
     path("payrolls/<int:pk>/", PayrollDetailView.as_view(), name="payroll-detail"),
-]
\ No newline at end of file
+    path("leave/types/", LeaveTypeListCreateView.as_view(), name="leavetype-list"),
+    path("leave/types/<int:pk>/", LeaveTypeDetailView.as_view(), name="leavetype-detail"),
+    path("leave/requests/", LeaveRequestListCreateView.as_view(), name="leaverequest-list"),
+    path("leave/requests/<int:pk>/", LeaveRequestDetailView.as_view(), name="leaverequest-detail"),
+    path("leave/requests/<int:pk>/approve/", LeaveRequestDecisionView.as_view(decision="approve"), name="leaverequest-approve"),
+    path("leave/requests/<int:pk>/reject/", LeaveRequestDecisionView.as_view(decision="reject"), name="leaverequest-reject"),
+    path("leave/requests/<int:pk>/cancel/", LeaveRequestDecisionView.as_view(decision="cancel"), name="leaverequest-cancel"),
+    path("leave/balances/", LeaveBalanceListView.as_view(), name="leavebalance-list"),
+    path("leave/ledger/", LeaveLedgerListView.as_view(), name="leaveledger-list"),
+    path("leave/allocations/", LeaveAllocationView.as_view(), name="leave-allocate"),
+    path("reports/employees/", EmployeeReportView.as_view(), name="report-employees"),
+    path("reports/attendance/", AttendanceReportView.as_view(), name="report-attendance"),
+    path("reports/payroll/", PayrollReportView.as_view(), name="report-payroll"),
+    path("reports/leave-balances/", LeaveBalanceReportView.as_view(), name="report-leave-balances"),
+    path("reports/leave-requests/", LeaveRequestReportView.as_view(), name="report-leave-requests"),
+    # Async read-only counterparts of the hot GETs, for ASGI deployments
+    path("async/departments/", AsyncDepartmentListView.as_view(), name="department-list-async"),
+    path("async/departments/<int:pk>/", AsyncDepartmentDetailView.as_view(), name="department-detail-async"),
+    path("async/employees/", AsyncEmployeeListView.as_view(), name="employee-list-async"),
+    path("async/employees/<int:pk>/", AsyncEmployeeDetailView.as_view(), name="employee-detail-async"),
+    path("async/attendance/", AsyncAttendanceListView.as_view(), name="attendance-list-async"),
+    path("async/attendance/<int:pk>/", AsyncAttendanceDetailView.as_view(), name="attendance-detail-async"),
+    path("async/payrolls/", AsyncPayrollListView.as_view(), name="payroll-list-async"),
+    path("async/payrolls/<int:pk>/", AsyncPayrollDetailView.as_view(), name="payroll-detail-async"),
+]
@@ -1,69 +1,110 @@
 from rest_framework.generics import (
+    GenericAPIView,
+    ListAPIView,
     ListCreateAPIView,
+    RetrieveAPIView,
     RetrieveUpdateDestroyAPIView,
     RetrieveUpdateAPIView,
 )
 from rest_framework.permissions import IsAuthenticated
 from accounts.models import User
 from accounts.permissions import IsAdmin, IsAdminOrManager
-from .models import Department, Employee, Attendance, Payroll
+from django.db.models import F, Sum
+from .models import (
+    Department,
+    Employee,
+    Attendance,
+    Payroll,
+    AttendanceMonthlySummary,
+    LeaveType,
+    LeaveRequest,
+    LeaveBalance,
+    LeaveLedgerEntry,
+)
 from .serializers import (
     DepartmentSerializer,
     EmployeeSerializer,
     AttendanceSerializer,
     PayrollSerializer,
+    PayrollRunSerializer,
+    PayrollTransitionSerializer,
+    AttendanceSummaryQuerySerializer,
+    AttendanceSummarySerializer,
+    AttendanceFilterSerializer,
+    PayrollFilterSerializer,
+    LeaveTypeSerializer,
+    LeaveRequestSerializer,
+    LeaveBalanceSerializer,
+    LeaveLedgerEntrySerializer,
+    LeaveAllocationSerializer,
+    LeaveFilterSerializer,
+    LeaveRequestFilterSerializer,
+    EmployeeReportSerializer,
+    AttendanceReportSerializer,
+    PayrollReportSerializer,
+    LeaveBalanceReportSerializer,
+    LeaveRequestReportSerializer,
+    ReportFilterSerializer,
+    ReportPeriodFilterSerializer,
 )
 from django.db.models.deletion import ProtectedError
-from rest_framework.exceptions import ValidationError
-from .helpers import _get_user_department_id, _get_user_with_employee
-
-
-class DepartmentListCreateView(ListCreateAPIView):
-    serializer_class = DepartmentSerializer
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.parsers import JSONParser
+from rest_framework import status
+from rest_framework.response import Response
+from accounts.principal import get_principal
+from core.streaming import EXPORT_FORMATS, stream_rows
+from .pagination import OptInKeysetPagination
+from .parsers import CSVParser, NDJSONParser, is_row_list
+from .ingest import ingest_attendance
+from .salaries import apply_salary_changes
+from .onboarding import import_employees
+from .payroll import run_payroll, transition_payrolls
+from .reports import REPORTS, refresh_reports, report_refreshed_at
+from .leave import allocate_leave, approve_leave_request, cancel_leave_request, reject_leave_request
+from .rollups import STATUS_FIELDS
+from .hierarchy import ancestors, subordinates
+from .fastpath import ValuesListMixin
+from .caching import DepartmentCacheMixin
+from .conditional import ConditionalListMixin, ConditionalRecordMixin
+from .filters import QueryParamsFilterBackend
+
+
+class DepartmentScopedMixin:
     queryset = Department.objects.select_related("manager", "manager__user").order_by("id")
 
-    def get_permissions(self):
-        # Admin-only create, everyone authenticated can read (scoped)
-        if self.request.method == "POST":
-            return [IsAdmin()]
-        return [IsAuthenticated()]
-
     def get_queryset(self):
-        user = self.request.user
+        principal = get_principal(self.request)
         qs = super().get_queryset()
 
-        if user.role == User.Role.ADMIN:
+        if principal.role == User.Role.ADMIN:
             return qs
 
-        dept_id = _get_user_department_id(self.request)
+        dept_id = principal.department_id
         if dept_id:
             return qs.filter(id=dept_id)
 
         return qs.none()
 
 
-class DepartmentDetailView(RetrieveUpdateDestroyAPIView):
+class DepartmentListCreateView(DepartmentScopedMixin, DepartmentCacheMixin, ValuesListMixin, ListCreateAPIView):
     serializer_class = DepartmentSerializer
-    queryset = Department.objects.select_related("manager", "manager__user").order_by("id")
 
     def get_permissions(self):
-        # Admin-only update/delete, everyone authenticated can read (scoped)
-        if self.request.method in ("PUT", "PATCH", "DELETE"):
+        # Admin-only create, everyone authenticated can read (scoped)
+        if self.request.method == "POST":
             return [IsAdmin()]
         return [IsAuthenticated()]
 
-    def get_queryset(self):
-        user = self.request.user
-        qs = super().get_queryset()
 
-        if user.role == User.Role.ADMIN:
-            return qs
-
-        dept_id = _get_user_department_id(self.request)
-        if dept_id:
-            return qs.filter(id=dept_id)
+class DepartmentDetailView(DepartmentScopedMixin, DepartmentCacheMixin, RetrieveUpdateDestroyAPIView):
+    serializer_class = DepartmentSerializer
 
-        return qs.none()
+    def get_permissions(self):
+        # Admin-only update/delete, everyone authenticated can read (scoped)
+        if self.request.method in ("PUT", "PATCH", "DELETE"):
+            return [IsAdmin()]
+        return [IsAuthenticated()]
 
     def perform_destroy(self, instance):
         try:
@@ -72,38 +113,48 @@ class DepartmentDetailView(RetrieveUpdateDestroyAPIView):
             raise ValidationError({"detail": "Cannot delete department because it has employees."})
 
 
-class EmployeeListCreateView(ListCreateAPIView):
-    serializer_class = EmployeeSerializer
+class EmployeeScopedMixin:
     queryset = Employee.objects.select_related("user", "department", "manager", "manager__user").order_by("id")
 
-    def get_permissions(self):
-        # Admin-only create, everyone authenticated can read (scoped)
-        if self.request.method == "POST":
-            return [IsAdmin()]
-        return [IsAuthenticated()]
-
     def get_queryset(self):
-        user = self.request.user
+        principal = get_principal(self.request)
         qs = super().get_queryset()
 
         # Admin sees all
-        if user.role == User.Role.ADMIN:
+        if principal.role == User.Role.ADMIN:
             return qs
 
         # Manager sees only department employees
-        if user.role == User.Role.MANAGER:
-            u = _get_user_with_employee(self.request)
-            if not hasattr(u, "employee") or not u.employee or u.employee.department_id is None:
+        if principal.role == User.Role.MANAGER:
+            if principal.department_id is None:
                 return qs.none()
-            return qs.filter(department_id=u.employee.department_id)
+            return qs.filter(department_id=principal.department_id)
 
         # Employee sees only self
-        return qs.filter(user=user)
+        return qs.filter(user_id=principal.user_id)
 
 
-class EmployeeDetailView(RetrieveUpdateDestroyAPIView):
+class EmployeeListCreateView(EmployeeScopedMixin, ValuesListMixin, ListCreateAPIView):
     serializer_class = EmployeeSerializer
-    queryset = Employee.objects.select_related("user", "department", "manager", "manager__user").order_by("id")
+    replica_reads = True
+
+    def get_permissions(self):
+        # Admin-only create, everyone authenticated can read (scoped)
+        if self.request.method == "POST":
+            return [IsAdmin()]
+        return [IsAuthenticated()]
+
+
+class EmployeeDetailView(EmployeeScopedMixin, ConditionalRecordMixin, RetrieveUpdateDestroyAPIView):
+    serializer_class = EmployeeSerializer
+    replica_reads = True
+
+    def record_etag_parts(self, obj):
+        # user_username/user_role are part of the representation too
+        return (obj.pk, obj.version, obj.user.username, obj.user.role)
+
+    def record_last_modified(self, obj):
+        return None
 
     def get_permissions(self):
         # Admin or Manager can update; Admin-only delete; everyone authenticated can read (scoped)
@@ -113,23 +164,107 @@ class EmployeeDetailView(RetrieveUpdateDestroyAPIView):
             return [IsAdmin()]
         return [IsAuthenticated()]
 
-    def get_queryset(self):
-        user = self.request.user
-        qs = super().get_queryset()
 
-        # Admin sees all
-        if user.role == User.Role.ADMIN:
-            return qs
+def visible_subordinates(principal, employee_id):
+    """subordinates() of an employee as the caller may see them: managers only within their department."""
+    if principal.role == User.Role.ADMIN:
+        return subordinates(employee_id)
+    if principal.role == User.Role.MANAGER:
+        return subordinates(employee_id, department_id=principal.department_id)
+    return []
 
-        # Manager sees only department employees
-        if user.role == User.Role.MANAGER:
-            u = _get_user_with_employee(self.request)
-            if not hasattr(u, "employee") or not u.employee or u.employee.department_id is None:
-                return qs.none()
-            return qs.filter(department_id=u.employee.department_id)
 
-        # Employee sees only self
-        return qs.filter(user=user)
+class EmployeeReportsView(EmployeeScopedMixin, GenericAPIView):
+    """
+    Direct and indirect reports of an employee, nearest first, each with its
+    depth below the employee. The whole subtree comes from one recursive query;
+    managers only get reports inside their department.
+    """
+    serializer_class = EmployeeSerializer
+
+    def get(self, request, *args, **kwargs):
+        root = self.get_object()
+        pairs = visible_subordinates(get_principal(request), root.id)
+
+        page = self.paginate_queryset(pairs)
+        pairs = page if page is not None else pairs
+        data = self._with_depth(pairs)
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+    def _with_depth(self, pairs):
+        employees = self.get_queryset().in_bulk([employee_id for employee_id, _ in pairs])
+        data = []
+        for employee_id, depth in pairs:
+            if employee_id not in employees:
+                continue
+            item = self.get_serializer(employees[employee_id]).data
+            item["depth"] = depth
+            data.append(item)
+        return data
+
+
+class EmployeeChainView(EmployeeReportsView):
+    """
+    The management chain above an employee, direct manager first, limited to
+    employees the caller can see.
+    """
+
+    def get(self, request, *args, **kwargs):
+        root = self.get_object()
+        chain = ancestors(root.id)
+        visible = set(self.get_queryset().filter(id__in=[i for i, _ in chain]).values_list("id", flat=True))
+        return Response(self._with_depth([(i, depth) for i, depth in chain if i in visible]))
+
+
+class EmployeeDepthView(EmployeeScopedMixin, GenericAPIView):
+    """How deep an employee sits in the org chart and how deep their (visible) subtree goes."""
+
+    def get(self, request, *args, **kwargs):
+        root = self.get_object()
+        # Counted over the same reports EmployeeReportsView lists
+        reports = visible_subordinates(get_principal(request), root.id)
+        return Response({
+            "employee": root.id,
+            "depth": len(ancestors(root.id)),
+            "reports": len(reports),
+            "max_report_depth": max((depth for _, depth in reports), default=0),
+        })
+
+
+class EmployeeSalaryUpdateView(GenericAPIView):
+    """
+    Change many employees' salaries in one request and recompute their
+    DRAFT payrolls. Accepts a JSON array, NDJSON or CSV (employee,salary)
+    body and returns a per-row report plus the payrolls recomputed and the
+    drafts skipped because their deductions exceed the new gross.
+    """
+    permission_classes = [IsAdmin]
+    parser_classes = [JSONParser, NDJSONParser, CSVParser]
+
+    def post(self, request, *args, **kwargs):
+        rows = request.data
+        if not is_row_list(rows):
+            raise ValidationError({"detail": "Expected a list of salary changes."})
+        return Response(apply_salary_changes(rows))
+
+
+class EmployeeImportView(GenericAPIView):
+    """
+    Onboard many people in one request: each row creates a User and its
+    Employee. Accepts a JSON array, NDJSON or CSV body and returns a per-row
+    report with the ids created or the row's errors.
+    """
+    permission_classes = [IsAdmin]
+    parser_classes = [JSONParser, NDJSONParser, CSVParser]
+
+    def post(self, request, *args, **kwargs):
+        rows = request.data
+        if not is_row_list(rows):
+            raise ValidationError({"detail": "Expected a list of employees."})
+        result = import_employees(rows)
+        return Response(result, status=status.HTTP_201_CREATED if result["created"] else status.HTTP_200_OK)
 
 
 class AttendanceScopedMixin:
@@ -137,23 +272,22 @@ class AttendanceScopedMixin:
     queryset = Attendance.objects.select_related("employee", "employee__user", "employee__department")
 
     def get_queryset(self):
-        user = self.request.user
+        principal = get_principal(self.request)
         qs = super().get_queryset()
-        role = getattr(user, "role", None)
 
         # Admin sees all
-        if user.is_superuser or role == User.Role.ADMIN or role == "ADMIN":
+        if principal.is_admin:
             return qs
 
         # Manager sees department only
-        if role == User.Role.MANAGER or role == "MANAGER":
-            if not hasattr(user, "employee") or not user.employee.department_id:
+        if principal.is_manager:
+            if not principal.department_id:
                 return qs.none()
-            return qs.filter(employee__department_id=user.employee.department_id)
+            return qs.filter(department_id=principal.department_id)
 
         # Employee sees self only
-        if hasattr(user, "employee") and user.employee:
-            return qs.filter(employee_id=user.employee.id)
+        if principal.employee_id:
+            return qs.filter(employee_id=principal.employee_id)
 
         return qs.none()
 
@@ -163,8 +297,46 @@ class AttendanceScopedMixin:
         return ctx
 
 
-class AttendanceListCreateView(AttendanceScopedMixin, ListCreateAPIView):
+class ExportMixin:
+    """
+    GET streams the scoped, filtered queryset as CSV (default) or NDJSON (?output=ndjson)
+    straight from a server-side cursor, without model or serializer instances.
+    """
+    export_columns = []
+    export_filename = "export"
+    export_chunk_size = 2000
+
+    def get(self, request, *args, **kwargs):
+        output = request.query_params.get("output", "csv")
+        if output not in EXPORT_FORMATS:
+            raise ValidationError({"output": f"Must be one of: {', '.join(EXPORT_FORMATS)}."})
+
+        rows = (
+            self.filter_queryset(self.get_queryset())
+            .values_list(*self.export_columns)
+            .iterator(chunk_size=self.export_chunk_size)
+        )
+        return stream_rows(self.export_columns, rows, output=output, filename=self.export_filename)
+
+
+class AttendanceFilterMixin:
+    # Each combination is served by an index: (employee, date) unique,
+    # (date, status), (status, date) and (department, date)
+    filter_backends = [QueryParamsFilterBackend]
+    filter_serializer_class = AttendanceFilterSerializer
+    filter_lookups = {
+        "date_from": "date__gte",
+        "date_to": "date__lte",
+        "status": "status",
+        "employee": "employee_id",
+        "department": "department_id",
+    }
+
+
+class AttendanceListCreateView(AttendanceScopedMixin, AttendanceFilterMixin, ConditionalListMixin, ValuesListMixin, ListCreateAPIView):
     serializer_class = AttendanceSerializer
+    replica_reads = True
+    pagination_class = OptInKeysetPagination
 
     def get_permissions(self):
         # Admin/Manager can create, everyone authenticated can read (scoped)
@@ -173,8 +345,9 @@ class AttendanceListCreateView(AttendanceScopedMixin, ListCreateAPIView):
         return [IsAuthenticated()]
 
 
-class AttendanceDetailUpdateView(AttendanceScopedMixin, RetrieveUpdateAPIView):
+class AttendanceDetailUpdateView(AttendanceScopedMixin, ConditionalRecordMixin, RetrieveUpdateAPIView):
     serializer_class = AttendanceSerializer
+    replica_reads = True
 
     def get_permissions(self):
         # Admin/Manager can update, everyone authenticated can read (scoped)
@@ -183,27 +356,112 @@ class AttendanceDetailUpdateView(AttendanceScopedMixin, RetrieveUpdateAPIView):
         return [IsAuthenticated()]
 
 
+class AttendanceExportView(AttendanceScopedMixin, AttendanceFilterMixin, ExportMixin, GenericAPIView):
+    export_columns = ["id", "employee", "date", "status", "note", "created_at", "updated_at"]
+    export_filename = "attendance"
+
+
+class AttendanceBulkIngestView(GenericAPIView):
+    """
+    Upsert many attendance records in one request.
+
+    Accepts a JSON array, NDJSON or CSV (employee,date,status,note) body and
+    returns a per-row report. Rows that fail validation or scope are reported
+    and skipped; the rest are written together.
+    """
+    permission_classes = [IsAdminOrManager]
+    parser_classes = [JSONParser, NDJSONParser, CSVParser]
+
+    def post(self, request, *args, **kwargs):
+        principal = get_principal(request)
+        rows = request.data
+        if not is_row_list(rows):
+            raise ValidationError({"detail": "Expected a list of attendance records."})
+
+        # Manager scope is resolved once for the whole batch
+        department_id = None
+        if not principal.is_admin:
+            department_id = principal.department_id
+            if department_id is None:
+                raise ValidationError({"detail": "Manager must have an Employee profile."})
+
+        return Response(ingest_attendance(rows, department_id=department_id))
+
+
+class AttendanceSummaryView(GenericAPIView):
+    """
+    Attendance status counts per employee (or per department) and month, read
+    from the AttendanceMonthlySummary rollups instead of raw attendance rows.
+    Scoped like the attendance list: admin all, manager own department,
+    employee self.
+    """
+    serializer_class = AttendanceSummarySerializer
+    queryset = AttendanceMonthlySummary.objects.all()
+
+    def get_queryset(self):
+        principal = get_principal(self.request)
+        qs = super().get_queryset()
+
+        if principal.is_admin:
+            return qs
+
+        if principal.is_manager:
+            if not principal.department_id:
+                return qs.none()
+            return qs.filter(employee__department_id=principal.department_id)
+
+        if principal.employee_id:
+            return qs.filter(employee_id=principal.employee_id)
+
+        return qs.none()
+
+    def get(self, request, *args, **kwargs):
+        params = AttendanceSummaryQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        filters = params.validated_data
+
+        qs = self.get_queryset()
+        if "year" in filters:
+            qs = qs.filter(year=filters["year"])
+        if "month" in filters:
+            qs = qs.filter(month=filters["month"])
+
+        counters = list(STATUS_FIELDS.values())
+        if filters["group_by"] == "department":
+            qs = (
+                qs.values("year", "month", department=F("employee__department_id"))
+                .annotate(**{field: Sum(field) for field in counters})
+                .order_by("-year", "-month", "department")
+            )
+        else:
+            qs = qs.values("employee", "year", "month", *counters).order_by("-year", "-month", "employee")
+
+        page = self.paginate_queryset(qs)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+        return Response(self.get_serializer(qs, many=True).data)
+
+
 class PayrollScopedMixin:
     queryset = Payroll.objects.select_related("employee", "employee__user", "employee__department")
 
     def get_queryset(self):
-        user = self.request.user
+        principal = get_principal(self.request)
         qs = super().get_queryset()
-        role = getattr(user, "role", None)
 
         # Admin sees all
-        if user.is_superuser or role in (User.Role.ADMIN, "ADMIN"):
+        if principal.is_admin:
             return qs
 
         # Manager sees only their department (read-only)
-        if role in (User.Role.MANAGER, "MANAGER"):
-            if not hasattr(user, "employee") or not user.employee.department_id:
+        if principal.is_manager:
+            if not principal.department_id:
                 return qs.none()
-            return qs.filter(employee__department_id=user.employee.department_id)
+            return qs.filter(department_id=principal.department_id)
 
         # Employee sees only their own
-        if hasattr(user, "employee") and user.employee:
-            return qs.filter(employee_id=user.employee.id)
+        if principal.employee_id:
+            return qs.filter(employee_id=principal.employee_id)
 
         return qs.none()
 
@@ -213,8 +471,23 @@ class PayrollScopedMixin:
         return ctx
 
 
-class PayrollListCreateView(PayrollScopedMixin, ListCreateAPIView):
+class PayrollFilterMixin:
+    # Served by (year, month, status), (status, year, month) and the
+    # (employee, year, month) unique constraint
+    filter_backends = [QueryParamsFilterBackend]
+    filter_serializer_class = PayrollFilterSerializer
+    filter_lookups = {
+        "year": "year",
+        "month": "month",
+        "status": "status",
+        "employee": "employee_id",
+    }
+
+
+class PayrollListCreateView(PayrollScopedMixin, PayrollFilterMixin, ConditionalListMixin, ValuesListMixin, ListCreateAPIView):
     serializer_class = PayrollSerializer
+    replica_reads = True
+    pagination_class = OptInKeysetPagination
 
     def get_permissions(self):
         # Admin-only create, everyone authenticated can read (scoped)
@@ -223,11 +496,284 @@ class PayrollListCreateView(PayrollScopedMixin, ListCreateAPIView):
         return [IsAuthenticated()]
 
 
-class PayrollDetailView(PayrollScopedMixin, RetrieveUpdateDestroyAPIView):
+class PayrollDetailView(PayrollScopedMixin, ConditionalRecordMixin, RetrieveUpdateDestroyAPIView):
     serializer_class = PayrollSerializer
+    replica_reads = True
 
     def get_permissions(self):
         # Admin-only update/delete, everyone authenticated can read (scoped)
         if self.request.method in ("PUT", "PATCH", "DELETE"):
             return [IsAdmin()]
-        return [IsAuthenticated()]
\ No newline at end of file
+        return [IsAuthenticated()]
+
+
+class PayrollExportView(PayrollScopedMixin, PayrollFilterMixin, ExportMixin, GenericAPIView):
+    export_columns = [
+        "id",
+        "employee",
+        "year",
+        "month",
+        "base_salary",
+        "allowances",
+        "deductions",
+        "attendance_deductions",
+        "net_salary",
+        "status",
+        "note",
+        "created_at",
+        "updated_at",
+    ]
+    export_filename = "payrolls"
+
+
+class PayrollRunView(GenericAPIView):
+    """
+    Create missing DRAFT payrolls for a period, company-wide or for one department.
+    Re-running the same period only fills in employees that are still missing.
+    """
+    permission_classes = [IsAdmin]
+    serializer_class = PayrollRunSerializer
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        department = serializer.validated_data.get("department")
+
+        result = run_payroll(
+            serializer.validated_data["year"],
+            serializer.validated_data["month"],
+            department_id=department.id if department else None,
+            recompute_deductions=serializer.validated_data["recompute_deductions"],
+        )
+        refresh_reports(["payroll"])
+        return Response(result)
+
+
+class PayrollTransitionView(GenericAPIView):
+    """
+    Move many payrolls one step along DRAFT -> FINAL -> PAID: those listed in
+    `ids` and/or matching year, month, department and employee. Rows another
+    request holds locked are skipped and listed, never transitioned twice.
+    """
+    permission_classes = [IsAdmin]
+    serializer_class = PayrollTransitionSerializer
+    filter_lookups = {
+        "year": "year",
+        "month": "month",
+        "department": "department_id",
+        "employee": "employee_id",
+    }
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        result = transition_payrolls(
+            data["status"],
+            ids=data.get("ids"),
+            filters={lookup: data[name] for name, lookup in self.filter_lookups.items() if name in data},
+        )
+        if result["transitioned"]:
+            refresh_reports(["payroll"])
+        return Response(result)
+
+
+class LeaveTypeListCreateView(ListCreateAPIView):
+    serializer_class = LeaveTypeSerializer
+    queryset = LeaveType.objects.all()
+
+    def get_permissions(self):
+        # Admin-only create, everyone authenticated can read
+        if self.request.method == "POST":
+            return [IsAdmin()]
+        return [IsAuthenticated()]
+
+
+class LeaveTypeDetailView(RetrieveUpdateAPIView):
+    serializer_class = LeaveTypeSerializer
+    queryset = LeaveType.objects.all()
+
+    def get_permissions(self):
+        # Admin-only update, everyone authenticated can read
+        if self.request.method in ("PUT", "PATCH"):
+            return [IsAdmin()]
+        return [IsAuthenticated()]
+
+
+class LeaveScopedMixin:
+    """Leave requests, balances and ledger entries: admin all, manager own department, employee self."""
+
+    def get_queryset(self):
+        principal = get_principal(self.request)
+        qs = super().get_queryset()
+
+        if principal.is_admin:
+            return qs
+
+        if principal.is_manager:
+            if not principal.department_id:
+                return qs.none()
+            return qs.filter(employee__department_id=principal.department_id)
+
+        if principal.employee_id:
+            return qs.filter(employee_id=principal.employee_id)
+
+        return qs.none()
+
+
+class LeaveFilterMixin:
+    # (employee, start_date) and (status, start_date) on requests, the
+    # unique (employee, leave_type) on balances, (employee, leave_type, created_at) on the ledger
+    filter_backends = [QueryParamsFilterBackend]
+    filter_serializer_class = LeaveFilterSerializer
+    filter_lookups = {
+        "employee": "employee_id",
+        "leave_type": "leave_type_id",
+        "status": "status",
+    }
+
+
+class LeaveRequestListCreateView(LeaveScopedMixin, LeaveFilterMixin, ListCreateAPIView):
+    serializer_class = LeaveRequestSerializer
+    queryset = LeaveRequest.objects.all()
+    filter_serializer_class = LeaveRequestFilterSerializer
+
+
+class LeaveRequestDetailView(LeaveScopedMixin, RetrieveAPIView):
+    serializer_class = LeaveRequestSerializer
+    queryset = LeaveRequest.objects.all()
+
+
+class LeaveRequestDecisionView(LeaveScopedMixin, GenericAPIView):
+    """
+    POST approves, rejects or cancels a leave request (`decision`). Admins
+    and managers decide requests they can see, except managers' own;
+    cancelling is for the requester or an admin and returns approved days
+    to the balance.
+    """
+    serializer_class = LeaveRequestSerializer
+    queryset = LeaveRequest.objects.all()
+    decision = None
+    decisions = {
+        "approve": approve_leave_request,
+        "reject": reject_leave_request,
+        "cancel": cancel_leave_request,
+    }
+
+    def get_permissions(self):
+        if self.decision == "cancel":
+            return [IsAuthenticated()]
+        return [IsAdminOrManager()]
+
+    def post(self, request, *args, **kwargs):
+        leave_request = self.get_object()
+        principal = get_principal(request)
+        own = leave_request.employee_id == principal.employee_id
+        if not principal.is_admin:
+            if self.decision == "cancel" and not own:
+                raise PermissionDenied("Only the requester or an admin can cancel a leave request.")
+            if self.decision != "cancel" and own:
+                raise PermissionDenied("Managers cannot decide their own leave requests.")
+
+        leave_request = self.decisions[self.decision](leave_request.id, user_id=principal.user_id)
+        return Response(self.get_serializer(leave_request).data)
+
+
+class LeaveBalanceListView(LeaveScopedMixin, LeaveFilterMixin, ListAPIView):
+    """Current balances straight from the running rows; no aggregation over the ledger."""
+    serializer_class = LeaveBalanceSerializer
+    queryset = LeaveBalance.objects.all()
+
+
+class LeaveLedgerListView(LeaveScopedMixin, LeaveFilterMixin, ListAPIView):
+    serializer_class = LeaveLedgerEntrySerializer
+    queryset = LeaveLedgerEntry.objects.all()
+
+
+class LeaveAllocationView(GenericAPIView):
+    """Grant (or withdraw, with negative days) leave; returns the ledger entry."""
+    permission_classes = [IsAdmin]
+    serializer_class = LeaveAllocationSerializer
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        entry = allocate_leave(
+            data["employee"].id,
+            data["leave_type"].id,
+            data["days"],
+            note=data["note"],
+            user_id=get_principal(request).user_id,
+        )
+        return Response(LeaveLedgerEntrySerializer(entry).data, status=status.HTTP_201_CREATED)
+
+
+class ReportListView(ValuesListMixin, ListAPIView):
+    """
+    One of the hr.reports views, read through its unmanaged model. Scoped
+    like the attendance list (admin all, manager own department, employee
+    self) on the view's own department_id/employee_id columns, which the
+    materialized views index. The body carries `refreshed_at`: the data is
+    as of that refresh (refresh_reports command, or a payroll run).
+    """
+    report = None
+    replica_reads = True
+    filter_backends = [QueryParamsFilterBackend]
+    filter_serializer_class = ReportFilterSerializer
+    filter_lookups = {
+        "employee": "employee_id",
+        "department": "department_id",
+        "year": "year",
+        "month": "month",
+    }
+
+    def get_queryset(self):
+        principal = get_principal(self.request)
+        qs = REPORTS[self.report][0].objects.all()
+
+        if principal.is_admin:
+            return qs
+
+        if principal.is_manager:
+            if not principal.department_id:
+                return qs.none()
+            return qs.filter(department_id=principal.department_id)
+
+        if principal.employee_id:
+            return qs.filter(employee_id=principal.employee_id)
+
+        return qs.none()
+
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        response.data["refreshed_at"] = report_refreshed_at(self.report)
+        return response
+
+
+class EmployeeReportView(ReportListView):
+    report = "employees"
+    serializer_class = EmployeeReportSerializer
+
+
+class AttendanceReportView(ReportListView):
+    report = "attendance"
+    serializer_class = AttendanceReportSerializer
+    filter_serializer_class = ReportPeriodFilterSerializer
+
+
+class PayrollReportView(ReportListView):
+    report = "payroll"
+    serializer_class = PayrollReportSerializer
+    filter_serializer_class = ReportPeriodFilterSerializer
+
+
+class LeaveBalanceReportView(ReportListView):
+    report = "leave-balances"
+    serializer_class = LeaveBalanceReportSerializer
+
+
+class LeaveRequestReportView(ReportListView):
+    report = "leave-requests"
+    serializer_class = LeaveRequestReportSerializer
+